@@ -1,4 +1,6 @@
 from abc import abstractmethod
+from typing import BinaryIO
+
 from ..models.graph import Graph
 from .base_plugin import BasePlugin
 
@@ -7,11 +9,20 @@ class DataSourcePlugin(BasePlugin):
     """Base class for data source plugins that load graph data from various sources"""
     
     @abstractmethod
-    def load_data(self, source: str) -> Graph:
+    def load_data(self, source: str | BinaryIO) -> Graph:
         """Load graph data from the specified source
         
         Args:
-            source: The data source (file path, URL, etc.)
+            source: The data source (file path, URL, etc.), or a binary stream such as
+                an upload. A stream is read once, front to back, and not closed; its
+                `name`, if present, is the file name the format is recognised by.
+
+        Keyword arguments may include `progress`, a ProgressCallback
+        (api.services.progress) called with the bytes read and nodes parsed
+        so far. Plugins report through a ProgressReporter and let exceptions
+        raised by the callback propagate, which is how a load is cancelled.
+        Plugins that ignore it still work; callers then only see progress
+        once the load is done.
             
         Returns:
             Graph: The loaded graph data
@@ -26,3 +37,53 @@ class DataSourcePlugin(BasePlugin):
             list[str]: List of supported extensions (e.g., ['.json', '.csv'])
         """
         raise NotImplementedError
+
+    def split_source(self, source: str, parts: int, directory: str) -> list[str]:
+        """Split a source file into up to `parts` files that can be loaded independently
+
+        Used for parallel ingestion. Plugins whose format can be cut into
+        self-contained pieces (e.g. items of an array, lines) override this;
+        by default the source is not split.
+
+        Args:
+            source: Path of the file to split
+            parts: Number of parts wanted
+            directory: Directory to write the parts into
+
+        Returns:
+            list[str]: Paths of the parts, in source order
+        """
+        return [source]
+
+    def load_part(self, source: str | BinaryIO, index: int, **kwargs) -> Graph:
+        """Load one of several files or parts that together make up one graph
+
+        Args:
+            source: Path of the part, or a stream as for load_data
+            index: Position of the part among all parts, starting at 0
+            **kwargs: Parameters passed on to load_data
+
+        Returns:
+            Graph: The part's graph; links to nodes of other parts stay in unresolved_links
+        """
+        return self.load_data(source, **kwargs)
+
+    def merge_graphs(self, graphs: list[Graph]) -> Graph:
+        """Merge graphs returned by load_part, in part order, into one graph
+
+        Returns:
+            Graph: Nodes deduplicated by id, with links between parts resolved
+        """
+        return Graph.merge(graphs)
+
+    def export_data(self, graph: Graph, target: BinaryIO):
+        """Write a graph in this plugin's format, so that load_data can read it back
+
+        Args:
+            graph: The graph to write
+            target: Binary file object to write to
+
+        Raises:
+            NotImplementedError: If the plugin cannot write graphs
+        """
+        raise NotImplementedError(f"{self.name()} cannot export graphs")
@@ -3,6 +3,15 @@ from .base_plugin import BasePlugin
 
 
 class VisualizerPlugin(BasePlugin):
-    def visualize(self, graph: Graph):
-        """Visualize the graph in some way"""
-        pass
\ No newline at end of file
+    # Read template files again when they change on disk; the web app sets this with DEBUG
+    reload_templates: bool = False
+    # Plugins that set this take node positions laid out on the server as the `positions` argument
+    uses_layout: bool = False
+
+    def visualize(self, graph: Graph, positions: dict | None = None):
+        """Visualize the graph in some way
+
+        positions, if given, maps every node id to an (x, y) position centred
+        on the origin.
+        """
+        pass
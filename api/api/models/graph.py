@@ -2,53 +2,291 @@ from .link import Link
 from .node import Node
 
 class Graph(object):
-    def __init__(self, nodes: list=None, links: list=None):            
+    def __init__(self, nodes: list=None, links: list=None):
+        # Bumped by every mutator; indexes built through get_index are cached per version.
+        self.version: int = 0
+        self._derived: dict = {}
+        self._node_index: dict = {}
+        self._link_index: dict = {}
+        self._outgoing: dict = {}
+        self._incoming: dict = {}
+        # Links added in bulk whose endpoints were missing; merge() retries them
+        self.unresolved_links: list = []
+
         self.nodes = nodes
         self.links = links
 
-        if self.nodes is None:
-            self.nodes = []
+    @property
+    def nodes(self) -> list:
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes: list):
+        """Replace the node list and rebuild the id index."""
+        self._nodes = nodes if nodes is not None else []
+        self._node_index = {}
+        for node in self._nodes:
+            self._node_index.setdefault(node.id, node)
+        self._changed()
+
+    @property
+    def links(self) -> list:
+        return self._links
+
+    @links.setter
+    def links(self, links: list):
+        """Replace the link list and rebuild the link index and adjacency maps."""
+        self._links = links if links is not None else []
+        self._link_index = {}
+        self._outgoing = {}
+        self._incoming = {}
+        for link in self._links:
+            self._index_link(link)
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+
+    def get_index(self, key, build):
+        """Return derived data for the current version, building it with build(graph) when stale."""
+        cached = self._derived.get(key)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, build(self))
+            self._derived[key] = cached
+        return cached[1]
 
-        if self.links is None:
-            self.links = []
+    def _index_link(self, link: Link):
+        self._link_index.setdefault(link.id, link)
+        self._outgoing.setdefault(link.source, []).append(link)
+        self._incoming.setdefault(link.target, []).append(link)
+
+    def _unindex_link(self, link: Link):
+        if self._link_index.get(link.id) is link:
+            del self._link_index[link.id]
+        for adjacency, key in ((self._outgoing, link.source), (self._incoming, link.target)):
+            bucket = adjacency.get(key)
+            if bucket is None:
+                continue
+            bucket[:] = [l for l in bucket if l is not link]
+            if not bucket:
+                del adjacency[key]
 
     def _exists(self, node_id: int) -> bool:
-        for node in self.nodes:
-            if node.id == node_id:
-                return True
-        return False   
-    
+        return node_id in self._node_index
+
+    def get_node(self, node_id) -> Node | None:
+        return self._node_index.get(node_id)
+
+    def get_link(self, link_id) -> Link | None:
+        return self._link_index.get(link_id)
+
+    def outgoing_links(self, node_id) -> list:
+        return list(self._outgoing.get(node_id, ()))
+
+    def incoming_links(self, node_id) -> list:
+        return list(self._incoming.get(node_id, ()))
+
+    def successors(self, node_id) -> list:
+        return [l.target for l in self._outgoing.get(node_id, ())]
+
+    def predecessors(self, node_id) -> list:
+        return [l.source for l in self._incoming.get(node_id, ())]
+
+    def neighbors(self, node_id) -> set:
+        """Ids of all nodes connected to node_id by a link in either direction."""
+        return set(self.successors(node_id)) | set(self.predecessors(node_id))
+
     def add_node(self, node_id, attributes=None) -> bool:
         if not self._exists(node_id):
-            self.nodes.append(Node(node_id, attributes))
+            node = Node(node_id, attributes)
+            self._nodes.append(node)
+            self._node_index[node_id] = node
+            self._changed()
             return True
         return False
-    
+
     def add_link(self, link_id: int, source_id: int, target_id: int) -> bool:
         if self._exists(source_id) and self._exists(target_id):
-            self.links.append(Link(link_id, source_id, target_id))
+            link = Link(link_id, source_id, target_id)
+            self._links.append(link)
+            self._index_link(link)
+            self._changed()
             return True
         return False
-        
+
+    def add_nodes_bulk(self, nodes) -> int:
+        """Add (node_id, attributes) pairs, skipping ids that already exist.
+
+        Returns the number of nodes added.
+        """
+        added = 0
+        for node_id, attributes in nodes:
+            if node_id in self._node_index:
+                continue
+            node = Node(node_id, attributes)
+            self._nodes.append(node)
+            self._node_index[node_id] = node
+            added += 1
+        if added:
+            self._changed()
+        return added
+
+    def add_links_bulk(self, links) -> list:
+        """Add (link_id, source_id, target_id[, attributes]) tuples.
+
+        Endpoints are validated once, after the whole iterable has been read, so a
+        link may refer to a node added later in the same load. Links with a missing
+        endpoint are not added; they are returned and kept in unresolved_links.
+        """
+        pending = [Link(*spec) for spec in links]
+        dangling = []
+        for link in pending:
+            if link.source in self._node_index and link.target in self._node_index:
+                self._links.append(link)
+                self._index_link(link)
+            else:
+                dangling.append(link)
+        self.unresolved_links.extend(dangling)
+        if len(dangling) < len(pending):
+            self._changed()
+        return dangling
+
+    def remove_node(self, node_id) -> bool:
+        """Remove a node together with every link attached to it."""
+        if not self._exists(node_id):
+            return False
+        incident = {id(l): l for l in self._outgoing.get(node_id, []) + self._incoming.get(node_id, [])}
+        if incident:
+            self._links[:] = [l for l in self._links if id(l) not in incident]
+            for link in incident.values():
+                self._unindex_link(link)
+        self._nodes[:] = [n for n in self._nodes if n.id != node_id]
+        del self._node_index[node_id]
+        self._changed()
+        return True
+
+    def remove_link(self, link_id) -> bool:
+        """Remove every link with the given id."""
+        if link_id not in self._link_index:
+            return False
+        removed = [l for l in self._links if l.id == link_id]
+        self._links[:] = [l for l in self._links if l.id != link_id]
+        for link in removed:
+            self._unindex_link(link)
+        self._changed()
+        return True
+
+    def update_node(self, node_id, attributes: dict) -> bool:
+        """Merge attributes into an existing node."""
+        node = self._node_index.get(node_id)
+        if node is None:
+            return False
+        if node.attributes is None:
+            node.attributes = {}
+        node.attributes.update(attributes)
+        self._changed()
+        return True
+
+    def subgraph(self, nodes) -> 'Graph':
+        """Graph of the given nodes and the links between them, in their original order.
+
+        The new graph shares the nodes' attribute dicts. When only a small part of
+        the graph is kept, links are gathered from the adjacency maps instead of
+        scanning every link.
+        """
+        result = Graph([], [])
+        for node in nodes:
+            result.add_node(node.id, node.attributes)
+
+        if len(result._nodes) * 2 < len(self._nodes):
+            positions = self.get_index("link_positions", lambda g: {id(l): i for i, l in enumerate(g._links)})
+            links = [l for node_id in result._node_index for l in self._outgoing.get(node_id, ())]
+            links.sort(key=lambda l: positions[id(l)])
+        else:
+            links = self._links
+
+        for link in links:
+            result.add_link(link.id, link.source, link.target)
+        return result
+
+    def copy(self) -> 'Graph':
+        """Return a copy with its own Node/Link objects and attribute dicts."""
+        nodes = [Node(n.id, None if n.attributes is None else dict(n.attributes)) for n in self._nodes]
+        links = [Link(l.id, l.source, l.target, None if l.attributes is None else dict(l.attributes))
+                 for l in self._links]
+        return Graph(nodes, links)
+
+    def __getstate__(self) -> dict:
+        # Plain tuples pickle much faster than Node/Link objects; indexes and
+        # cached derived data are rebuilt on unpickling
+        return {
+            "nodes": [(n.id, n.attributes) for n in self._nodes],
+            "links": [(l.id, l.source, l.target, l.attributes) for l in self._links],
+            "unresolved_links": [(l.id, l.source, l.target, l.attributes) for l in self.unresolved_links],
+        }
+
+    def __setstate__(self, state: dict):
+        self.__init__([Node(*spec) for spec in state["nodes"]], [Link(*spec) for spec in state["links"]])
+        self.unresolved_links = [Link(*spec) for spec in state["unresolved_links"]]
+
+    @staticmethod
+    def merge(graphs) -> 'Graph':
+        """Combine graphs loaded separately, e.g. parts of one dataset, into one graph.
+
+        Nodes are matched by id: the first occurrence keeps its position and
+        attributes, later ones only add attribute keys it lacks. Links with the
+        same id and endpoints are added once. Unresolved links of every graph are
+        retried against the merged nodes, so links between parts are kept; they
+        follow the other links of their graph. The merged graph shares the parts'
+        Node and Link objects.
+        """
+        graphs = list(graphs)
+        nodes: dict = {}
+        for graph in graphs:
+            for node in graph.nodes:
+                first = nodes.get(node.id)
+                if first is None:
+                    if node.attributes is None:
+                        node.attributes = {}
+                    nodes[node.id] = node
+                elif node.attributes:
+                    for key, value in node.attributes.items():
+                        first.attributes.setdefault(key, value)
+
+        links = {}
+        for graph in graphs:
+            for link in graph.links + graph.unresolved_links:
+                links.setdefault((link.id, link.source, link.target), link)
+
+        result = Graph(list(nodes.values()))
+        resolved = []
+        for link in links.values():
+            if link.source in nodes and link.target in nodes:
+                resolved.append(link)
+            else:
+                result.unresolved_links.append(link)
+        result.links = resolved
+        return result
+
     def to_dict(self) -> dict:
         return {
             "nodes": [n.to_dict() for n in self.nodes],
             "links": [e.to_dict() for e in self.links]
         }
-    
+
     @staticmethod
     def from_dict(json_data):
         """Create Graph object from a dictionary."""
         if not json_data:
             return Graph([], [])
-        
+
         nodes_data = json_data.get("nodes", [])
         links_data = json_data.get("links", [])
-        
+
         # Reconstruct Node objects
         nodes = [Node.from_dict(n_data) for n_data in nodes_data]
-        
+
         # Reconstruct Link objects
         links = [Link.from_dict(l_data) for l_data in links_data]
-        
+
         return Graph(nodes, links)
@@ -1,8 +1,11 @@
 class Link(object):
-    def __init__(self, id: int, source: int, target: int):
+    __slots__ = ("id", "source", "target", "attributes")
+
+    def __init__(self, id: int, source: int, target: int, attributes: dict | None = None):
         self.id = id
         self.source = source
         self.target = target
+        self.attributes = attributes
 
     def __str__(self):
         return f"Link ID: {self.id}\Link Source: {self.source}\Link Target: {self.target}\n"
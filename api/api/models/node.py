@@ -4,6 +4,8 @@ from datetime import date, datetime
 from ..services.utils import DateTimeEncoder, sanitize_dates
 
 class Node(object):
+    __slots__ = ("id", "attributes")
+
     def __init__(self, id: int, attributes: dict | None = None):
         self.id = id
         self.attributes = attributes
@@ -1,19 +1,152 @@
+import threading
 import uuid
 from typing import List
 from api.models.graph import Graph
+from api.services.filter_pipeline import FilterPipeline, FilterStage
+from api.services.spatial import QuadTree
 
 
 class Workspace:
     def __init__(self, id: str = None, name: str = None, graph: Graph = None):
         self.id = id or str(uuid.uuid4())
         self.name = name or f"Workspace-{self.id[:8]}"
-        self.graph_data = graph.to_dict() if graph else None
-        self.filtered_graph_data = graph.to_dict() if graph else None
-        self.applied_filters: List[str] = []
+        self.graph: Graph | None = graph
+        self.filtered_graph: Graph | None = graph
+        self.pipeline = FilterPipeline(graph)
         self.current_data_source_id: str = None
         self.current_visualizer_id: str = "simple_visualizer"
         self.plugin_extensions_json: str = "{}"
 
+        # Bumped on every change to graph/filtered_graph; derived forms are cached per version.
+        self.version: int = 0
+        self.visualization_cache: dict[str, tuple[int, str]] = {}
+        self._dict_cache: dict[str, tuple[int, dict]] = {}
+        # False while filtered_graph may share Node objects or attribute dicts with another graph
+        self._owns_filtered_graph: bool = False
+        # Graphs may be swapped in by a background ingestion job while a request filters them
+        self._lock = threading.RLock()
+        # Supernodes the user opened in the visualization of a large filtered graph; cluster
+        # ids only hold for the graph they were made for, so any change of it clears them
+        self.expanded_clusters: set[str] = set()
+        # (version, {node id: (x, y)}) of the last server-side layout; the positions also
+        # warm-start the layout of the next version
+        self.layout: tuple[int, dict] | None = None
+        # (version, graph) of what is visualized, the filtered graph or its level-of-detail
+        # view, and (version, QuadTree) over its layout for viewport queries
+        self.visualized_graph: tuple[int, Graph] | None = None
+        self.spatial_index: tuple[int, QuadTree] | None = None
+
+    def touch(self):
+        """Mark the workspace graphs as changed, invalidating cached derived data."""
+        self.version += 1
+
+    @property
+    def applied_filters(self) -> List[str]:
+        return self.pipeline.labels
+
+    @applied_filters.setter
+    def applied_filters(self, labels: List[str]):
+        self.pipeline = FilterPipeline(self.filtered_graph, labels)
+
+    def set_graph(self, graph: Graph, data_source_id: str | None = None):
+        """Replace the loaded graph and clear all filters.
+
+        Filter changes wait for the swap, so none is applied to the old graph
+        and stored over the new one.
+        """
+        pipeline = FilterPipeline(graph)
+        with self._lock:
+            self.graph = graph
+            self.pipeline = pipeline
+            # Node ids of another graph may coincide, so nothing is warm-started from its layout
+            self.layout = None
+            if data_source_id is not None:
+                self.current_data_source_id = data_source_id
+            self.set_filtered_graph(graph)
+
+    def set_filtered_graph(self, graph: Graph):
+        self.filtered_graph = graph
+        self._owns_filtered_graph = False
+        self.expanded_clusters = set()
+        self.touch()
+
+    def expand_cluster(self, cluster_id: str):
+        with self._lock:
+            self.expanded_clusters.add(cluster_id)
+            self.touch()
+
+    def reset_filters(self):
+        with self._lock:
+            self.pipeline = FilterPipeline(self.graph)
+            self.set_filtered_graph(self.graph)
+
+    def apply_filter(self, stage: FilterStage) -> Graph:
+        with self._lock:
+            self.set_filtered_graph(self.pipeline.push(stage))
+            return self.filtered_graph
+
+    def undo_filter(self) -> bool:
+        """Drop the last undoable filter; earlier stages are not recomputed."""
+        with self._lock:
+            if self.pipeline.pop() is None:
+                return False
+            self.set_filtered_graph(self.pipeline.result())
+            return True
+
+    def _stage_index(self, index: int) -> int:
+        """Map an index into applied_filters to an index into the pipeline stages."""
+        stage_index = index - len(self.pipeline.frozen_labels)
+        if not 0 <= stage_index < len(self.pipeline.stages):
+            raise ValueError(f"Filter #{index} cannot be changed")
+        return stage_index
+
+    def edit_filter(self, index: int, stage: FilterStage) -> Graph:
+        with self._lock:
+            self.set_filtered_graph(self.pipeline.replace(self._stage_index(index), stage))
+            return self.filtered_graph
+
+    def remove_filter(self, index: int) -> Graph:
+        with self._lock:
+            self.set_filtered_graph(self.pipeline.remove(self._stage_index(index)))
+            return self.filtered_graph
+
+    def mutable_filtered_graph(self) -> Graph:
+        """Return the filtered graph for in-place editing, copying it first if it shares data."""
+        if not self._owns_filtered_graph:
+            self.filtered_graph = self.filtered_graph.copy() if self.filtered_graph else Graph()
+            self._owns_filtered_graph = True
+        self.expanded_clusters = set()
+        # Edits diverge from what the filter stages produced, so later filters start from here
+        self.pipeline = self.pipeline.rebased(self.filtered_graph)
+        return self.filtered_graph
+
+    def _cached_dict(self, key: str, graph: Graph | None) -> dict | None:
+        if graph is None:
+            return None
+        cached = self._dict_cache.get(key)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, graph.to_dict())
+            self._dict_cache[key] = cached
+        return cached[1]
+
+    @property
+    def graph_data(self) -> dict | None:
+        return self._cached_dict("graph", self.graph)
+
+    @graph_data.setter
+    def graph_data(self, data: dict | None):
+        """Replace the loaded graph, as set_graph does; set filtered_graph_data afterwards to restore filters."""
+        self.set_graph(Graph.from_dict(data) if data is not None else None)
+
+    @property
+    def filtered_graph_data(self) -> dict | None:
+        return self._cached_dict("filtered_graph", self.filtered_graph)
+
+    @filtered_graph_data.setter
+    def filtered_graph_data(self, data: dict | None):
+        self.set_filtered_graph(Graph.from_dict(data) if data is not None else None)
+        self.pipeline = self.pipeline.rebased(self.filtered_graph)
+
     def to_dict(self):
         return {
             "id": self.id,
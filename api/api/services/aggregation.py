@@ -0,0 +1,351 @@
+"""Level-of-detail views of large graphs, with clusters of nodes collapsed into supernodes.
+
+The nodes of a graph are arranged in a tree of clusters, built once per graph
+version by one of the METHODS. A view of the graph shows at most max_nodes
+items: it starts from the root cluster and expands the largest clusters while
+they fit, and always expands the clusters asked for (with their ancestors).
+Every cluster left collapsed becomes one supernode carrying the number of
+nodes it stands for and their aggregated attributes.
+"""
+import heapq
+from collections import Counter, deque
+
+from api.models.graph import Graph
+from api.models.link import Link
+from api.models.node import Node
+
+HIERARCHY = "hierarchy"
+COMPONENTS = "components"
+LABELS = "labels"
+METHODS = (HIERARCHY, COMPONENTS, LABELS)
+
+DEFAULT_MAX_NODES = 2000
+SUPERNODE_PREFIX = "cluster_"
+# Upper bound on label propagation rounds; it usually settles earlier
+LABEL_ROUNDS = 10
+
+
+class Cluster:
+    """A set of nodes shown as one supernode until expanded.
+
+    Expanding it shows its members as nodes and its children as (collapsed)
+    clusters. size counts the nodes of the whole subtree.
+    """
+
+    __slots__ = ("id", "members", "children", "parent", "size")
+
+    def __init__(self, members: list, children: list):
+        self.id = ""
+        self.members = members
+        self.children = children
+        self.parent: Cluster | None = None
+        self.size = len(members) + sum(child.size for child in children)
+
+    @property
+    def width(self) -> int:
+        """Number of items shown when the cluster is expanded."""
+        return len(self.members) + len(self.children)
+
+    def nodes(self):
+        """All nodes of the subtree."""
+        stack = [self]
+        while stack:
+            cluster = stack.pop()
+            yield from cluster.members
+            stack.extend(cluster.children)
+
+
+def _adjacency(graph: Graph) -> tuple[dict, list]:
+    """Node positions by id, and for every position the positions of its neighbours in either direction."""
+    position = {node.id: i for i, node in enumerate(graph.nodes)}
+    neighbours = [[] for _ in graph.nodes]
+    for link in graph.links:
+        s, t = position.get(link.source), position.get(link.target)
+        if s is not None and t is not None and s != t:
+            neighbours[s].append(t)
+            neighbours[t].append(s)
+    return position, neighbours
+
+
+def _bound(members: list, children: list, fanout: int) -> Cluster:
+    """Cluster of members and children, with items grouped into sub-clusters beyond fanout."""
+    items = children + members
+    while len(items) > fanout:
+        step = -(-len(items) // fanout)
+        groups = []
+        for start in range(0, len(items), step):
+            chunk = items[start:start + step]
+            if len(chunk) == 1:
+                groups.append(chunk[0])
+            else:
+                groups.append(Cluster([i for i in chunk if isinstance(i, Node)],
+                                      [i for i in chunk if isinstance(i, Cluster)]))
+        items = groups
+    return Cluster([i for i in items if isinstance(i, Node)], [i for i in items if isinstance(i, Cluster)])
+
+
+def _hierarchy(graph: Graph, fanout: int) -> Cluster:
+    """Subtrees of a breadth-first forest along link directions, e.g. parent-child links of JSON or XML.
+
+    Roots are the nodes without incoming links, then, for parts that are
+    cycles, the first node not reached yet. A node with children is a
+    cluster of itself, its leaf children and its children's clusters.
+    """
+    nodes = graph.nodes
+    position = {node.id: i for i, node in enumerate(nodes)}
+    targets = [[] for _ in nodes]
+    has_parent = [False] * len(nodes)
+    for link in graph.links:
+        s, t = position.get(link.source), position.get(link.target)
+        if s is not None and t is not None and s != t:
+            targets[s].append(t)
+            has_parent[t] = True
+
+    tree_children = [[] for _ in nodes]
+    seen = [False] * len(nodes)
+    order = []
+    roots = []
+    candidates = [i for i in range(len(nodes)) if not has_parent[i]] + list(range(len(nodes)))
+    for root in candidates:
+        if seen[root]:
+            continue
+        seen[root] = True
+        roots.append(root)
+        queue = deque([root])
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for t in targets[i]:
+                if not seen[t]:
+                    seen[t] = True
+                    tree_children[i].append(t)
+                    queue.append(t)
+
+    clusters: list[Cluster | None] = [None] * len(nodes)
+    for i in reversed(order):
+        children = tree_children[i]
+        if children:
+            clusters[i] = _bound([nodes[i]] + [nodes[c] for c in children if clusters[c] is None],
+                                 [clusters[c] for c in children if clusters[c] is not None], fanout)
+    return _bound([nodes[r] for r in roots if clusters[r] is None],
+                  [clusters[r] for r in roots if clusters[r] is not None], fanout)
+
+
+def _components(neighbours: list, indices) -> list[list[int]]:
+    """Connected components among indices, each in breadth-first order."""
+    allowed = set(indices)
+    seen = set()
+    components = []
+    for start in indices:
+        if start in seen:
+            continue
+        seen.add(start)
+        component = [start]
+        for i in component:
+            for j in neighbours[i]:
+                if j in allowed and j not in seen:
+                    seen.add(j)
+                    component.append(j)
+        components.append(component)
+    return components
+
+
+def _label_propagation(neighbours: list, indices: list[int]) -> list[list[int]]:
+    """Communities among indices: every node repeatedly takes its neighbours' most common label.
+
+    Nodes are visited in order and ties go to the smallest label, so the
+    result is deterministic. Each community keeps the order of indices.
+    """
+    allowed = set(indices)
+    label = {i: i for i in indices}
+    for _ in range(LABEL_ROUNDS):
+        changed = False
+        for i in indices:
+            counts = Counter(label[j] for j in neighbours[i] if j in allowed)
+            if not counts:
+                continue
+            best = max(counts.values())
+            new = min(l for l, c in counts.items() if c == best)
+            if new != label[i]:
+                label[i] = new
+                changed = True
+        if not changed:
+            break
+
+    communities: dict[int, list[int]] = {}
+    for i in indices:
+        communities.setdefault(label[i], []).append(i)
+    return list(communities.values())
+
+
+def _partition(graph: Graph, method: str, fanout: int, max_nodes: int) -> Cluster:
+    """Flat clusters (components or label propagation communities), split further while too large."""
+    nodes = graph.nodes
+    _, neighbours = _adjacency(graph)
+    everything = list(range(len(nodes)))
+    groups = _components(neighbours, everything) if method == COMPONENTS else _label_propagation(neighbours, everything)
+
+    def cluster(indices: list[int], split: bool) -> Cluster:
+        if split and len(indices) > max_nodes:
+            # A large component is divided into communities; a large community into chunks
+            parts = _label_propagation(neighbours, indices)
+            if len(parts) > 1:
+                return _bound([nodes[p[0]] for p in parts if len(p) == 1],
+                              [cluster(p, False) for p in parts if len(p) > 1], fanout)
+        # Breadth-first order keeps chunks of a large community connected
+        ordered = [i for component in _components(neighbours, indices) for i in component]
+        return _bound([nodes[i] for i in ordered], [], fanout)
+
+    split = method == COMPONENTS
+    return _bound([nodes[g[0]] for g in groups if len(g) == 1],
+                  [cluster(g, split) for g in groups if len(g) > 1], fanout)
+
+
+def _supernode_prefix(graph: Graph) -> str:
+    """SUPERNODE_PREFIX, lengthened with underscores until no node or link id of graph starts with it.
+
+    Ids of supernodes and of the links combined into them then never equal
+    an id of the graph, whatever ids it uses.
+    """
+    prefix = SUPERNODE_PREFIX
+    ids = [str(node.id) for node in graph.nodes] + [str(link.id) for link in graph.links]
+    while True:
+        ids = [i for i in ids if i.startswith(prefix)]
+        if not ids:
+            return prefix
+        prefix += "_"
+
+
+def cluster_tree(graph: Graph, method: str = HIERARCHY, max_nodes: int = DEFAULT_MAX_NODES) -> Cluster:
+    """The graph's cluster tree, cached until the graph changes.
+
+    Expanding a cluster shows at most a quarter of max_nodes items; wider
+    clusters are grouped into sub-clusters.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown clustering method: {method}")
+    fanout = max(2, max_nodes // 4)
+
+    def build(g: Graph) -> Cluster:
+        root = _hierarchy(g, fanout) if method == HIERARCHY else _partition(g, method, fanout, max_nodes)
+        prefix = g.get_index("supernode_prefix", _supernode_prefix)
+        # Ids in depth-first order, stable for a given graph
+        counter = 0
+        stack = [root]
+        while stack:
+            cluster = stack.pop()
+            cluster.id = prefix + str(counter)
+            counter += 1
+            for child in reversed(cluster.children):
+                child.parent = cluster
+                stack.append(child)
+        return root
+
+    return graph.get_index(("cluster_tree", method, max_nodes), build)
+
+
+def _summary(cluster: Cluster) -> dict:
+    """Attributes of a supernode: its node count, the mean of each numeric attribute and the common values of others.
+
+    A value counts as common when at least half of the nodes share it.
+    """
+    numbers: dict[str, list] = {}
+    others: dict[str, Counter] = {}
+    for node in cluster.nodes():
+        for key, value in (node.attributes or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                numbers.setdefault(key, []).append(value)
+            elif isinstance(value, (str, bool)):
+                others.setdefault(key, Counter())[value] += 1
+
+    attributes = {"supernode": True, "count": cluster.size}
+    first = cluster.members[0] if cluster.members else None
+    if first is not None:
+        attributes["label"] = str(first.id)
+    for key, values in numbers.items():
+        attributes[f"{key} (mean)"] = round(sum(values) / len(values), 3)
+    for key, counts in others.items():
+        value, count = counts.most_common(1)[0]
+        if key not in numbers and count * 2 >= cluster.size:
+            attributes.setdefault(key, value)
+    return attributes
+
+
+def aggregate(graph: Graph, max_nodes: int = DEFAULT_MAX_NODES, method: str = HIERARCHY,
+              expanded=()) -> Graph:
+    """A view of graph with at most about max_nodes nodes, clusters beyond that shown as supernodes.
+
+    expanded holds ids of supernodes to show opened, e.g. because the user
+    asked for them; they are opened even beyond max_nodes. Nodes that stay
+    visible keep their Node objects and links; links into or out of a
+    supernode are combined into one link per pair of endpoints.
+    """
+    if len(graph.nodes) <= max_nodes:
+        return graph
+
+    root = cluster_tree(graph, method, max_nodes)
+    by_id = {}
+    if expanded:
+        stack = [root]
+        while stack:
+            cluster = stack.pop()
+            by_id[cluster.id] = cluster
+            stack.extend(cluster.children)
+    opened = {root.id}
+    for cluster_id in expanded:
+        cluster = by_id.get(cluster_id)
+        while cluster is not None and cluster.id not in opened:
+            opened.add(cluster.id)
+            cluster = cluster.parent
+
+    # Forced expansions first, then the largest collapsed clusters while they fit
+    shown = 0
+    frontier = []
+    stack = [root]
+    while stack:
+        cluster = stack.pop()
+        shown += len(cluster.members)
+        for child in cluster.children:
+            if child.id in opened:
+                stack.append(child)
+            else:
+                shown += 1
+                heapq.heappush(frontier, (-child.size, child.id, child))
+    while frontier:
+        _, _, cluster = heapq.heappop(frontier)
+        if shown - 1 + cluster.width > max_nodes:
+            break
+        opened.add(cluster.id)
+        shown += cluster.width - 1
+        for child in cluster.children:
+            heapq.heappush(frontier, (-child.size, child.id, child))
+
+    nodes = []
+    representative = {}
+    stack = [root]
+    while stack:
+        cluster = stack.pop()
+        for node in cluster.members:
+            nodes.append(node)
+            representative[node.id] = node.id
+        for child in reversed(cluster.children):
+            if child.id in opened:
+                stack.append(child)
+                continue
+            nodes.append(Node(child.id, _summary(child)))
+            for node in child.nodes():
+                representative[node.id] = child.id
+
+    prefix = graph.get_index("supernode_prefix", _supernode_prefix)
+    links = []
+    combined = set()
+    for link in graph.links:
+        source, target = representative.get(link.source), representative.get(link.target)
+        if source is None or target is None or source == target:
+            continue
+        if source == link.source and target == link.target:
+            links.append(link)
+        elif (source, target) not in combined:
+            combined.add((source, target))
+            links.append(Link(f"{prefix}{source}->{target}", source, target))
+    return Graph(nodes, links)
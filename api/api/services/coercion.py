@@ -0,0 +1,135 @@
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable
+
+INT_RE = re.compile(r"^-?\d+$")
+FLOAT_RE = re.compile(r"^-?\d+\.\d+$")
+# Strings the day-first / unpadded date formats could accept; anything else skips strptime
+DATE_LIKE_RE = re.compile(r"^\d[\d./-]*$")
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y.", "%d/%m/%Y")
+
+SAMPLE_SIZE = 20
+
+MISMATCH = object()
+
+
+def _infer(value: str) -> tuple[str, Any]:
+    v = value.strip()
+    if not v or not (v[0].isdigit() or v[0] == '-'):
+        # Numbers and dates all start with a digit or a minus sign
+        return "text", value
+
+    if INT_RE.match(v):
+        return "int", int(v)
+
+    if FLOAT_RE.match(v):
+        return "float", float(v)
+
+    try:
+        parsed = datetime.fromisoformat(v)
+        # ISO dates without a time are at most 10 characters (YYYY-MM-DD, YYYYMMDD, YYYY-Www-D)
+        return ("datetime", parsed) if len(v) > 10 else ("date", parsed.date())
+    except ValueError:
+        pass
+
+    if DATE_LIKE_RE.match(v):
+        for fmt in DATE_FORMATS:
+            try:
+                return "date", datetime.strptime(v, fmt).date()
+            except ValueError:
+                continue
+
+    return "text", value
+
+
+def infer_value(value: Any) -> Any:
+    """Convert a string into int, float, date or datetime, or return it unchanged.
+
+    Surrounding whitespace is ignored when detecting the type; strings that are
+    none of these are returned as given. Non-string values are returned as is.
+    """
+    if not isinstance(value, str):
+        return value
+    return _infer(value)[1]
+
+
+def _to_int(value: str) -> Any:
+    v = value.strip()
+    return int(v) if INT_RE.match(v) else MISMATCH
+
+
+def _to_float(value: str) -> Any:
+    v = value.strip()
+    return float(v) if FLOAT_RE.match(v) else MISMATCH
+
+
+def _to_date(value: str) -> Any:
+    v = value.strip()
+    # Only YYYY-MM-DD, so compact forms like 20240101 keep being read as ints
+    if len(v) != 10 or v[4] != '-' or v[7] != '-':
+        return MISMATCH
+    try:
+        return datetime.fromisoformat(v).date()
+    except ValueError:
+        return MISMATCH
+
+
+def _to_datetime(value: str) -> Any:
+    v = value.strip()
+    if len(v) <= 10 or v[4:5] != '-' or v[10] not in 'T ':
+        return MISMATCH
+    try:
+        return datetime.fromisoformat(v)
+    except ValueError:
+        return MISMATCH
+
+
+def _to_text(value: str) -> Any:
+    v = value.lstrip()
+    if not v or not (v[0].isdigit() or v[0] == '-'):
+        return value
+    return MISMATCH
+
+
+CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "int": _to_int,
+    "float": _to_float,
+    "date": _to_date,
+    "datetime": _to_datetime,
+    "text": _to_text,
+}
+
+
+class AttributeCoercer:
+    """Types attribute strings read by a data source, learning the type of each key.
+
+    The first sample_size values of a key go through full inference; after that
+    the key's most common type picks a converter that only checks for that type.
+    Values the converter does not accept fall back to full inference, so every
+    value is typed exactly as infer_value() would type it.
+    """
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.kinds: dict[str, str] = {}
+        self._converters: dict[str, Callable[[str], Any]] = {}
+        self._samples: dict[str, Counter] = {}
+
+    def coerce(self, key: str, value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+
+        converter = self._converters.get(key)
+        if converter is not None:
+            result = converter(value)
+            return result if result is not MISMATCH else _infer(value)[1]
+
+        kind, result = _infer(value)
+        samples = self._samples.setdefault(key, Counter())
+        samples[kind] += 1
+        if samples.total() >= self.sample_size:
+            self.kinds[key] = samples.most_common(1)[0][0]
+            self._converters[key] = CONVERTERS[self.kinds[key]]
+            del self._samples[key]
+        return result
@@ -0,0 +1,108 @@
+from api.models.graph import Graph
+from api.services.search_filter import match_filter, match_search
+
+
+STAGE_ARITY = {"search": 1, "filter": 3}
+
+
+class FilterStage:
+    """One search or attribute filter step of a FilterPipeline.
+
+    After the pipeline runs, `nodes` holds the nodes that survive this stage and
+    every stage before it, and `ids` their ids.
+    """
+
+    def __init__(self, kind: str, *args: str):
+        if STAGE_ARITY.get(kind) != len(args):
+            raise ValueError(f"Invalid filter stage: {kind} {args}")
+        self.kind = kind
+        self.args = args
+        self.nodes: list | None = None
+        self.ids: set | None = None
+
+    @property
+    def label(self) -> str:
+        if self.kind == "search":
+            return self.args[0]
+        attr, op, val = self.args
+        return f"{attr} {op} {val}"
+
+    def match(self, graph: Graph) -> list:
+        if self.kind == "search":
+            return match_search(graph, *self.args)
+        return match_filter(graph, *self.args)
+
+
+class FilterPipeline:
+    """Chain of filter stages over a base graph with a cached result per stage.
+
+    Every stage is matched against the base graph, whose search and range indexes
+    are cached, and intersected with the survivors of the previous stage. Adding
+    or popping the last stage costs one stage; editing or removing stage i reruns
+    stages i and later only.
+    """
+
+    def __init__(self, base: Graph | None = None, frozen_labels: list[str] | None = None):
+        self.base = base if base is not None else Graph()
+        # Labels of filters that were applied before base was taken and cannot be undone
+        self.frozen_labels: list[str] = list(frozen_labels or [])
+        self.stages: list[FilterStage] = []
+        self._base_version = self.base.version
+
+    @property
+    def labels(self) -> list[str]:
+        return self.frozen_labels + [stage.label for stage in self.stages]
+
+    def rebased(self, base: Graph) -> 'FilterPipeline':
+        """A pipeline over base that keeps the current labels as non-undoable history."""
+        return FilterPipeline(base, self.labels)
+
+    def _run(self, start: int):
+        if self.base.version != self._base_version:
+            start = 0
+            self._base_version = self.base.version
+
+        prev_ids = self.stages[start - 1].ids if start > 0 else None
+        for stage in self.stages[start:]:
+            nodes = stage.match(self.base)
+            if prev_ids is not None:
+                nodes = [n for n in nodes if n.id in prev_ids]
+            stage.nodes = nodes
+            stage.ids = {n.id for n in nodes}
+            prev_ids = stage.ids
+
+    def result(self) -> Graph:
+        if not self.stages:
+            return self.base
+        if self.base.version != self._base_version:
+            self._run(0)
+        return self.base.subgraph(self.stages[-1].nodes)
+
+    def push(self, stage: FilterStage) -> Graph:
+        self.stages.append(stage)
+        try:
+            self._run(len(self.stages) - 1)
+        except Exception:
+            self.stages.pop()
+            raise
+        return self.result()
+
+    def pop(self) -> FilterStage | None:
+        """Remove the last stage; earlier stages keep their cached results."""
+        return self.stages.pop() if self.stages else None
+
+    def replace(self, index: int, stage: FilterStage) -> Graph:
+        old = self.stages[index]
+        self.stages[index] = stage
+        try:
+            self._run(index)
+        except Exception:
+            self.stages[index] = old
+            self._run(index)
+            raise
+        return self.result()
+
+    def remove(self, index: int) -> Graph:
+        del self.stages[index]
+        self._run(index)
+        return self.result()
@@ -0,0 +1,177 @@
+"""Force-directed layout of graphs computed on the server, so browsers start from settled positions.
+
+Forces are those of Fruchterman and Reingold: linked nodes attract with
+d²/k, all nodes repel with c·k²/d, k being the link length. Repulsion between
+all pairs is approximated on a grid: node counts per cell are convolved
+with the force kernel by FFT and read back at each node's cell, with nodes
+sharing a cell pushed away from the cell's centre of mass. An iteration
+costs O(n + m + G² log G) for n nodes, m links and a G×G grid.
+"""
+import math
+
+from api.models.graph import Graph
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; without it visualizers lay graphs out in the browser
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Same as the link distance of the visualizers' d3 simulations
+LINK_DISTANCE = 100.0
+ITERATIONS = 150
+# Iterations when most nodes keep their previous positions
+WARM_ITERATIONS = 40
+# Fraction of nodes with previous positions from which a layout is warm-started
+WARM_FRACTION = 0.5
+# c above; below 1 it keeps the many leaves of large trees from stretching their links
+REPULSION = 0.2
+# Pull toward the centre, keeping unlinked parts from drifting apart
+GRAVITY = 0.1
+# Step size of nodes that keep their previous position, relative to new nodes
+WARM_MOBILITY = 0.005
+MIN_GRID, MAX_GRID = 32, 256
+
+# Kernel spectra by grid size; they depend on nothing else
+_kernels: dict[int, tuple] = {}
+
+
+def _kernel(grid: int):
+    """FFTs of the repulsion kernel (dx, dy) / (dx² + dy²) over cell offsets, padded for a linear convolution."""
+    cached = _kernels.get(grid)
+    if cached is None:
+        size = 2 * grid
+        offsets = np.fft.fftfreq(size, 1 / size)
+        dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+        r2 = dx * dx + dy * dy
+        r2[0, 0] = 1.0
+        kx, ky = dx / r2, dy / r2
+        kx[0, 0] = ky[0, 0] = 0.0
+        cached = _kernels[grid] = (np.fft.rfft2(kx), np.fft.rfft2(ky))
+    return cached
+
+
+def _repulsion(pos, strength: float):
+    """Approximate sum over all other nodes of strength (p - q) / |p - q|² for every node p."""
+    n = len(pos)
+    grid = int(min(MAX_GRID, max(MIN_GRID, 2 ** math.ceil(math.log2(math.sqrt(n) * 2)))))
+    low = pos.min(axis=0)
+    cell = max(float((pos.max(axis=0) - low).max()) / (grid - 1), 1e-9)
+    ij = np.minimum(((pos - low) / cell).astype(np.intp), grid - 1)
+    flat = ij[:, 0] * grid + ij[:, 1]
+
+    counts = np.bincount(flat, minlength=grid * grid).astype(np.float64)
+    padded = np.zeros((2 * grid, 2 * grid))
+    padded[:grid, :grid] = counts.reshape(grid, grid)
+    spectrum = np.fft.rfft2(padded)
+    kx, ky = _kernel(grid)
+    fx = np.fft.irfft2(spectrum * kx, padded.shape)[:grid, :grid].ravel()
+    fy = np.fft.irfft2(spectrum * ky, padded.shape)[:grid, :grid].ravel()
+    force = np.column_stack((fx[flat], fy[flat])) * (strength / cell)
+
+    # Nodes in the same cell see no force from each other above; push them off their centre of mass
+    shared = counts[flat] > 1
+    if shared.any():
+        centre = np.column_stack((np.bincount(flat, pos[:, 0], grid * grid),
+                                  np.bincount(flat, pos[:, 1], grid * grid)))[flat] / counts[flat, None]
+        offset = pos[shared] - centre[shared]
+        d2 = np.maximum((offset * offset).sum(axis=1), 1e-4 * cell * cell)
+        force[shared] += offset * (strength * (counts[flat][shared] - 1) / d2)[:, None]
+    return force
+
+
+def _initial(graph: Graph, previous: dict | None, k: float):
+    """Start positions, and which nodes have them from previous.
+
+    Other nodes start next to placed neighbours or on a spiral.
+    """
+    n = len(graph.nodes)
+    # Spiral of evenly spaced points, as d3 places nodes without positions
+    i = np.arange(n) + 0.5
+    angle = i * math.pi * (3 - math.sqrt(5))
+    radius = 0.5 * k * np.sqrt(i)
+    pos = np.column_stack((radius * np.cos(angle), radius * np.sin(angle)))
+    placed = np.zeros(n, dtype=bool)
+    if not previous:
+        return pos, placed
+
+    for index, node in enumerate(graph.nodes):
+        xy = previous.get(node.id)
+        if xy is not None:
+            pos[index] = xy
+            placed[index] = True
+    kept = placed.copy()
+    if 0 < kept.sum() < n:
+        source, target = _link_arrays(graph)
+        # Spread placement from placed nodes along links, a few hops at a time
+        for _ in range(8):
+            both = np.concatenate((source, target)), np.concatenate((target, source))
+            usable = placed[both[1]] & ~placed[both[0]]
+            if not usable.any():
+                break
+            ends = both[0][usable]
+            total = np.bincount(ends, minlength=n)
+            sums = np.column_stack((np.bincount(ends, pos[both[1][usable], 0], n),
+                                    np.bincount(ends, pos[both[1][usable], 1], n)))
+            fresh = total > 0
+            # Small spiral offsets keep siblings from starting on one point
+            pos[fresh] = sums[fresh] / total[fresh, None] + 0.1 * pos[fresh] / np.sqrt(i[fresh, None])
+            placed |= fresh
+    return pos, kept
+
+
+def _link_arrays(graph: Graph):
+    index = {node.id: i for i, node in enumerate(graph.nodes)}
+    pairs = [(index[l.source], index[l.target]) for l in graph.links
+             if l.source in index and l.target in index and l.source != l.target]
+    if not pairs:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    array = np.array(pairs, dtype=np.intp)
+    return array[:, 0], array[:, 1]
+
+
+def force_layout(graph: Graph, previous: dict | None = None, iterations: int | None = None,
+                 link_distance: float = LINK_DISTANCE) -> dict:
+    """Positions {node id: (x, y)} centred on the origin.
+
+    previous holds positions of an earlier layout, e.g. of the graph before
+    an edit or a filter. When most nodes have one, the layout starts from
+    them and settles the changes in fewer iterations, with those nodes
+    moving slowly so that they stay about where they were; new nodes start
+    next to their placed neighbours.
+
+    Raises:
+        RuntimeError: If numpy is not installed
+    """
+    if np is None:
+        raise RuntimeError("force_layout needs numpy")
+    n = len(graph.nodes)
+    if n == 0:
+        return {}
+
+    k = link_distance
+    pos, kept = _initial(graph, previous, k)
+    source, target = _link_arrays(graph)
+    warm = kept.sum() >= WARM_FRACTION * n
+    if iterations is None:
+        iterations = WARM_ITERATIONS if warm else ITERATIONS
+    # Largest step, cooling linearly; a warm start only needs to settle locally
+    start = k if warm else k * math.sqrt(n) / 4
+    mobility = np.where(kept, WARM_MOBILITY, 1.0) if warm else np.ones(n)
+    for step in range(iterations):
+        force = _repulsion(pos, REPULSION * k * k) if n > 1 else np.zeros_like(pos)
+        if len(source):
+            delta = pos[target] - pos[source]
+            pull = delta * (np.sqrt((delta * delta).sum(axis=1)) / k)[:, None]
+            force[:, 0] += np.bincount(source, pull[:, 0], n) - np.bincount(target, pull[:, 0], n)
+            force[:, 1] += np.bincount(source, pull[:, 1], n) - np.bincount(target, pull[:, 1], n)
+        force -= GRAVITY * (pos - pos.mean(axis=0))
+
+        limit = (start * (1 - step / iterations) + 0.01 * k) * mobility
+        length = np.sqrt((force * force).sum(axis=1))
+        pos += force * (np.minimum(length, limit) / np.maximum(length, 1e-9))[:, None]
+
+    pos -= pos.mean(axis=0)
+    rounded = np.round(pos, 1).tolist()
+    return {node.id: tuple(xy) for node, xy in zip(graph.nodes, rounded)}
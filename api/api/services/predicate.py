@@ -0,0 +1,98 @@
+import operator
+from datetime import date, datetime
+from typing import Any
+
+from api.services.utils import normalize_text
+
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+MISSING = object()
+
+
+def to_number(text: str) -> int | float | None:
+    """Parse text as an int or float, or return None."""
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            continue
+    return None
+
+
+def to_datetime(text: str) -> datetime | None:
+    """Parse an ISO date or datetime string, or return None."""
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def lookup(attributes: dict | None, keys: tuple[str, ...]) -> Any:
+    """Return the value stored under the first of keys present in attributes, or MISSING."""
+    if attributes:
+        for key in keys:
+            if key in attributes:
+                return attributes[key]
+    return MISSING
+
+
+class Predicate:
+    """An `attr op val` filter condition compiled once and evaluated against many nodes.
+
+    The comparison depends on the node's value:
+    - int/float values compare numerically against val parsed as a number,
+    - date/datetime values compare against val parsed as an ISO date, when it is one,
+    - anything else compares as lowercased, stripped text.
+    """
+
+    def __init__(self, attr: str, op: str, val: str):
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        self.attr = attr.strip()
+        self.op = op
+        self.compare = OPERATORS[op]
+        # Exact key first, then the lowercased form the old filter looked up
+        self.keys = tuple(dict.fromkeys((self.attr, self.attr.lower())))
+
+        raw = val.strip()
+        self.val = raw
+        self.text = raw.lower()
+        self.number = to_number(raw)
+        self.datetime = to_datetime(raw)
+
+    def lookup(self, attributes: dict | None) -> Any:
+        """Return the node's value for this attribute, or MISSING."""
+        return lookup(attributes, self.keys)
+
+    def check_number(self):
+        """Raise if a numeric attribute value has to be compared with a non-numeric val."""
+        if self.number is None:
+            raise ValueError(f"Cannot compare numeric attribute '{self.attr}' with '{self.val}'")
+
+    def matches_value(self, value: Any) -> bool:
+        if isinstance(value, (int, float)):
+            self.check_number()
+            return self.compare(value, self.number)
+
+        if isinstance(value, date) and self.datetime is not None:
+            other = self.datetime if isinstance(value, datetime) else self.datetime.date()
+            try:
+                return self.compare(value, other)
+            except TypeError:
+                # Naive vs. timezone-aware datetimes; fall back to text comparison
+                pass
+
+        return self.compare(normalize_text(value), self.text)
+
+    def __call__(self, attributes: dict | None) -> bool:
+        value = self.lookup(attributes)
+        if value is MISSING:
+            return False
+        return self.matches_value(value)
@@ -0,0 +1,40 @@
+"""Progress of loading a data source, for callers that display it or cancel the load."""
+from typing import Callable
+
+# Called as progress(bytes_read, nodes_parsed); an exception raised by it aborts the load
+ProgressCallback = Callable[[int, int], None]
+
+# Nodes parsed between two reports
+NODE_INTERVAL = 10_000
+
+
+class ProgressReporter:
+    """Counts the bytes a loader reads and the nodes it parses and reports them to a ProgressCallback.
+
+    Bytes are reported with every buffer filled from the source, nodes every
+    NODE_INTERVAL nodes, so the callback runs often enough to cancel a load
+    promptly and rarely enough not to slow it down.
+    """
+
+    def __init__(self, callback: ProgressCallback):
+        self.callback = callback
+        self.bytes_read = 0
+        self.nodes = 0
+        self._next_report = NODE_INTERVAL
+
+    @classmethod
+    def from_kwargs(cls, kwargs: dict) -> 'ProgressReporter | None':
+        """Reporter for the `progress` parameter of a load, or None if there is none."""
+        callback = kwargs.get('progress')
+        return cls(callback) if callback else None
+
+    def read(self, count: int):
+        self.bytes_read += count
+        self.callback(self.bytes_read, self.nodes)
+
+    def parsed(self, nodes: int):
+        """Record the number of nodes parsed so far."""
+        if nodes >= self._next_report:
+            self.nodes = nodes
+            self._next_report = nodes + NODE_INTERVAL
+            self.callback(self.bytes_read, nodes)
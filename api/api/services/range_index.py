@@ -0,0 +1,109 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from operator import itemgetter
+
+from api.models.graph import Graph
+from api.services.predicate import Predicate, MISSING
+from api.services.utils import normalize_text
+
+
+class SortedColumn:
+    """Values of one kind sorted together with the positions of the nodes holding them."""
+
+    __slots__ = ("values", "positions")
+
+    def __init__(self, pairs: list[tuple]):
+        pairs.sort(key=itemgetter(0))
+        self.values = [v for v, _ in pairs]
+        self.positions = [p for _, p in pairs]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def select(self, op: str, value) -> list[int]:
+        """Positions whose value satisfies `stored op value`, in O(log n + k)."""
+        values = self.values
+        if op == '==':
+            return self.positions[bisect_left(values, value):bisect_right(values, value)]
+        if op == '!=':
+            return self.positions[:bisect_left(values, value)] + self.positions[bisect_right(values, value):]
+        if op == '<':
+            return self.positions[:bisect_left(values, value)]
+        if op == '<=':
+            return self.positions[:bisect_right(values, value)]
+        if op == '>':
+            return self.positions[bisect_right(values, value):]
+        if op == '>=':
+            return self.positions[bisect_left(values, value):]
+        raise ValueError(f"Unknown operator: {op}")
+
+
+class RangeIndex:
+    """Per-attribute sorted index answering filter predicates with bisect.
+
+    Values are split by the comparison filter() would use for them: numbers,
+    plain dates and text each get a SortedColumn, while datetimes and NaNs are
+    evaluated one by one. The columns are built on the second query, so an
+    attribute that is filtered only once costs a single scan.
+    """
+
+    def __init__(self, graph: Graph, keys: tuple[str, ...]):
+        self.nodes = list(graph.nodes)
+        self.keys = keys
+        self._queries = 0
+        self._built = False
+        self.numbers: SortedColumn | None = None
+        self.dates: SortedColumn | None = None
+        self.texts: SortedColumn | None = None
+        self.others: list[tuple[int, object]] = []
+
+    def _build(self, predicate: Predicate):
+        numbers, dates, texts = [], [], []
+        for pos, node in enumerate(self.nodes):
+            value = predicate.lookup(node.attributes)
+            if value is MISSING:
+                continue
+            if isinstance(value, (int, float)):
+                if value == value:
+                    numbers.append((value, pos))
+                else:
+                    self.others.append((pos, value))
+            elif isinstance(value, date):
+                if isinstance(value, datetime):
+                    self.others.append((pos, value))
+                else:
+                    dates.append((value, pos))
+            else:
+                texts.append((normalize_text(value), pos))
+        self.numbers = SortedColumn(numbers)
+        self.dates = SortedColumn(dates)
+        self.texts = SortedColumn(texts)
+        self._built = True
+
+    def select(self, predicate: Predicate) -> list[int]:
+        """Positions of the nodes matching predicate, in graph order."""
+        if not self._built:
+            self._queries += 1
+            if self._queries < 2:
+                return [pos for pos, node in enumerate(self.nodes) if predicate(node.attributes)]
+            self._build(predicate)
+
+        matches: list[int] = []
+        if len(self.numbers):
+            predicate.check_number()
+            matches += self.numbers.select(predicate.op, predicate.number)
+        if len(self.dates):
+            if predicate.datetime is not None:
+                matches += self.dates.select(predicate.op, predicate.datetime.date())
+            else:
+                matches += [pos for value, pos in zip(self.dates.values, self.dates.positions)
+                            if predicate.matches_value(value)]
+        if len(self.texts):
+            matches += self.texts.select(predicate.op, predicate.text)
+        matches += [pos for pos, value in self.others if predicate.matches_value(value)]
+        matches.sort()
+        return matches
+
+
+def get_range_index(g: Graph, predicate: Predicate) -> RangeIndex:
+    return g.get_index(("range",) + predicate.keys, lambda graph: RangeIndex(graph, predicate.keys))
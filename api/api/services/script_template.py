@@ -0,0 +1,39 @@
+"""Script templates that visualizer plugins fill with graph JSON."""
+import os
+
+PLACEHOLDER = "GRAPH_JSON"
+
+
+class ScriptTemplate:
+    """A script file with one placeholder, read and split around it once per process.
+
+    With reload, the file's modification time is checked on every use and the
+    file is read again when it has changed, so edits show up without a restart.
+    """
+
+    def __init__(self, path: str, placeholder: str = PLACEHOLDER):
+        self.path = path
+        self.placeholder = placeholder
+        # (mtime, prefix, suffix), replaced as a whole so concurrent readers see one version
+        self._state: tuple[int, str, str] | None = None
+
+    def parts(self, reload: bool = False) -> tuple[str, str]:
+        """The text before and after the placeholder."""
+        state = self._state
+        if state is None or reload and os.stat(self.path).st_mtime_ns != state[0]:
+            state = self._load()
+        return state[1], state[2]
+
+    def _load(self) -> tuple[int, str, str]:
+        mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, encoding='utf-8') as f:
+            prefix, found, suffix = f.read().partition(self.placeholder)
+        if not found:
+            raise ValueError(f"Template {self.path} has no {self.placeholder} placeholder")
+        self._state = (mtime, prefix, suffix)
+        return self._state
+
+    def render(self, data: str, reload: bool = False) -> str:
+        """The script with data in place of the placeholder, built with a single copy."""
+        prefix, suffix = self.parts(reload)
+        return "".join((prefix, data, suffix))
@@ -1,47 +1,44 @@
 from api.models.graph import Graph
+from api.services.predicate import OPERATORS, Predicate
+from api.services.range_index import get_range_index
+from api.services.search_index import get_search_index
+from api.services.vector_index import VECTORIZE_MIN_NODES, vector_select
 
 
+def match_search(g: Graph, text: str) -> list:
+    """Nodes of g kept by search(g, text), in graph order."""
+    if text is None or text == "":
+        return list(g.nodes)
+    index = get_search_index(g)
+    return [index.nodes[pos] for pos in index.substring(text.strip().lower())]
+
+def match_filter(g: Graph, attr: str, op: str, val: str, vectorized: bool | None = None) -> list:
+    """Nodes of g kept by filter(g, attr, op, val), in graph order.
+
+    vectorized forces (True) or disables (False) the NumPy path for numeric and
+    date attributes; by default it is used for large graphs when numpy is installed.
+    """
+    if op not in OPERATORS:
+        return list(g.nodes)
+    if attr is None or attr == "" or val is None or val == "":
+        return list(g.nodes)
+    predicate = Predicate(attr, op, val)
+    if vectorized or vectorized is None and len(g.nodes) >= VECTORIZE_MIN_NODES:
+        selected = vector_select(g, predicate)
+        if selected is not None:
+            nodes, positions = selected
+            return [nodes[pos] for pos in positions]
+    index = get_range_index(g, predicate)
+    return [index.nodes[pos] for pos in index.select(predicate)]
+
 def search(g: Graph, text: str) -> Graph:
     if text is None or text == "":
         return g
-    result = Graph()
-    for node in g.nodes:
-        if text.strip().lower() in str(node.id).strip().lower():
-            result.add_node(node.id, node.attributes)
-            continue
-        for attr, val in node.attributes.items():
-            if text.strip().lower() in str(val).strip().lower():
-                result.add_node(node.id, node.attributes)
-                break
-            elif text.strip().lower() in str(attr).strip().lower():
-                result.add_node(node.id, node.attributes)
-                break
-
-    for link in g.links:
-        result.add_link(link.id, link.source, link.target)
-    
-    return result
+    return g.subgraph(match_search(g, text))
 
-def filter(g: Graph, attr: str, op: str, val: str) -> Graph:
-    if op not in ['==', '<=', '>=', '<', '>', '!=']:
+def filter(g: Graph, attr: str, op: str, val: str, vectorized: bool | None = None) -> Graph:
+    if op not in OPERATORS:
         return g
     if attr is None or attr == "" or val is None or val == "":
         return g
-    result = Graph([], [])
-    for node in g.nodes:
-        if attr.strip().lower() not in node.attributes:
-            continue
-
-        attr_val = node.attributes[attr]
-        value = val.strip()
-        if not (isinstance(attr_val, float) or isinstance(attr_val, int)):
-            attr_val = f"'{str(node.attributes[attr]).strip().lower()}'"
-            value = f"'{val.lower()}'"
-        
-        if eval(f"{str(attr_val)}{op}{value}"):
-            result.add_node(node.id, node.attributes)
-
-    for link in g.links:
-        result.add_link(link.id, link.source, link.target)
-    
-    return result
\ No newline at end of file
+    return g.subgraph(match_filter(g, attr, op, val, vectorized))
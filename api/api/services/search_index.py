@@ -0,0 +1,112 @@
+import re
+
+from api.models.graph import Graph
+from api.services.utils import normalize_text
+
+NGRAM = 3
+TOKEN_RE = re.compile(r"\w+")
+
+
+class SearchIndex:
+    """Inverted index over the lowercased id, attribute keys and attribute values of each node.
+
+    Substring queries are answered from a trigram index and verified against the
+    indexed text; whole-word queries use a token index. The postings are built on
+    the second query, so a graph that is searched only once costs a single scan.
+    """
+
+    def __init__(self, graph: Graph):
+        self.nodes = list(graph.nodes)
+        self._texts: list[tuple[str, ...]] = []
+        self._queries = 0
+        self._grams: dict[str, list[int]] | None = None
+        self._short: dict[str, list[int]] = {}
+        self._tokens: dict[str, list[int]] = {}
+
+        for node in self.nodes:
+            fields = [normalize_text(node.id)]
+            for key, val in (node.attributes or {}).items():
+                fields.append(normalize_text(key))
+                fields.append(normalize_text(val))
+            self._texts.append(tuple(fields))
+
+    def _build_postings(self):
+        grams_index: dict[str, list[int]] = {}
+        for pos, fields in enumerate(self._texts):
+            grams = set()
+            tokens = set()
+            for field in fields:
+                tokens.update(TOKEN_RE.findall(field))
+                if len(field) < NGRAM:
+                    self._short.setdefault(field, []).append(pos)
+                else:
+                    grams.update(field[i:i + NGRAM] for i in range(len(field) - NGRAM + 1))
+            for gram in grams:
+                bucket = grams_index.get(gram)
+                if bucket is None:
+                    grams_index[gram] = [pos]
+                else:
+                    bucket.append(pos)
+            for token in tokens:
+                self._tokens.setdefault(token, []).append(pos)
+        self._grams = grams_index
+
+    def _ensure_postings(self) -> bool:
+        if self._grams is None:
+            self._queries += 1
+            if self._queries < 2:
+                return False
+            self._build_postings()
+        return True
+
+    def substring(self, text: str) -> list[int]:
+        """Positions of nodes with a field containing text, in graph order."""
+        if text == "":
+            return list(range(len(self.nodes)))
+        if not self._ensure_postings():
+            return [pos for pos, fields in enumerate(self._texts) if any(text in field for field in fields)]
+
+        if len(text) < NGRAM:
+            matches: set[int] = set()
+            for key, bucket in self._grams.items():
+                if text in key:
+                    matches.update(bucket)
+            for key, bucket in self._short.items():
+                if text in key:
+                    matches.update(bucket)
+            return sorted(matches)
+
+        grams = {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+        postings = []
+        for gram in grams:
+            bucket = self._grams.get(gram)
+            if bucket is None:
+                return []
+            postings.append(bucket)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for bucket in postings[1:]:
+            if len(candidates) < 64:
+                break
+            candidates.intersection_update(bucket)
+
+        return sorted(pos for pos in candidates if any(text in field for field in self._texts[pos]))
+
+    def token(self, text: str) -> list[int]:
+        """Positions of nodes whose fields contain every word of text as a whole token, in graph order."""
+        words = TOKEN_RE.findall(text.strip().lower())
+        if not words:
+            return []
+        if not self._ensure_postings():
+            wanted = set(words)
+            return [pos for pos, fields in enumerate(self._texts)
+                    if wanted <= {token for field in fields for token in TOKEN_RE.findall(field)}]
+        matches = set(self._tokens.get(words[0], ()))
+        for word in words[1:]:
+            matches.intersection_update(self._tokens.get(word, ()))
+        return sorted(matches)
+
+
+def get_search_index(g: Graph) -> SearchIndex:
+    return g.get_index("search", SearchIndex)
@@ -0,0 +1,102 @@
+"""Data sources given as a file path, a URL or an open binary stream (e.g. an upload)."""
+import io
+import os
+import urllib.parse
+import urllib.request
+from typing import Any, BinaryIO, TextIO
+
+from api.services.progress import ProgressReporter
+
+STREAM_BUFFER_SIZE = 1 << 20
+
+
+def is_stream(source: Any) -> bool:
+    return hasattr(source, 'read')
+
+
+def is_url(source: Any) -> bool:
+    return isinstance(source, str) and source.startswith(('http://', 'https://'))
+
+
+def source_name(source: Any) -> str:
+    """Name that identifies the source's format by its extension: the path, the URL path, or a stream's name."""
+    if is_stream(source):
+        name = getattr(source, 'name', '')
+        return name if isinstance(name, str) else ''
+    if is_url(source):
+        return urllib.parse.urlparse(source).path
+    return source
+
+
+def is_seekable(stream: Any) -> bool:
+    seekable = getattr(stream, 'seekable', None)
+    try:
+        return bool(seekable and seekable())
+    except (OSError, ValueError):
+        return False
+
+
+class NamedStream:
+    """A readable stream together with the file name its format is recognised by, e.g. a request body."""
+
+    def __init__(self, stream: Any, name: str):
+        self.stream = stream
+        self.name = name
+
+    def read(self, size: int = -1) -> bytes:
+        return self.stream.read(size)
+
+
+class _Reader(io.RawIOBase):
+    """Adapts any object with read() to the io stack, optionally counting the bytes read.
+
+    Closing it leaves the object open unless owned is set.
+    """
+
+    def __init__(self, stream: Any, progress: ProgressReporter | None = None, owned: bool = False):
+        self._stream = stream
+        self._progress = progress
+        self._owned = owned
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        if self._progress is not None:
+            self._progress.read(len(data))
+        return len(data)
+
+    def close(self):
+        if self._owned and not self.closed:
+            self._stream.close()
+        super().close()
+
+
+def open_binary(source: Any, description: str = "Source", progress: ProgressReporter | None = None) -> BinaryIO:
+    """Open a path or URL for reading bytes, reporting them to progress if given.
+
+    A stream is wrapped rather than reopened; closing the result does not
+    close it, so the caller that passed it in stays its owner.
+    """
+    if is_stream(source):
+        return io.BufferedReader(_Reader(source, progress), STREAM_BUFFER_SIZE)
+    if is_url(source):
+        response = urllib.request.urlopen(source)
+    else:
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"{description} file not found: {source}")
+        response = open(source, 'rb')
+    if progress is None:
+        return response
+    return io.BufferedReader(_Reader(response, progress, owned=True), STREAM_BUFFER_SIZE)
+
+
+def open_text(source: Any, description: str = "Source", progress: ProgressReporter | None = None) -> TextIO:
+    """Like open_binary, decoding UTF-8."""
+    if isinstance(source, str) and not is_url(source) and progress is None:
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"{description} file not found: {source}")
+        return open(source, 'r', encoding='utf-8')
+    return io.TextIOWrapper(open_binary(source, description, progress), encoding='utf-8')
@@ -0,0 +1,90 @@
+"""Spatial index over laid-out nodes, answering which nodes a viewport shows at a zoom level."""
+
+# Points a leaf holds before it is split into quadrants
+LEAF_SIZE = 16
+# Bounds the depth where many points share one position
+MAX_DEPTH = 24
+# Cells smaller than this on screen show only their representative node
+MIN_CELL_PIXELS = 16.0
+
+
+class _Cell:
+    __slots__ = ("x", "y", "size", "children", "points", "top")
+
+    def __init__(self, x: float, y: float, size: float):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.children: list | None = None
+        self.points: list | None = None
+        # (weight, x, y, id) of the heaviest point inside
+        self.top: tuple | None = None
+
+
+class QuadTree:
+    """Quadtree over node positions {node id: (x, y)}.
+
+    Each cell keeps its heaviest point as representative, weights being
+    e.g. node degrees, so that a zoomed-out view can show one node per small
+    cell instead of all of them. Ties keep the point met first.
+    """
+
+    def __init__(self, positions: dict, weights: dict | None = None):
+        weights = weights or {}
+        points = [(weights.get(node_id, 0), x, y, node_id) for node_id, (x, y) in positions.items()]
+        if points:
+            x0 = min(p[1] for p in points)
+            y0 = min(p[2] for p in points)
+            size = max(max(p[1] for p in points) - x0, max(p[2] for p in points) - y0) or 1.0
+        else:
+            x0 = y0 = 0.0
+            size = 1.0
+        # Slightly larger than the points' extent, so the largest coordinates fall inside
+        self.root = _Cell(x0, y0, size * (1 + 1e-9))
+        self.size = len(points)
+
+        stack = [(self.root, points, 0)]
+        while stack:
+            cell, cell_points, depth = stack.pop()
+            if cell_points:
+                cell.top = max(cell_points, key=lambda p: p[0])
+            if len(cell_points) <= LEAF_SIZE or depth == MAX_DEPTH:
+                cell.points = cell_points
+                continue
+            half = cell.size / 2
+            mx, my = cell.x + half, cell.y + half
+            quadrants = ([], [], [], [])
+            for p in cell_points:
+                quadrants[(p[1] >= mx) + 2 * (p[2] >= my)].append(p)
+            cell.children = []
+            for i, quadrant in enumerate(quadrants):
+                if quadrant:
+                    child = _Cell(mx if i & 1 else cell.x, my if i & 2 else cell.y, half)
+                    cell.children.append(child)
+                    stack.append((child, quadrant, depth + 1))
+
+    def query(self, x0: float, y0: float, x1: float, y1: float, zoom: float | None = None) -> list:
+        """Ids of the nodes inside the box, heaviest first.
+
+        zoom is screen pixels per layout unit; cells smaller than
+        MIN_CELL_PIXELS on screen contribute only their representative, if it
+        is inside the box. Without zoom every node inside is returned.
+        """
+        min_size = MIN_CELL_PIXELS / zoom if zoom else 0.0
+        found = []
+        stack = [self.root]
+        while stack:
+            cell = stack.pop()
+            if (cell.top is None or cell.x > x1 or cell.y > y1
+                    or cell.x + cell.size < x0 or cell.y + cell.size < y0):
+                continue
+            if cell.size < min_size:
+                points = (cell.top,)
+            elif cell.children is not None:
+                stack.extend(cell.children)
+                continue
+            else:
+                points = cell.points
+            found.extend(p for p in points if x0 <= p[1] <= x1 and y0 <= p[2] <= y1)
+        found.sort(key=lambda p: -p[0])
+        return [p[3] for p in found]
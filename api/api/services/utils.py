@@ -1,6 +1,17 @@
+import io
 import json
 from datetime import date, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; encode_graph falls back to the json module
+    orjson = None
+
+if TYPE_CHECKING:
+    from api.models.graph import Graph
+
+HAS_ORJSON = orjson is not None
 
 class DateTimeEncoder(json.JSONEncoder):
     """JSON encoder that parses datetime or date objects into a ISO string."""
@@ -17,4 +28,85 @@ def sanitize_dates(obj: Any) -> Any:
         return {k: sanitize_dates(v) for k, v in obj.items()}
     if isinstance(obj, (list, tuple, set)):
         return [sanitize_dates(v) for v in obj]
-    return obj    
\ No newline at end of file
+    return obj
+
+def _json_default(obj: Any) -> Any:
+    """Converts what sanitize_dates converts, for encoders that call back on unknown types."""
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_ENCODER = json.JSONEncoder(default=_json_default, separators=(',', ':'))
+
+# Nodes or links encoded at a time; only one batch of their dicts exists at once
+ENCODE_BATCH = 10_000
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_json_default)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return _ENCODER.encode(obj).encode('utf-8')
+
+
+def _encode_graph(graph: 'Graph', dumps, positions: dict | None) -> bytes:
+    """Encode the graph one batch of nodes or links at a time into a single buffer."""
+    buffer = io.BytesIO()
+    nodes, links = graph.nodes, graph.links
+
+    buffer.write(b'{"nodes":[')
+    for start in range(0, len(nodes), ENCODE_BATCH):
+        # Attribute dicts are shared, not copied
+        if positions is None:
+            batch = dumps([{"id": n.id, "attributes": n.attributes} for n in nodes[start:start + ENCODE_BATCH]])
+        else:
+            batch = dumps([{"id": n.id, "attributes": n.attributes, "x": xy[0], "y": xy[1]}
+                           for n in nodes[start:start + ENCODE_BATCH] for xy in (positions[n.id],)])
+        if start:
+            buffer.write(b',')
+        buffer.write(memoryview(batch)[1:-1])
+
+    buffer.write(b'],"links":[')
+    for start in range(0, len(links), ENCODE_BATCH):
+        batch = dumps([{"id": e.id, "source": e.source, "target": e.target}
+                       for e in links[start:start + ENCODE_BATCH]])
+        if start:
+            buffer.write(b',')
+        buffer.write(memoryview(batch)[1:-1])
+
+    buffer.write(b']}')
+    return buffer.getvalue()
+
+
+def encode_graph(graph: 'Graph', positions: dict | None = None) -> bytes:
+    """UTF-8 JSON of graph.to_dict(), written in one pass without copying the attributes.
+
+    positions, {node id: (x, y)} for every node, adds x and y to the nodes.
+
+    Dates are written in ISO format as they are met rather than by a
+    sanitize_dates copy first. orjson is used when it is installed; values
+    it does not take (integers beyond 64 bits, non-string keys) make it fall
+    back to the json module, and it writes NaN and infinities as null.
+    """
+    if orjson is not None:
+        try:
+            return _encode_graph(graph, _orjson_dumps, positions)
+        except TypeError:
+            pass
+    return _encode_graph(graph, _json_dumps, positions)
+
+
+def encode_graph_text(graph: 'Graph', positions: dict | None = None) -> str:
+    """encode_graph as a string, for embedding into scripts."""
+    return encode_graph(graph, positions).decode('utf-8')
+
+
+def normalize_text(value: Any) -> str:
+    """Lowercased, stripped text form of a value, with dates in ISO format, as search and filter compare it."""
+    if isinstance(value, str):
+        return value.strip().lower()
+    return str(sanitize_dates(value)).strip().lower()
@@ -0,0 +1,94 @@
+from datetime import date, datetime
+
+from api.models.graph import Graph
+from api.services.predicate import MISSING, Predicate, lookup
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; filter() falls back to the scalar path
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Graphs with at least this many nodes use the vectorized path by default
+VECTORIZE_MIN_NODES = 10_000
+
+# Integers beyond this cannot be compared exactly as float64
+MAX_EXACT_INT = 2 ** 53
+
+
+class VectorColumn:
+    """One attribute as a NumPy array over all nodes, with a mask of the nodes that have it.
+
+    Only columns whose values are all numbers or all plain dates are vectorized;
+    for any other mix `kind` is None and callers fall back to the scalar path.
+    """
+
+    def __init__(self, graph: Graph, keys: tuple[str, ...]):
+        self.nodes = list(graph.nodes)
+        self.keys = keys
+        self.kind: str | None = "empty"
+
+        positions, values = [], []
+        for pos, node in enumerate(self.nodes):
+            value = lookup(node.attributes, keys)
+            if value is MISSING:
+                continue
+            kind = self._kind(value)
+            if kind is None or self.kind not in ("empty", kind):
+                self.kind = None
+                return
+            self.kind = kind
+            positions.append(pos)
+            values.append(value)
+
+        self.present = np.zeros(len(self.nodes), dtype=bool)
+        self.present[positions] = True
+        if self.kind == "date":
+            self.values = np.full(len(self.nodes), np.datetime64("NaT"), dtype="datetime64[D]")
+            self.values[positions] = np.array(values, dtype="datetime64[D]")
+        else:
+            self.values = np.zeros(len(self.nodes), dtype=np.float64)
+            self.values[positions] = values
+
+    @staticmethod
+    def _kind(value) -> str | None:
+        if isinstance(value, (int, float)):
+            if isinstance(value, int) and abs(value) > MAX_EXACT_INT:
+                return None
+            return "number"
+        if isinstance(value, date) and not isinstance(value, datetime):
+            return "date"
+        return None
+
+    def select(self, predicate: Predicate) -> list[int] | None:
+        """Positions of the nodes matching predicate in graph order, or None if it cannot be vectorized."""
+        if self.kind is None:
+            return None
+        if self.kind == "empty":
+            return []
+
+        if self.kind == "number":
+            predicate.check_number()
+            if isinstance(predicate.number, int) and abs(predicate.number) > MAX_EXACT_INT:
+                return None
+            operand = float(predicate.number)
+        else:
+            if predicate.datetime is None:
+                # Dates compared with non-date text use the text comparison
+                return None
+            operand = np.datetime64(predicate.datetime.date(), "D")
+
+        mask = self.present & predicate.compare(self.values, operand)
+        return np.flatnonzero(mask).tolist()
+
+
+def vector_select(g: Graph, predicate: Predicate) -> tuple[list, list[int]] | None:
+    """Match predicate with NumPy; returns (nodes, positions) or None when the column is not vectorizable."""
+    if not HAS_NUMPY:
+        return None
+    column = g.get_index(("vector",) + predicate.keys, lambda graph: VectorColumn(graph, predicate.keys))
+    positions = column.select(predicate)
+    if positions is None:
+        return None
+    return column.nodes, positions
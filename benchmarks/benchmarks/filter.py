@@ -0,0 +1,90 @@
+"""Compare filter() against the previous eval()-based implementation.
+
+Usage:
+    graph-benchmark-filter [--count N] [--repeat R]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from api.models.graph import Graph
+from api.services.search_filter import filter
+
+
+def eval_filter(g: Graph, attr: str, op: str, val: str) -> Graph:
+    """The filter() implementation that built and eval()ed a source string per node."""
+    result = Graph([], [])
+    for node in g.nodes:
+        if attr.strip().lower() not in node.attributes:
+            continue
+
+        attr_val = node.attributes[attr]
+        value = val.strip()
+        if not (isinstance(attr_val, float) or isinstance(attr_val, int)):
+            attr_val = f"'{str(node.attributes[attr]).strip().lower()}'"
+            value = f"'{val.lower()}'"
+
+        if eval(f"{str(attr_val)}{op}{value}"):
+            result.add_node(node.id, node.attributes)
+
+    for link in g.links:
+        result.add_link(link.id, link.source, link.target)
+
+    return result
+
+
+def make_graph(count: int, seed: int = 0) -> Graph:
+    rnd = random.Random(seed)
+    cities = ["novi sad", "beograd", "nis", "subotica", "kragujevac"]
+    start = date(1950, 1, 1)
+    g = Graph()
+    for i in range(count):
+        g.add_node(str(i), {
+            "age": rnd.randint(0, 99),
+            "height": round(rnd.uniform(140, 210), 1),
+            "city": rnd.choice(cities),
+            "born": start + timedelta(days=rnd.randint(0, 25000)),
+        })
+    for i in range(1, count):
+        g.add_link(str(i), str(rnd.randrange(i)), str(i))
+    return g
+
+
+CASES = [
+    ("age", ">=", "30"),
+    ("height", "<", "170.5"),
+    ("city", "==", "nis"),
+    ("born", ">", "1990-01-01"),
+]
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    g = make_graph(args.count)
+    print(f"{'filter':<22}{'eval (s)':>12}{'compiled (s)':>14}{'speedup':>10}")
+    for attr, op, val in CASES:
+        expected = [n.id for n in eval_filter(g, attr, op, val).nodes]
+        actual = [n.id for n in filter(g, attr, op, val).nodes]
+        assert expected == actual, f"results differ for {attr} {op} {val}"
+
+        before = _time(lambda: eval_filter(g, attr, op, val), args.repeat)
+        after = _time(lambda: filter(g, attr, op, val), args.repeat)
+        print(f"{f'{attr} {op} {val}':<22}{before:>12.3f}{after:>14.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Synthetic graph generators writing the formats read by the bundled data source plugins."""
+import json
+import os
+import random
+from datetime import date, timedelta
+from xml.sax.saxutils import quoteattr
+
+SHAPES = ("random", "balanced", "powerlaw")
+WORDS = ["alpha", "beta", "gamma", "delta", "omega", "node", "graph", "river", "stone", "cloud"]
+
+
+class SyntheticGraph:
+    """A random tree plus extra cross references, with generated attributes.
+
+    shape controls the degree distribution of the tree:
+    - random: each node's parent is uniform over earlier nodes,
+    - balanced: every node has `branching` children,
+    - powerlaw: preferential attachment, so a few hubs get most children.
+    """
+
+    def __init__(self, size: int, shape: str = "random", branching: int = 4, refs: float = 0.2,
+                 numeric: int = 2, text: int = 2, dates: int = 1, seed: int = 0):
+        if shape not in SHAPES:
+            raise ValueError(f"Unknown shape: {shape}")
+        rnd = random.Random(seed)
+        self.size = size
+        self.parents: list[int | None] = [None]
+        endpoints = [0]
+        for i in range(1, size):
+            if shape == "balanced":
+                parent = (i - 1) // branching
+            elif shape == "powerlaw":
+                parent = rnd.choice(endpoints)
+            else:
+                parent = rnd.randrange(i)
+            self.parents.append(parent)
+            endpoints += (parent, i)
+
+        self.refs: list[list[int]] = [[] for _ in range(size)]
+        for _ in range(int(size * refs)):
+            self.refs[rnd.randrange(size)].append(rnd.randrange(size))
+
+        start = date(1950, 1, 1)
+        self.attributes: list[dict] = []
+        for i in range(size):
+            attrs = {}
+            for k in range(numeric):
+                attrs[f"num{k}"] = rnd.randrange(1000) if k % 2 == 0 else round(rnd.uniform(0, 1000), 2)
+            for k in range(text):
+                attrs[f"text{k}"] = f"{rnd.choice(WORDS)} {rnd.choice(WORDS)} {i}"
+            for k in range(dates):
+                attrs[f"date{k}"] = (start + timedelta(days=rnd.randrange(25000))).isoformat()
+            self.attributes.append(attrs)
+
+        self.children: list[list[int]] = [[] for _ in range(size)]
+        for i, parent in enumerate(self.parents):
+            if parent is not None:
+                self.children[parent].append(i)
+
+    def depth(self) -> int:
+        depths = [0] * self.size
+        for i in range(1, self.size):
+            depths[i] = depths[self.parents[i]] + 1
+        return max(depths)
+
+    def write_json(self, path: str):
+        """Hierarchical JSON as read by JsonDataSourcePlugin (@id / children / parent)."""
+        def build(i: int) -> dict:
+            item = {"@id": f"n{i}", **self.attributes[i]}
+            if self.refs[i]:
+                item["parent"] = f"n{self.refs[i][0]}"
+            if self.children[i]:
+                item["children"] = [build(c) for c in self.children[i]]
+            return item
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(build(0), f)
+
+    def write_xml(self, path: str):
+        """Nested XML elements with id and space separated ref attributes."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            # Explicit stack so deep trees do not hit the recursion limit
+            stack: list[tuple[int, bool]] = [(0, False)]
+            while stack:
+                i, closing = stack.pop()
+                if closing:
+                    f.write("</node>\n")
+                    continue
+                attrs = " ".join(f"{k}={quoteattr(str(v))}" for k, v in self.attributes[i].items())
+                refs = " ".join(f"n{r}" for r in self.refs[i])
+                ref_attr = f" ref={quoteattr(refs)}" if refs else ""
+                f.write(f'<node id="n{i}" {attrs}{ref_attr}>\n')
+                stack.append((i, True))
+                stack.extend((c, False) for c in reversed(self.children[i]))
+
+    def write_turtle(self, path: str):
+        """Turtle with typed literals, a parent link per node and cross references."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("@prefix ex: <http://example.org/> .\n")
+            f.write("@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .\n\n")
+            for i in range(self.size):
+                parts = ["a ex:Item"]
+                for k, v in self.attributes[i].items():
+                    if k.startswith("date"):
+                        parts.append(f'ex:{k} "{v}"^^xsd:date')
+                    elif isinstance(v, int):
+                        parts.append(f'ex:{k} "{v}"^^xsd:integer')
+                    elif isinstance(v, float):
+                        parts.append(f'ex:{k} "{v}"^^xsd:decimal')
+                    else:
+                        parts.append(f"ex:{k} {json.dumps(v)}")
+                if self.parents[i] is not None:
+                    parts.append(f"ex:parent ex:n{self.parents[i]}")
+                for r in self.refs[i]:
+                    parts.append(f"ex:ref ex:n{r}")
+                f.write(f"ex:n{i} " + " ;\n    ".join(parts) + " .\n")
+
+    def write_ntriples(self, path: str):
+        """The same triples as write_turtle, one full-IRI statement per line."""
+        ex = "http://example.org/"
+        xsd = "http://www.w3.org/2001/XMLSchema#"
+        rdf_type = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(self.size):
+                subject = f"<{ex}n{i}>"
+                f.write(f"{subject} <{rdf_type}> <{ex}Item> .\n")
+                for k, v in self.attributes[i].items():
+                    if k.startswith("date"):
+                        literal = f'"{v}"^^<{xsd}date>'
+                    elif isinstance(v, int):
+                        literal = f'"{v}"^^<{xsd}integer>'
+                    elif isinstance(v, float):
+                        literal = f'"{v}"^^<{xsd}decimal>'
+                    else:
+                        literal = json.dumps(v)
+                    f.write(f"{subject} <{ex}{k}> {literal} .\n")
+                if self.parents[i] is not None:
+                    f.write(f"{subject} <{ex}parent> <{ex}n{self.parents[i]}> .\n")
+                for r in self.refs[i]:
+                    f.write(f"{subject} <{ex}ref> <{ex}n{r}> .\n")
+
+    def write_all(self, directory: str) -> dict[str, str]:
+        """Write every format into directory and return their paths keyed by format."""
+        paths = {
+            "json": os.path.join(directory, "graph.json"),
+            "xml": os.path.join(directory, "graph.xml"),
+            "ttl": os.path.join(directory, "graph.ttl"),
+            "nt": os.path.join(directory, "graph.nt"),
+        }
+        self.write_json(paths["json"])
+        self.write_xml(paths["xml"])
+        self.write_turtle(paths["ttl"])
+        self.write_ntriples(paths["nt"])
+        return paths
@@ -0,0 +1,76 @@
+"""Time parallel ingestion of one large file and of many small files with growing worker counts.
+
+Usage:
+    graph-benchmark-ingestion [--size N] [--files F] [--workers 1 2 4 8]
+
+Both the N-Triples and the JSON Lines loaders are measured; every run is
+checked against the single process load for the same nodes and links.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from core.use_cases import ingestion
+from core.use_cases.ingestion import IngestionService
+from json_data_source import JsonDataSourcePlugin
+from rdf_data_source import RdfDataSourcePlugin
+
+from benchmarks.generators import SyntheticGraph
+
+
+def write_json_lines(synthetic: SyntheticGraph, path: str, nodes: range):
+    """One node per line; the tree is kept through parent references."""
+    with open(path, "w", encoding="utf-8") as f:
+        for i in nodes:
+            item = {"@id": f"n{i}", **synthetic.attributes[i]}
+            if synthetic.parents[i] is not None:
+                item["parent"] = f"n{synthetic.parents[i]}"
+            f.write(json.dumps(item) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000, help="number of nodes")
+    parser.add_argument("--files", type=int, default=20, help="number of files in the many-files case")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    synthetic = SyntheticGraph(args.size, refs=0.2, seed=args.seed)
+    # Split even the moderate files the benchmark writes
+    ingestion.MIN_PART_BYTES = 1 << 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        nt = os.path.join(tmp, "graph.nt")
+        synthetic.write_ntriples(nt)
+        jsonl = os.path.join(tmp, "graph.jsonl")
+        write_json_lines(synthetic, jsonl, range(args.size))
+        step = -(-args.size // args.files)
+        shards = []
+        for k in range(args.files):
+            shards.append(os.path.join(tmp, f"shard{k}.jsonl"))
+            write_json_lines(synthetic, shards[-1], range(k * step, min(args.size, (k + 1) * step)))
+
+        cases = [("one .nt file", RdfDataSourcePlugin(), [nt]),
+                 ("one .jsonl file", JsonDataSourcePlugin(), [jsonl]),
+                 (f"{args.files} .jsonl files", JsonDataSourcePlugin(), shards)]
+
+        print(f"{'input':<20}{'workers':>8}{'seconds':>10}{'speedup':>9}{'nodes':>10}{'links':>10}")
+        for label, plugin, paths in cases:
+            baseline = None
+            expected = None
+            for workers in sorted(set(args.workers)):
+                start = time.perf_counter()
+                g = IngestionService(plugin, workers=workers).load(paths)
+                seconds = time.perf_counter() - start
+                counts = (len(g.nodes), len(g.links))
+                if expected is None:
+                    baseline, expected = seconds, counts
+                assert counts == expected, f"{workers} workers loaded {counts}, expected {expected}"
+                print(f"{label:<20}{workers:>8}{seconds:>10.2f}{baseline / seconds:>8.1f}x{counts[0]:>10}{counts[1]:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure the memory cost of Node and Link objects.
+
+Compares the slotted api.models classes against plain __dict__-backed
+classes with the same fields (the layout used before __slots__ was added).
+
+Usage:
+    graph-benchmark-memory [--count N]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from api.models.link import Link
+from api.models.node import Node
+
+
+class DictNode(object):
+    def __init__(self, id, attributes=None):
+        self.id = id
+        self.attributes = attributes
+
+
+class DictLink(object):
+    def __init__(self, id, source, target):
+        self.id = id
+        self.source = source
+        self.target = target
+
+
+def _measure(factory, count: int) -> float:
+    """Return the average number of bytes allocated per object built by factory."""
+    ids = [str(i) for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in ids]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def run(count: int) -> dict:
+    attrs = {"name": "node", "value": 1}
+    return {
+        "node": {
+            "before": _measure(lambda i: DictNode(i, dict(attrs)), count),
+            "after": _measure(lambda i: Node(i, dict(attrs)), count),
+        },
+        "link": {
+            "before": _measure(lambda i: DictLink(i, i, i), count),
+            "after": _measure(lambda i: Link(i, i, i), count),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = run(args.count)
+    print(f"{'object':<8}{'before (B)':>14}{'after (B)':>14}{'saved':>10}")
+    for kind, r in results.items():
+        saved = 1 - r["after"] / r["before"]
+        print(f"{kind:<8}{r['before']:>14.1f}{r['after']:>14.1f}{saved:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
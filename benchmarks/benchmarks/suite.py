@@ -0,0 +1,156 @@
+"""Benchmark loading, search, filter, serialization and visualization on synthetic graphs.
+
+Plugins are discovered through their entry points, as the web app does, so
+whatever is installed gets measured. Results are written as JSON so runs from
+before and after a change can be compared.
+
+Usage:
+    graph-benchmark --size 20000 --output before.json
+    graph-benchmark --size 20000 --compare before.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from api.services.aggregation import aggregate
+from api.services.layout import HAS_NUMPY, force_layout
+from api.services.search_filter import filter, search
+from api.services.utils import encode_graph
+from core.use_cases.const import DATASOURCE_GROUP, VISUALIZER_GROUP
+from core.use_cases.plugin_recognition import PluginService
+
+from benchmarks.generators import SHAPES, SyntheticGraph
+
+LOADERS = {
+    "json_data_source": ("json",),
+    "xml_data_source": ("xml",),
+    "data_source_rdf": ("ttl", "nt"),
+}
+
+
+def measure(fn, repeat: int) -> dict:
+    """Best wall time over repeat runs, and peak traced memory of one extra run."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run(args) -> dict:
+    plugins = PluginService()
+    plugins.load_plugins(DATASOURCE_GROUP)
+    plugins.load_plugins(VISUALIZER_GROUP)
+
+    synthetic = SyntheticGraph(args.size, shape=args.shape, branching=args.branching, refs=args.refs,
+                               numeric=args.numeric, text=args.text, dates=args.dates, seed=args.seed)
+    results: dict[str, dict] = {}
+    graphs = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = synthetic.write_all(directory)
+        for plugin in plugins.plugins[DATASOURCE_GROUP]:
+            for fmt in LOADERS.get(plugin.id(), ()):
+                kwargs = {} if fmt in ("ttl", "nt") else {"max_depth": synthetic.depth() + 1}
+                load = lambda: plugin.load_data(paths[fmt], **kwargs)
+                results[f"load_{fmt}"] = measure(load, args.repeat)
+                graphs[fmt] = load()
+
+        # The binary format has no generator; it is exported from a graph loaded above
+        binary = next((p for p in plugins.plugins[DATASOURCE_GROUP] if p.id() == "binary_data_source"), None)
+        if binary is not None and graphs:
+            paths["gbin"] = os.path.join(directory, "graph.gbin")
+            with open(paths["gbin"], "wb") as f:
+                binary.export_data(graphs.get("json") or next(iter(graphs.values())), f)
+            results["load_gbin"] = measure(lambda: binary.load_data(paths["gbin"]), args.repeat)
+
+    if not graphs:
+        raise SystemExit("No data source plugins installed")
+    g = graphs.get("json") or next(iter(graphs.values()))
+    results["graph"] = {"nodes": len(g.nodes), "links": len(g.links)}
+
+    results["search"] = measure(lambda: search(g, "gamma delta"), args.repeat)
+    if args.numeric:
+        results["filter_numeric"] = measure(lambda: filter(g, "num0", ">=", "500"), args.repeat)
+    if args.text:
+        results["filter_text"] = measure(lambda: filter(g, "text0", "<", "m"), args.repeat)
+    results["to_dict"] = measure(g.to_dict, args.repeat)
+    results["to_json"] = measure(lambda: json.dumps(g.to_dict()), args.repeat)
+    results["encode_graph"] = measure(lambda: encode_graph(g), args.repeat)
+    # The cluster tree is built by the first run and reused, as it is while a graph is explored
+    results["lod_view"] = measure(lambda: aggregate(g), args.repeat)
+    if HAS_NUMPY:
+        results["layout"] = measure(lambda: force_layout(g), args.repeat)
+        positions = force_layout(g)
+        results["layout_warm"] = measure(lambda: force_layout(g, positions), args.repeat)
+
+    for plugin in plugins.plugins[VISUALIZER_GROUP]:
+        results[f"visualize_{plugin.id()}"] = measure(lambda: plugin.visualize(g), args.repeat)
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict):
+    print(f"{'benchmark':<32}{'before (s)':>12}{'after (s)':>12}{'ratio':>8}{'peak MB before':>16}{'after':>8}")
+    for name, after in report["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or "seconds" not in after:
+            continue
+        ratio = after["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        print(f"{name:<32}{before['seconds']:>12.4f}{after['seconds']:>12.4f}{ratio:>7.2f}x"
+              f"{before['peak_bytes'] / 2**20:>16.1f}{after['peak_bytes'] / 2**20:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000, help="number of nodes")
+    parser.add_argument("--shape", choices=SHAPES, default="random", help="degree distribution of the tree")
+    parser.add_argument("--branching", type=int, default=4, help="children per node for the balanced shape")
+    parser.add_argument("--refs", type=float, default=0.2, help="extra cross references per node")
+    parser.add_argument("--numeric", type=int, default=2, help="numeric attributes per node")
+    parser.add_argument("--text", type=int, default=2, help="text attributes per node")
+    parser.add_argument("--dates", type=int, default=1, help="date attributes per node")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (best is kept)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="print a comparison against an earlier JSON report")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    else:
+        json.dump(report["results"], sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare the scalar, sorted-index and NumPy paths of match_filter() across graph sizes.
+
+Times only node selection; building the result graph is the same for every path.
+
+Usage:
+    graph-benchmark-vector-filter [--sizes 100000,1000000,10000000]
+"""
+import argparse
+import random
+import time
+
+from api.models.graph import Graph
+from api.services.search_filter import match_filter
+from api.services.vector_index import HAS_NUMPY
+
+CASES = [
+    ("value", ">=", "0.9"),
+    ("count", "==", "42"),
+]
+
+
+def make_numeric_graph(count: int, seed: int = 0) -> Graph:
+    rnd = random.Random(seed)
+    g = Graph()
+    for i in range(count):
+        g.add_node(i, {"value": rnd.random(), "count": rnd.randrange(1000)})
+    return g
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000",
+                        help="comma separated node counts (10^7 needs several GB of RAM)")
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        parser.error("numpy is not installed (pip install -e ./api[vectorized])")
+
+    print(f"{'nodes':>10}  {'filter':<14}{'scan':>9}{'index':>9}{'numpy 1st':>11}{'numpy':>9}  (seconds)")
+    for size in (int(s) for s in args.sizes.split(",")):
+        g = make_numeric_graph(size)
+        for attr, op, val in CASES:
+            scan = _time(lambda: match_filter(g, attr, op, val, vectorized=False))
+            # the sorted index is built on the second query of an attribute
+            match_filter(g, attr, op, val, vectorized=False)
+            index = _time(lambda: match_filter(g, attr, op, val, vectorized=False))
+            first = _time(lambda: match_filter(g, attr, op, val, vectorized=True))
+            vector = _time(lambda: match_filter(g, attr, op, val, vectorized=True))
+            print(f"{size:>10}  {f'{attr} {op} {val}':<14}{scan:>9.3f}{index:>9.3f}{first:>11.3f}{vector:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
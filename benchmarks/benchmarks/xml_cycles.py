@@ -0,0 +1,99 @@
+"""Time allow_cycles=False XML imports and compare the cycle check with the previous DFS.
+
+Usage:
+    graph-benchmark-xml-cycles [--size N] [--refs R] [--legacy-edges E]
+
+The default document has about 100k edges: a 40k node tree plus 1.5 references per node.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from xml_data_source import TopologicalOrder, XmlDataSourcePlugin
+
+from benchmarks.generators import SyntheticGraph
+
+
+def has_path(adjacency: dict, start: str, target: str, visited: set | None = None) -> bool:
+    """The recursive DFS that _add_edge ran for every edge before the incremental order."""
+    if visited is None:
+        visited = set()
+
+    if start == target:
+        return True
+
+    visited.add(start)
+
+    for nb in adjacency.get(start, ()):
+        if nb in visited:
+            continue
+        if nb == target:
+            return True
+        if has_path(adjacency, nb, target, visited):
+            return True
+
+    return False
+
+
+def legacy_accept(edges: list[tuple[str, str]]) -> list[bool]:
+    adjacency: dict[str, set] = {}
+    accepted = []
+    for src, dst in edges:
+        ok = not has_path(adjacency, dst, src)
+        if ok:
+            adjacency.setdefault(src, set()).add(dst)
+        accepted.append(ok)
+    return accepted
+
+
+def incremental_accept(edges: list[tuple[str, str]]) -> list[bool]:
+    order = TopologicalOrder()
+    return [order.add_edge(src, dst) for src, dst in edges]
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=40_000, help="number of elements")
+    parser.add_argument("--refs", type=float, default=1.5, help="references per element")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--legacy-edges", type=int,
+                        help="replay only the first E edges through both checks (the previous one is quadratic)")
+    args = parser.parse_args()
+
+    synthetic = SyntheticGraph(args.size, refs=args.refs, numeric=0, text=0, dates=0, seed=args.seed)
+    plugin = XmlDataSourcePlugin()
+    max_depth = synthetic.depth() + 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.xml")
+        synthetic.write_xml(path)
+
+        print(f"{'load':<32}{'seconds':>10}{'links':>10}")
+        for label, kwargs in [("allow_cycles=True", {}),
+                              ("allow_cycles=False", {"allow_cycles": False}),
+                              ("allow_cycles=False, undirected", {"allow_cycles": False, "directed": False})]:
+            seconds, g = _time(lambda: plugin.load_data(path, max_depth=max_depth, **kwargs))
+            print(f"{label:<32}{seconds:>10.3f}{len(g.links):>10}")
+            if not kwargs:
+                edges = [(l.source, l.target) for l in g.links]
+
+    sample = edges if args.legacy_edges is None else edges[:args.legacy_edges]
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), len(sample) + 1000))
+    before, expected = _time(lambda: legacy_accept(sample))
+    after, actual = _time(lambda: incremental_accept(sample))
+    assert expected == actual, "incremental order accepts different edges"
+    print(f"\ncycle check on {len(sample)} edges ({sum(actual)} accepted)")
+    print(f"{'dfs per edge (s)':<32}{before:>10.3f}")
+    print(f"{'incremental (s)':<32}{after:>10.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
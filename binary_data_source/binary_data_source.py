@@ -0,0 +1,404 @@
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+import urllib.request
+from array import array
+from datetime import date, datetime
+from itertools import repeat
+from typing import Any, BinaryIO
+
+from api.interfaces.data_source_plugin import DataSourcePlugin
+from api.models.graph import Graph
+from api.models.link import Link
+from api.models.node import Node
+from api.services.sources import is_stream, is_url
+from api.services.utils import DateTimeEncoder
+
+EXTENSION = '.gbin'
+MAGIC = b'GXGRAPH\0'
+VERSION = 1
+# magic, version, reserved, manifest offset, manifest length
+HEADER = struct.Struct('<8sIIQQ')
+INT64 = struct.Struct('<q')
+FLOAT64 = struct.Struct('<d')
+ALIGNMENT = 8
+
+# Value tags, one byte per row of a column
+MISSING, INT, FLOAT, TEXT, DATE, DATETIME, TRUE, FALSE, NONE, JSON = range(10)
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+# Decoded value of a MISSING row
+NO_VALUE = object()
+
+
+def _array_bytes(code: str, values) -> bytes:
+    """Little-endian bytes of an array of fixed-size numbers."""
+    data = array(code, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+class _ColumnWriter:
+    """Encodes one value per row: a tag byte, an 8 byte slot for numbers and dates, UTF-8 text for the rest."""
+
+    def __init__(self):
+        self.tags = bytearray()
+        self.slots = bytearray()
+        self.offsets = [0]
+        self.text = bytearray()
+        self.has_slots = False
+        self.has_text = False
+
+    def append(self, value: Any = None, missing: bool = False):
+        slot = b'\0' * 8
+        encoded = b''
+        if missing:
+            tag = MISSING
+        elif value is None:
+            tag = NONE
+        elif value is True or value is False:
+            tag = TRUE if value else FALSE
+        elif type(value) is int and INT64_MIN <= value <= INT64_MAX:
+            tag, slot = INT, INT64.pack(value)
+        elif type(value) is float:
+            tag, slot = FLOAT, FLOAT64.pack(value)
+        elif isinstance(value, str):
+            tag, encoded = TEXT, value.encode('utf-8')
+        elif isinstance(value, datetime):
+            # ISO text keeps the time zone and microseconds
+            tag, encoded = DATETIME, value.isoformat().encode('utf-8')
+        elif isinstance(value, date):
+            tag, slot = DATE, INT64.pack(value.toordinal())
+        else:
+            tag, encoded = JSON, json.dumps(value, cls=DateTimeEncoder).encode('utf-8')
+
+        self.tags.append(tag)
+        self.slots += slot
+        self.has_slots = self.has_slots or tag in (INT, FLOAT, DATE)
+        self.text += encoded
+        self.offsets.append(len(self.text))
+        # Empty strings encode to nothing but still need the offsets to be read back
+        self.has_text = self.has_text or tag in (TEXT, DATETIME, JSON)
+
+    def sections(self) -> dict:
+        return {
+            'tags': bytes(self.tags),
+            'slots': bytes(self.slots) if self.has_slots else None,
+            'offsets': _array_bytes('Q', self.offsets) if self.has_text else None,
+            'text': bytes(self.text) if self.has_text else None,
+        }
+
+
+class Column:
+    """Read-only view of an encoded column inside the mapped file.
+
+    Nothing is copied when the column is opened; values are decoded when
+    they are indexed, or all at once by values().
+    """
+
+    def __init__(self, views: dict, length: int):
+        self.length = length
+        self.tags: memoryview = views['tags']
+        slots = views.get('slots')
+        self.ints: memoryview | None = slots.cast('q') if slots is not None else None
+        self.floats: memoryview | None = slots.cast('d') if slots is not None else None
+        offsets = views.get('offsets')
+        self.offsets: memoryview | None = offsets.cast('Q') if offsets is not None else None
+        self.text: memoryview | None = views.get('text')
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, i: int) -> Any:
+        """Value of row i; rows without a value give NO_VALUE."""
+        return self._decode(self.tags[i], i)
+
+    def _decode(self, tag: int, i: int) -> Any:
+        if tag == INT:
+            return self.ints[i]
+        if tag == FLOAT:
+            return self.floats[i]
+        if tag == DATE:
+            return date.fromordinal(self.ints[i])
+        if tag in (TEXT, DATETIME, JSON):
+            text = str(self.text[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+            if tag == TEXT:
+                return text
+            return datetime.fromisoformat(text) if tag == DATETIME else json.loads(text)
+        if tag == MISSING:
+            return NO_VALUE
+        return {TRUE: True, FALSE: False, NONE: None}[tag]
+
+    def _strings(self) -> list:
+        offsets = self.offsets.tolist()
+        text = str(self.text, 'utf-8')
+        if len(text) == len(self.text):
+            # ASCII only, so byte offsets are character offsets
+            return [text[a:b] for a, b in zip(offsets, offsets[1:])]
+        raw = bytes(self.text)
+        return [raw[a:b].decode('utf-8') for a, b in zip(offsets, offsets[1:])]
+
+    def values(self) -> list:
+        """Decode every row, using bulk conversions when the column holds a single type."""
+        tags = bytes(self.tags)
+        tag = tags[0] if tags else MISSING
+        if tags.count(tag) < self.length:
+            return [self._decode(tag, i) for i, tag in enumerate(tags)]
+        if tag == INT:
+            return self.ints.tolist()
+        if tag == FLOAT:
+            return self.floats.tolist()
+        if tag == DATE:
+            return list(map(date.fromordinal, self.ints.tolist()))
+        if tag == TEXT:
+            return self._strings()
+        if tag == DATETIME:
+            return list(map(datetime.fromisoformat, self._strings()))
+        if tag == JSON:
+            # One decoder call for the whole column
+            return json.loads('[' + ','.join(self._strings()) + ']')
+        return [self._decode(tag, 0)] * self.length
+
+
+class MappedGraph:
+    """A binary graph file opened with mmap.
+
+    Node and link ids, link endpoints (as node row numbers) and attribute
+    columns are exposed as views into the mapping, so opening is instant and
+    processes that open the same file share its pages. to_graph() builds the
+    Graph the rest of the application works with. The typed views assume a
+    little-endian host, as the file is little-endian.
+    """
+
+    def __init__(self, source: str | BinaryIO):
+        self._file = None
+        if is_stream(source):
+            try:
+                # Uploads spooled to disk, and open files, are mapped through their descriptor
+                self._buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError):
+                self._buffer = source.read()
+        elif is_url(source):
+            self._buffer = urllib.request.urlopen(source).read()
+        else:
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"Binary graph file not found: {source}")
+            self._file = open(source, 'rb')
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        self._memory = self._view(memoryview(self._buffer))
+
+        if len(self._buffer) < HEADER.size:
+            self.close()
+            raise ValueError(f"Not a binary graph file: {source}")
+        magic, version, _, manifest_offset, manifest_length = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a binary graph file: {source}")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported binary graph version {version}")
+
+        manifest = json.loads(bytes(self._memory[manifest_offset:manifest_offset + manifest_length]))
+        self.node_count: int = manifest['nodes']
+        self.link_count: int = manifest['links']
+        self.node_ids = self._column(manifest['node_ids'], self.node_count)
+        self.link_ids = self._column(manifest['link_ids'], self.link_count)
+        self.node_has_attributes = self._section(manifest['node_has_attributes'])
+        self.link_has_attributes = self._section(manifest['link_has_attributes'])
+        self.sources = self._view(self._section(manifest['sources']).cast('q'))
+        self.targets = self._view(self._section(manifest['targets']).cast('q'))
+        self.node_columns = {key: self._column(spec, self.node_count) for key, spec in manifest['node_columns']}
+        self.link_columns = {key: self._column(spec, self.link_count) for key, spec in manifest['link_columns']}
+
+    def _view(self, view: memoryview) -> memoryview:
+        # Every view must be released before the mapping can be closed
+        self._views.append(view)
+        return view
+
+    def _section(self, spec: list | None) -> memoryview | None:
+        if spec is None:
+            return None
+        offset, length = spec
+        return self._view(self._memory[offset:offset + length])
+
+    def _column(self, spec: dict, length: int) -> Column:
+        column = Column({name: self._section(section) for name, section in spec.items()}, length)
+        for view in (column.ints, column.floats, column.offsets):
+            if view is not None:
+                self._view(view)
+        return column
+
+    @staticmethod
+    def _attributes(columns: dict, has_attributes: memoryview) -> list:
+        keys = list(columns)
+        values = [column.values() for column in columns.values()]
+        sparse = any(NO_VALUE in column for column in values)
+        attributes = []
+        for flag, row in zip(bytes(has_attributes), zip(*values) if values else repeat(())):
+            if not flag:
+                attributes.append(None)
+            elif sparse:
+                attributes.append({k: v for k, v in zip(keys, row) if v is not NO_VALUE})
+            else:
+                attributes.append(dict(zip(keys, row)))
+        return attributes
+
+    def to_graph(self) -> Graph:
+        # Building allocates millions of objects none of which can be garbage yet
+        gc.disable()
+        try:
+            node_ids = self.node_ids.values()
+            node_attributes = self._attributes(self.node_columns, self.node_has_attributes)
+            link_attributes = self._attributes(self.link_columns, self.link_has_attributes)
+            sources = [node_ids[i] for i in self.sources.tolist()]
+            targets = [node_ids[i] for i in self.targets.tolist()]
+
+            return Graph(list(map(Node, node_ids, node_attributes)),
+                         list(map(Link, self.link_ids.values(), sources, targets, link_attributes)))
+        finally:
+            gc.enable()
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> 'MappedGraph':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_graph(graph: Graph, target: BinaryIO):
+    """Write graph in the binary format to a binary file object.
+
+    Links whose endpoints are not nodes of the graph are left out. Lists and
+    dicts are stored as JSON, so tuples come back as lists and dates inside
+    them as ISO strings.
+    """
+    nodes = graph.nodes
+    rows = {}
+    for row, node in enumerate(nodes):
+        rows.setdefault(node.id, row)
+    links = [l for l in graph.links if l.source in rows and l.target in rows]
+
+    def encode_ids(items) -> dict:
+        column = _ColumnWriter()
+        for item in items:
+            column.append(item.id)
+        return column.sections()
+
+    def encode_attributes(items) -> tuple[bytes, list]:
+        keys: dict[str, None] = {}
+        for item in items:
+            if item.attributes:
+                keys.update(dict.fromkeys(item.attributes))
+        columns = []
+        for key in keys:
+            column = _ColumnWriter()
+            for item in items:
+                attributes = item.attributes
+                if attributes is not None and key in attributes:
+                    column.append(attributes[key])
+                else:
+                    column.append(missing=True)
+            columns.append((key, column.sections()))
+        present = bytes(item.attributes is not None for item in items)
+        return present, columns
+
+    node_present, node_columns = encode_attributes(nodes)
+    link_present, link_columns = encode_attributes(links)
+    content = {
+        'node_ids': encode_ids(nodes),
+        'link_ids': encode_ids(links),
+        'node_has_attributes': node_present,
+        'link_has_attributes': link_present,
+        'sources': _array_bytes('q', (rows[l.source] for l in links)),
+        'targets': _array_bytes('q', (rows[l.target] for l in links)),
+        'node_columns': node_columns,
+        'link_columns': link_columns,
+    }
+
+    # Lay the sections out after the header, each aligned for typed access
+    sections: list[bytes] = []
+    position = HEADER.size
+
+    def place(data: bytes | None) -> list | None:
+        nonlocal position
+        if data is None:
+            return None
+        position += -position % ALIGNMENT
+        spec = [position, len(data)]
+        sections.append(data)
+        position += len(data)
+        return spec
+
+    def place_column(column: dict) -> dict:
+        return {name: place(data) for name, data in column.items()}
+
+    manifest = {
+        'nodes': len(nodes),
+        'links': len(links),
+        'node_ids': place_column(content['node_ids']),
+        'link_ids': place_column(content['link_ids']),
+        'node_has_attributes': place(content['node_has_attributes']),
+        'link_has_attributes': place(content['link_has_attributes']),
+        'sources': place(content['sources']),
+        'targets': place(content['targets']),
+        'node_columns': [(key, place_column(column)) for key, column in content['node_columns']],
+        'link_columns': [(key, place_column(column)) for key, column in content['link_columns']],
+    }
+    manifest_bytes = json.dumps(manifest).encode('utf-8')
+
+    target.write(HEADER.pack(MAGIC, VERSION, 0, position, len(manifest_bytes)))
+    written = HEADER.size
+    for data in sections:
+        target.write(b'\0' * (-written % ALIGNMENT))
+        written += -written % ALIGNMENT
+        target.write(data)
+        written += len(data)
+    target.write(manifest_bytes)
+
+
+class BinaryDataSourcePlugin(DataSourcePlugin):
+    """Data source plugin for the memory-mapped binary graph format written by export_data"""
+
+    def name(self) -> str:
+        return "Binary Graph Data Source"
+
+    def id(self) -> str:
+        return "binary_data_source"
+
+    def load_data(self, source: str | BinaryIO, **kwargs) -> Graph:
+        """Load a graph from a binary graph file (.gbin), URL or binary stream
+
+        The file is memory-mapped; see MappedGraph for zero-copy access to
+        its columns without building a Graph.
+        """
+        with MappedGraph(source) as mapped:
+            return mapped.to_graph()
+
+    def export_data(self, graph: Graph, target: BinaryIO):
+        write_graph(graph, target)
+
+    def get_supported_extensions(self) -> list[str]:
+        return [EXTENSION]
+
+    def get_required_parameters(self) -> dict:
+        """Return required parameters for this data source"""
+        return {
+            'source': {
+                'type': 'string',
+                'description': 'Path to a binary graph file or URL',
+                'required': True
+            }
+        }
@@ -1,17 +1,20 @@
-import json
 import os
+
 from api.interfaces.visualizer_plugin import VisualizerPlugin
+from api.services.script_template import ScriptTemplate
+from api.services.utils import encode_graph_text
+
+TEMPLATE = ScriptTemplate(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'visualize.js'))
+
 
 class BlockVisualizerPlugin(VisualizerPlugin):
-    
+    uses_layout = True
+
     def name(self) -> str:
         return "Block Visualizer"
 
     def id(self) -> str:
         return "block_visualizer"
 
-    def visualize(self, graph):
-        here = os.path.dirname(os.path.abspath(__file__))
-        content = open(os.path.join(here, 'static', 'visualize.js')).read()
-        pieces = content.split("GRAPH_JSON")
-        return pieces[0]+json.dumps(graph.to_dict())+pieces[1]
\ No newline at end of file
+    def visualize(self, graph, positions=None):
+        return TEMPLATE.render(encode_graph_text(graph, positions), self.reload_templates)
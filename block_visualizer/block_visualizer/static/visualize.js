@@ -41,8 +41,18 @@ var simulation = d3.forceSimulation()
 
 var graph = GRAPH_JSON  // this will be replaced by the real json object
 
+// Positions laid out on the server, centred on 0, are drawn as they are instead of being simulated
+var preset = graph.nodes.length > 0 && graph.nodes.every(d => d.x !== undefined);
+if (preset) {
+    graph.nodes.forEach(d => { d.x += width/2; d.y += height/2; });
+}
+
 update(graph.links, graph.nodes);
 updateViewport(d3.zoomIdentity);
+if (preset) {
+    simulation.stop();
+    ticked();
+}
 
 
 function updateViewport(transform) {
@@ -98,7 +108,7 @@ function update(links, nodes) {
         .attr("id", d => "mini"+d.id)
 
     node.append("rect")
-        .style("fill", "lightblue")
+        .style("fill", d => isSupernode(d) ? "#fdd0a2" : "lightblue")
         .style("stroke", "black")
         .attr('x', 0)
         .attr('y', -10)
@@ -178,7 +188,11 @@ function update(links, nodes) {
 
 
     node.on("click", function(d) {
-        focusNode(d.id);
+        if (isSupernode(d) && window.expandCluster) {
+            window.expandCluster(d.id);
+        } else {
+            focusNode(d.id);
+        }
     });
 
     mini_node.on("click", function(d) {
@@ -186,6 +200,11 @@ function update(links, nodes) {
     });
 }
 
+// Supernodes stand for a cluster of nodes collapsed on the server; clicking one expands it
+function isSupernode(d) {
+    return !!(d.attributes && d.attributes.supernode);
+}
+
 function ticked() {
     link
         .attr("x1", d => d.source.x)
@@ -205,7 +224,7 @@ function ticked() {
 }
 
 function dragstarted(d) {
-    if (!d3.event.active)
+    if (!preset && !d3.event.active)
         simulation.alphaTarget(0.3).restart()
     d.fx = d.x;
     d.fy = d.y;
@@ -214,6 +233,11 @@ function dragstarted(d) {
 function dragged(d) {
     d.fx = d3.event.x;
     d.fy = d3.event.y;
+    if (preset) {
+        d.x = d.fx;
+        d.y = d.fy;
+        ticked();
+    }
 }
 
 var getAncestorPath = function(nodeId) {
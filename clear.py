@@ -2,10 +2,10 @@ import shutil
 import os
 
 def clear_project_files():
-    """Removes __pycache__, build and egg-info directories, and sqlite Django db files."""
+    """Removes __pycache__, build, egg-info and graph cache directories, and sqlite Django db files."""
     print("Clearing build and cache files...")
 
-    directories_to_remove = ['__pycache__', 'build', 'lib', '.pytest_cache']
+    directories_to_remove = ['__pycache__', 'build', 'lib', '.pytest_cache', 'graph_cache']
 
     for root, dirs, files in os.walk('.', topdown=True):
         dirs.remove(".venv") if ".venv" in dirs else None
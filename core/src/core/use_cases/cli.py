@@ -65,31 +65,42 @@ def handle_create(graph, args):
         graph.add_link(str(edge_id), str(node_ids[0]), str(node_ids[1]))
         return f"Edge {edge_id} created between {node_ids} with {properties}"
 
+def _node_id(graph, text: str):
+    """The id of the node whose id reads as text; data sources may use ids that are not strings."""
+    ids = graph.get_index("cli_node_ids", lambda g: {str(n.id): n.id for n in g.nodes})
+    return ids.get(text, text)
+
+
+def _link_id(graph, text: str):
+    ids = graph.get_index("cli_link_ids", lambda g: {str(l.id): l.id for l in g.links})
+    return ids.get(text, text)
+
+
 def handle_edit(graph, args):
     if args[0] == "node":
         node_id = args[1].split("=")[1]  # --id=2
-        node = next((n for n in graph.nodes if str(n.id) == str(node_id)), None)
+        node = graph.get_node(_node_id(graph, node_id))
         if not node:
             raise ValueError(f"Node {node_id} not found")
         for arg in args[2:]:
             if arg.startswith("--property"):
                 key, val = arg.split("=", 1)[1].split("=")
-                node.attributes[key] = val
+                graph.update_node(node.id, {key: val})
         return f"Node {node_id} updated to {node.attributes}"
 
 
 def handle_delete(graph, args):
     if args[0] == "node":
         node_id = args[1].split("=")[1]
+        key = _node_id(graph, node_id)
         # Ensure no edges use this node
-        for link in graph.links:
-            if str(link.source) == str(node_id) or str(link.target) == str(node_id):
-                raise ValueError(f"Cannot delete node {node_id}, it still has edges")
-        graph.nodes = [n for n in graph.nodes if str(n.id) != str(node_id)]
+        if graph.outgoing_links(key) or graph.incoming_links(key):
+            raise ValueError(f"Cannot delete node {node_id}, it still has edges")
+        graph.remove_node(key)
         return f"Node {node_id} deleted"
     elif args[0] == "edge":
         edge_id = args[1].split("=")[1]
-        graph.links = [e for e in graph.links if str(e.id) != str(edge_id)]
+        graph.remove_link(_link_id(graph, edge_id))
         return f"Edge {edge_id} deleted"
 
 
@@ -0,0 +1,185 @@
+import gc
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from api.models.graph import Graph
+from api.services.sources import is_seekable, is_stream, is_url, source_name
+
+# Part of every key, so snapshots written in an older layout are never read
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".graph"
+DEFAULT_MAX_BYTES = 2 << 30
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _hash_stream(stream) -> str:
+    digest = hashlib.sha256()
+    while chunk := stream.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HashingReader:
+    """Hashes a stream as it is read, for streams that cannot be rewound and read twice."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.name = source_name(stream)
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self._digest.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        """Digest of the whole stream; whatever the reader did not consume is read first."""
+        while chunk := self.stream.read(HASH_CHUNK_SIZE):
+            self._digest.update(chunk)
+        return self._digest.hexdigest()
+
+
+def hash_sources(sources: list, known: dict | None = None) -> str | None:
+    """SHA-256 over the contents of files and streams, in order.
+
+    known maps paths to digests already computed, e.g. while the files were
+    spooled, so they are not read again. Seekable streams are read and
+    rewound, HashingReaders give the digest of what they read; None if some
+    other stream cannot be rewound, or for URLs.
+    """
+    digests = []
+    for source in sources:
+        if known and not is_stream(source) and source in known:
+            digests.append(known[source])
+        elif isinstance(source, HashingReader):
+            digests.append(source.hexdigest())
+        elif is_stream(source):
+            if not is_seekable(source):
+                return None
+            start = source.tell()
+            digests.append(_hash_stream(source))
+            source.seek(start)
+        elif is_url(source):
+            return None
+        else:
+            with open(source, "rb") as f:
+                digests.append(_hash_stream(f))
+    return hashlib.sha256(",".join(digests).encode("ascii")).hexdigest()
+
+
+def _check_private(directory: str):
+    """Raise PermissionError unless directory belongs to this user and nobody else may write to it."""
+    if not hasattr(os, "getuid"):
+        # No POSIX ownership to check, e.g. on Windows
+        return
+    info = os.stat(directory)
+    if info.st_uid != os.getuid() or info.st_mode & 0o022:
+        raise PermissionError(f"Graph cache directory {directory} must be owned by this user and "
+                              f"writable only by it (e.g. chmod 700)")
+
+
+class GraphCache:
+    """On-disk cache of parsed graphs, keyed by source content, plugin and loader parameters.
+
+    Each entry is one binary snapshot file in directory. A hit refreshes the
+    file's modification time, and when the snapshots together exceed
+    max_bytes the least recently used ones are deleted. Several processes may
+    share a directory: snapshots are written to a temporary file and renamed
+    into place, and an entry deleted by another process is simply a miss.
+
+    Snapshots are pickles, which can run code when loaded, so the directory
+    must be private to the user running the app: it is created accessible
+    to that user only, and a directory that another user owns or may write
+    to is refused.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        _check_private(self.directory)
+
+    @staticmethod
+    def key(sources: list, plugin_id: str, kwargs: dict | None = None, digests: dict | None = None) -> str | None:
+        """Cache key of loading sources with a plugin, or None if their content cannot be hashed yet.
+
+        digests holds known digests of source paths, as for hash_sources.
+        File names only count through their extensions.
+        """
+        content_hash = hash_sources(sources, digests)
+        if content_hash is None:
+            return None
+        parameters = json.dumps(kwargs or {}, sort_keys=True, default=str)
+        # Loaders pick the format from the extension (.json / .jsonl, .ttl / .nt)
+        extensions = ",".join(os.path.splitext(source_name(source))[1].lower() for source in sources)
+        ident = f"{SNAPSHOT_VERSION}\0{content_hash}\0{extensions}\0{plugin_id}\0{parameters}"
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SNAPSHOT_SUFFIX)
+
+    def get(self, key: str) -> Graph | None:
+        """Return the cached graph for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                # Unpickling can run code, hence the private directory (see the class docstring)
+                # Loading allocates millions of objects none of which can be garbage yet
+                gc.disable()
+                try:
+                    graph = pickle.load(f)
+                finally:
+                    gc.enable()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            # Truncated or stale snapshot: drop it and parse again
+            self._remove(path)
+            return None
+        return graph
+
+    def put(self, key: str, graph: Graph):
+        """Store a snapshot of graph under key, then evict down to max_bytes."""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used snapshots until the total size is within max_bytes."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SNAPSHOT_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SNAPSHOT_SUFFIX):
+                self._remove(entry.path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
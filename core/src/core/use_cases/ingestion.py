@@ -0,0 +1,244 @@
+import math
+import multiprocessing
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any
+
+from api.interfaces.data_source_plugin import DataSourcePlugin
+from api.models.graph import Graph
+from api.services.progress import ProgressCallback
+from api.services.sources import is_seekable, is_stream, is_url, source_name
+from core.use_cases.graph_cache import GraphCache, HashingReader
+
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+# Files smaller than this per part are not worth splitting
+MIN_PART_BYTES = 4 << 20
+
+
+def is_archive(source: Any) -> bool:
+    return source_name(source).lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def local_path(source: Any) -> str | None:
+    """Path of a file on disk with the source's content, if there is one.
+
+    That is the source itself for a path, or for an upload that the web
+    framework spooled to disk, the path from its temporary_file_path().
+    """
+    if is_stream(source):
+        spooled = getattr(source, 'temporary_file_path', None)
+        return spooled() if spooled else None
+    return None if is_url(source) else source
+
+
+def expand_sources(sources: list, directory: str, extensions: list[str]) -> list:
+    """Replace archives in sources by the files they contain, extracted into directory.
+
+    Sources may be paths or binary streams; an archive is recognised by its
+    (stream) name. Archive members whose extension is not in extensions are
+    skipped; members of one archive are returned in name order.
+    """
+    files = []
+    for index, source in enumerate(sources):
+        if not is_archive(source):
+            files.append(source)
+            continue
+
+        target = os.path.join(directory, f"archive{index}")
+        archive_source = source
+        if is_stream(source) and not is_seekable(source) and source_name(source).lower().endswith('.zip'):
+            # The zip directory is at the end, so a one-way stream is saved first
+            archive_source = os.path.join(directory, f"archive{index}.zip")
+            with open(archive_source, 'wb') as f:
+                shutil.copyfileobj(source, f)
+
+        if source_name(source).lower().endswith('.zip'):
+            with zipfile.ZipFile(archive_source) as archive:
+                archive.extractall(target)
+        elif is_stream(archive_source):
+            mode = 'r:*' if is_seekable(archive_source) else 'r|*'
+            with tarfile.open(fileobj=archive_source, mode=mode) as archive:
+                archive.extractall(target, filter='data')
+        else:
+            with tarfile.open(archive_source) as archive:
+                archive.extractall(target, filter='data')
+
+        members = []
+        for root, _, names in os.walk(target):
+            members.extend(os.path.join(root, name) for name in names
+                           if name.lower().endswith(tuple(e.lower() for e in extensions)))
+        files.extend(sorted(members))
+    return files
+
+
+def spool_sources(sources: list, directory: str, digests: dict | None = None) -> list:
+    """Save streams among sources as files in directory, so they outlive the request that received them.
+
+    Uploads the web framework already spooled to disk are moved rather than
+    copied. Paths and URLs are returned unchanged. With digests, the SHA-256
+    of every saved file is stored in it by path, for the graph cache's key:
+    copied streams are hashed as they are copied, and moved uploads keep the
+    digest in their sha256 attribute, if the upload handler set one.
+    """
+    files = []
+    for index, source in enumerate(sources):
+        if not is_stream(source):
+            files.append(source)
+            continue
+        path = os.path.join(directory, f"{index}_{os.path.basename(source_name(source)) or 'upload'}")
+        spooled = local_path(source)
+        if spooled:
+            shutil.move(spooled, path)
+            digest = getattr(source, 'sha256', None)
+        else:
+            reader = HashingReader(source) if digests is not None else source
+            with open(path, 'wb') as f:
+                shutil.copyfileobj(reader, f)
+            digest = reader.hexdigest() if digests is not None else None
+        if digests is not None and digest:
+            digests[path] = digest
+        files.append(path)
+    return files
+
+
+def _pool_context():
+    """Start method of worker processes.
+
+    Ingestion runs on job threads of a multi-threaded server, and forking
+    such a process copies locks other threads may hold, so workers are
+    started from a fresh forkserver process, or spawned where there is none.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Imported once by the server rather than by every worker; takes effect when the server starts
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _load_part(plugin: DataSourcePlugin, source: str, index: int, kwargs: dict) -> Graph:
+    return plugin.load_part(source, index, **kwargs)
+
+
+class _PartProgress:
+    """Adds up the progress of parts into the progress of the whole ingestion."""
+
+    def __init__(self, callback: ProgressCallback):
+        self.callback = callback
+        self.bytes_done = 0
+        self.nodes_done = 0
+        self.part_bytes = 0
+
+    def update(self, bytes_read: int, nodes: int):
+        self.part_bytes = bytes_read
+        self.callback(self.bytes_done + bytes_read, self.nodes_done + nodes)
+
+    def finish(self, part: Any, graph: Graph):
+        path = local_path(part)
+        self.bytes_done += os.path.getsize(path) if path else self.part_bytes
+        self.nodes_done += len(graph.nodes)
+        self.part_bytes = 0
+        self.callback(self.bytes_done, self.nodes_done)
+
+
+class IngestionService:
+    """Loads a set of files, archives or one large file with a pool of worker processes.
+
+    Sources are paths, URLs or binary streams such as uploads. Every file is
+    split into parts where the plugin supports it, the parts are parsed in
+    parallel by the plugin's load_part, and the part graphs are combined with
+    the plugin's merge_graphs, which deduplicates nodes by id and resolves
+    links between parts. Streams without a file on disk cannot be handed to
+    another process and are parsed in this one, as they are read.
+
+    With a cache, sources already parsed with the same plugin and parameters
+    are read back from a snapshot instead. digests may hold the SHA-256 of
+    source paths, as spool_sources computes them, so that those files are
+    not read once to hash them and again to parse them. Streams that cannot
+    be rewound are hashed while they are parsed, so their graph is stored but
+    not looked up.
+
+    A progress callback is called with the bytes read and nodes parsed over
+    all parts: as they go for parts parsed in this process, and as each part
+    finishes for parts parsed by workers. Node counts of parts are added up
+    before the merge, so nodes that several parts share are counted for each.
+    If the callback raises, parts not yet started are cancelled and the
+    exception propagates at once; parts already running finish in their
+    worker processes and are discarded.
+    """
+
+    def __init__(self, plugin: DataSourcePlugin, workers: int | None = None, cache: GraphCache | None = None,
+                 digests: dict | None = None):
+        self.plugin = plugin
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.digests = digests
+
+    def load(self, sources: list, progress: ProgressCallback | None = None, **kwargs) -> Graph:
+        if self.cache is None:
+            return self._load(sources, progress, **kwargs)
+
+        key = self.cache.key(sources, self.plugin.id(), kwargs, self.digests)
+        if key is None:
+            sources = [HashingReader(s) if is_stream(s) and not is_seekable(s) else s for s in sources]
+            graph = self._load(sources, progress, **kwargs)
+            key = self.cache.key(sources, self.plugin.id(), kwargs)
+            if key is not None:
+                self.cache.put(key, graph)
+            return graph
+
+        graph = self.cache.get(key)
+        if graph is None:
+            graph = self._load(sources, progress, **kwargs)
+            self.cache.put(key, graph)
+        elif progress:
+            progress(sum(os.path.getsize(path) for path in map(local_path, sources) if path), len(graph.nodes))
+        return graph
+
+    def _load(self, sources: list, progress: ProgressCallback | None = None, **kwargs) -> Graph:
+        # Parts may still be open in workers left running after a cancellation
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+            files = expand_sources(sources, directory, self.plugin.get_supported_extensions())
+            if not files:
+                raise ValueError("No files supported by the selected data source plugin")
+
+            parts = []
+            per_file = math.ceil(self.workers / len(files))
+            for source in files:
+                path = local_path(source)
+                count = min(per_file, os.path.getsize(path) // MIN_PART_BYTES) if path else 1
+                parts.extend(self.plugin.split_source(path, count, directory) if count > 1 else [path or source])
+
+            tracker = _PartProgress(progress) if progress else None
+            graphs = [None] * len(parts)
+            pooled = {i for i, part in enumerate(parts) if not is_stream(part)}
+            if len(pooled) < 2 or self.workers == 1:
+                pooled = set()
+            pool = (ProcessPoolExecutor(max_workers=min(self.workers, len(pooled)), mp_context=_pool_context())
+                    if pooled else None)
+            completed = False
+            try:
+                futures = {pool.submit(_load_part, self.plugin, parts[i], i, kwargs): i for i in sorted(pooled)}
+                for i, part in enumerate(parts):
+                    if i not in pooled:
+                        part_kwargs = dict(kwargs, progress=tracker.update) if tracker else kwargs
+                        graphs[i] = self.plugin.load_part(part, i, **part_kwargs)
+                        if tracker:
+                            tracker.finish(part, graphs[i])
+                for future in as_completed(futures):
+                    i = futures[future]
+                    graphs[i] = future.result()
+                    if tracker:
+                        tracker.finish(parts[i], graphs[i])
+                completed = True
+            finally:
+                if pool is not None:
+                    # After a failure or cancellation, parts not yet started are dropped and running
+                    # ones are left to finish in their processes, so this thread returns at once
+                    pool.shutdown(wait=completed, cancel_futures=True)
+
+        return graphs[0] if len(graphs) == 1 else self.plugin.merge_graphs(graphs)
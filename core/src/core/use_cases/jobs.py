@@ -0,0 +1,175 @@
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from api.models.graph import Graph
+from core.use_cases.ingestion import IngestionService
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 16
+# Finished jobs kept for status requests
+FINISHED_JOBS_KEPT = 100
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class IngestionJob:
+    """One upload being parsed in the background, with its progress.
+
+    directory, if set, holds the job's spooled sources and is deleted once
+    the job has finished.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, workspace_id: str, plugin_id: str, sources: list,
+                 total_bytes: int | None = None, directory: str | None = None):
+        self.id = str(uuid.uuid4())
+        self.workspace_id = workspace_id
+        self.plugin_id = plugin_id
+        self.sources = sources
+        self.directory = directory
+        self.state = self.QUEUED
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.nodes = 0
+        self.error: str | None = None
+        self.created = time.time()
+        self.finished: float | None = None
+        self._cancel = threading.Event()
+        self._future: Future | None = None
+        # Held by cancel() and while the parsed graph is handed over; once that has begun
+        # the job can no longer be cancelled
+        self._lock = threading.Lock()
+        self._handing_over = False
+
+    @property
+    def done(self) -> bool:
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def progress(self, bytes_read: int, nodes: int):
+        """ProgressCallback for the ingestion; raises JobCancelled once the job is cancelled."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.bytes_read = bytes_read
+        self.nodes = nodes
+
+    def cancel(self) -> bool:
+        """Ask the job to stop; False if it has already finished or is handing over its graph.
+
+        A queued job never starts. A running job stops at its next progress
+        report, leaving parts already handed to worker processes to finish
+        there, and in any case before its graph replaces the workspace's.
+        """
+        with self._lock:
+            if self.done or self._handing_over:
+                return False
+            self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(self.CANCELLED)
+        return True
+
+    def _finish(self, state: str, error: str | None = None):
+        self.state = state
+        self.error = error
+        self.finished = time.time()
+        self.sources = []
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "workspace_id": self.workspace_id,
+            "plugin_id": self.plugin_id,
+            "state": self.state,
+            "bytes_read": self.bytes_read,
+            "total_bytes": self.total_bytes,
+            "nodes": self.nodes,
+            "error": self.error,
+            "elapsed": (self.finished or time.time()) - self.created,
+        }
+
+
+class JobService:
+    """Runs ingestion jobs on a bounded pool of threads.
+
+    Each thread parses one job at a time, with the job's IngestionService
+    using worker processes of its own where the sources allow it. At most
+    max_pending jobs wait for a thread. A new job for a workspace cancels
+    the unfinished ones for the same workspace, so an older upload that
+    finishes later never replaces a newer one.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestion")
+        self._jobs: dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job: IngestionJob, ingestion: IngestionService,
+               on_done: Callable[[Graph], None], **kwargs) -> IngestionJob:
+        """Queue job; on_done is called with the graph from the job's thread once it is parsed.
+
+        Raises:
+            RuntimeError: If max_pending jobs are already waiting
+        """
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j.state == IngestionJob.QUEUED)
+            if pending >= self.max_pending:
+                raise RuntimeError("Too many uploads waiting to be processed, try again later")
+            superseded = [j for j in self._jobs.values() if j.workspace_id == job.workspace_id and not j.done]
+            self._jobs[job.id] = job
+            self._prune()
+        for old in superseded:
+            old.cancel()
+        job._future = self._pool.submit(self._run, job, ingestion, on_done, kwargs)
+        return job
+
+    def get(self, job_id: str) -> IngestionJob | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        return job is not None and job.cancel()
+
+    def shutdown(self):
+        for job in list(self._jobs.values()):
+            job.cancel()
+        self._pool.shutdown(wait=True)
+
+    @staticmethod
+    def _run(job: IngestionJob, ingestion: IngestionService, on_done: Callable[[Graph], None], kwargs: dict):
+        if job._cancel.is_set():
+            job._finish(IngestionJob.CANCELLED)
+            return
+        job.state = IngestionJob.RUNNING
+        try:
+            graph = ingestion.load(job.sources, progress=job.progress, **kwargs)
+            # A cancel that got the lock first is honoured; later ones are refused
+            with job._lock:
+                if job._cancel.is_set():
+                    raise JobCancelled()
+                job._handing_over = True
+                job.nodes = len(graph.nodes)
+                on_done(graph)
+        except JobCancelled:
+            job._finish(IngestionJob.CANCELLED)
+        except Exception as e:
+            job._finish(IngestionJob.FAILED, str(e))
+        else:
+            job._finish(IngestionJob.DONE)
+
+    def _prune(self):
+        finished = [j for j in self._jobs.values() if j.done]
+        for job in finished[:max(0, len(finished) - FINISHED_JOBS_KEPT)]:
+            del self._jobs[job.id]
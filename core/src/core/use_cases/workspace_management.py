@@ -1,12 +1,27 @@
 from typing import List, Optional
+from api.interfaces.visualizer_plugin import VisualizerPlugin
 from api.models.graph import Graph
 from api.models.workspace import Workspace
-from api.services.search_filter import search, filter
+from api.services.aggregation import DEFAULT_MAX_NODES, HIERARCHY, aggregate
+from api.services.layout import HAS_NUMPY, force_layout
+from api.services.spatial import QuadTree
+from api.services.filter_pipeline import FilterStage
+from core.use_cases.cli import handle_command
+
+# Larger graphs are left to the visualizers to lay out in the browser
+DEFAULT_LAYOUT_MAX_NODES = 20_000
+
 
 class WorkspaceService:
-    def __init__(self):
+    def __init__(self, lod_max_nodes: int = DEFAULT_MAX_NODES, lod_method: str = HIERARCHY,
+                 layout_max_nodes: int = DEFAULT_LAYOUT_MAX_NODES):
         self.workspaces: List[Workspace] = []
         self.current_workspace: Optional[Workspace] = None
+        # Filtered graphs above lod_max_nodes nodes are visualized with clusters collapsed; 0 disables it
+        self.lod_max_nodes = lod_max_nodes
+        self.lod_method = lod_method
+        # Graphs of up to layout_max_nodes nodes are laid out on the server (with numpy); 0 disables it
+        self.layout_max_nodes = layout_max_nodes
 
     def create_workspace(self, graph: Optional[Graph] = None, name: Optional[str] = None) -> Workspace:
         if graph is None:
@@ -37,27 +52,119 @@ class WorkspaceService:
         ws.name = new_name
         return True
 
-    def get_graph_from_dict(self) -> Graph:
-        return Graph.from_dict(self.current_workspace.filtered_graph_data)
-    
+    def get_filtered_graph(self) -> Graph:
+        return self.current_workspace.filtered_graph or Graph()
+
+    def get_visualization(self, workspace: Workspace, visualizer: VisualizerPlugin) -> str:
+        """Render the workspace's filtered graph, reusing the script while the graph is unchanged.
+
+        A graph of more than lod_max_nodes nodes is rendered as its level-of-detail
+        view, with the clusters the user expanded opened. Visualizers that take
+        positions get the ones of get_layout. Like the other readers of the
+        workspace's derived graphs it holds the workspace lock, so that a graph
+        swapped in meanwhile is not cached under the version it replaced.
+        """
+        with workspace._lock:
+            cached = workspace.visualization_cache.get(visualizer.id())
+            if cached is not None and cached[0] == workspace.version:
+                return cached[1]
+            graph = self.get_visualized_graph(workspace)
+            positions = self.get_layout(workspace, graph) if visualizer.uses_layout else None
+            script = visualizer.visualize(graph, positions) if positions is not None else visualizer.visualize(graph)
+            workspace.visualization_cache[visualizer.id()] = (workspace.version, script)
+            return script
+
+    def get_visualized_graph(self, workspace: Workspace) -> Graph:
+        """The filtered graph, or its level-of-detail view beyond lod_max_nodes nodes, built once per version."""
+        with workspace._lock:
+            cached = workspace.visualized_graph
+            if cached is not None and cached[0] == workspace.version:
+                return cached[1]
+            graph = workspace.filtered_graph or Graph()
+            if self.lod_max_nodes and len(graph.nodes) > self.lod_max_nodes:
+                graph = aggregate(graph, self.lod_max_nodes, self.lod_method, workspace.expanded_clusters)
+            workspace.visualized_graph = (workspace.version, graph)
+            return graph
+
+    def get_layout(self, workspace: Workspace, graph: Graph) -> dict | None:
+        """Positions of the nodes of graph, the workspace's visualized graph, laid out once per version.
+
+        Each layout starts from the positions of the previous one, so after a
+        filter, an edit or an expanded cluster the nodes that remain stay put.
+        None when numpy is missing or the graph is too large.
+        """
+        with workspace._lock:
+            if not HAS_NUMPY or not self.layout_max_nodes or len(graph.nodes) > self.layout_max_nodes:
+                return None
+            cached = workspace.layout
+            if cached is not None and cached[0] == workspace.version:
+                return cached[1]
+            positions = force_layout(graph, cached[1] if cached is not None else None)
+            workspace.layout = (workspace.version, positions)
+            return positions
+
+    def query_viewport(self, workspace: Workspace, box: tuple[float, float, float, float],
+                       zoom: float | None = None) -> tuple[Graph, dict] | None:
+        """Visualized nodes inside box = (x0, y0, x1, y1) of the layout, and the links incident to them.
+
+        At a zoom (screen pixels per layout unit) where a part of the layout
+        shrinks below a few pixels, only its most linked node is returned.
+        Returns the nodes and links as a graph, heaviest nodes first, with
+        their positions; None when the graph has no server-side layout.
+        """
+        with workspace._lock:
+            graph = self.get_visualized_graph(workspace)
+            positions = self.get_layout(workspace, graph)
+            if positions is None:
+                return None
+            cached = workspace.spatial_index
+            if cached is None or cached[0] != workspace.version:
+                degrees = {}
+                for link in graph.links:
+                    degrees[link.source] = degrees.get(link.source, 0) + 1
+                    degrees[link.target] = degrees.get(link.target, 0) + 1
+                cached = workspace.spatial_index = (workspace.version, QuadTree(positions, degrees))
+
+            ids = cached[1].query(*box, zoom)
+            shown = set(ids)
+            nodes = [graph.get_node(node_id) for node_id in ids]
+            links = [link for node_id in ids for link in graph.outgoing_links(node_id)]
+            links += [link for node_id in ids for link in graph.incoming_links(node_id) if link.source not in shown]
+            return Graph(nodes, links), {node_id: positions[node_id] for node_id in ids}
 
     def search_graph(self, query: str) -> Graph:
-        g = self.get_graph_from_dict()
-        g = search(g, query)
-        self.current_workspace.filtered_graph_data = g.to_dict()
-        self.current_workspace.applied_filters.append(query)
-        return g
+        return self.current_workspace.apply_filter(FilterStage("search", query))
 
     def filter_graph(self, attr: str, op: str, val: str) -> Graph:
-        g = self.get_graph_from_dict()
+        return self.current_workspace.apply_filter(self._filter_stage(attr, op, val))
+
+    def edit_filter(self, index: int, attr: str, op: str, val: str) -> Graph:
+        """Replace the index-th applied filter; only it and the filters after it are recomputed."""
+        return self.current_workspace.edit_filter(index, self._filter_stage(attr, op, val))
+
+    def undo_filter(self) -> bool:
+        return self.current_workspace.undo_filter()
+
+    @staticmethod
+    def _filter_stage(attr: str, op: str, val: str) -> FilterStage:
         ops = {'eq': '==', 'le': '<=', 'ge': '>=', 'lt': '<', 'gt': '>', 'ne': '!='}
         if op not in ops:
             raise ValueError(f"Unknown operator: {op}")
-        g = filter(g, attr, ops[op], val)
-        filter_str = f"{attr} {ops[op]} {val}"
-        self.current_workspace.filtered_graph_data = g.to_dict()
-        self.current_workspace.applied_filters.append(filter_str)
-        return g
+        return FilterStage("filter", attr, ops[op], val)
+
+    def reset_filters(self):
+        self.current_workspace.reset_filters()
+
+    def execute_command(self, command_str: str) -> str:
+        """Run a CLI command against the current workspace's filtered graph."""
+        ws = self.current_workspace
+        with ws._lock:
+            g = ws.mutable_filtered_graph()
+            try:
+                return handle_command(g, command_str)
+            finally:
+                # Commands may have partially applied before raising
+                ws.touch()
 
     
     def create_fallback_graph(self) -> Graph:
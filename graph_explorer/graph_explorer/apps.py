@@ -1,6 +1,9 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 from core.use_cases.const import VISUALIZER_GROUP, DATASOURCE_GROUP
+from core.use_cases.graph_cache import GraphCache
+from core.use_cases.jobs import JobService
 from core.use_cases.plugin_recognition import PluginService
 from core.use_cases.workspace_management import WorkspaceService
 
@@ -11,9 +14,18 @@ class GraphExplorerConfig(AppConfig):
 
     plugin_service: PluginService
     workspace_service: WorkspaceService
+    graph_cache: GraphCache | None
+    job_service: JobService
 
     def ready(self):
         self.plugin_service = PluginService()
-        self.workspace_service = WorkspaceService()
+        self.workspace_service = WorkspaceService(settings.LOD_MAX_NODES, settings.LOD_METHOD,
+                                                  settings.LAYOUT_MAX_NODES)
+        cache_dir = getattr(settings, 'GRAPH_CACHE_DIR', None)
+        self.graph_cache = GraphCache(cache_dir, settings.GRAPH_CACHE_MAX_BYTES) if cache_dir else None
+        self.job_service = JobService(settings.INGESTION_WORKERS, settings.INGESTION_MAX_PENDING)
         self.plugin_service.load_plugins(VISUALIZER_GROUP)
+        for plugin in self.plugin_service.plugins[VISUALIZER_GROUP]:
+            # Edits to the visualizers' scripts show up without a restart while developing
+            plugin.reload_templates = settings.DEBUG
         self.plugin_service.load_plugins(DATASOURCE_GROUP)
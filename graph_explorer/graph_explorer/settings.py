@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -121,3 +122,28 @@ STATIC_URL = '/static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Parsed uploads are cached on disk, keyed by file content, plugin and loader parameters.
+# Set GRAPH_CACHE_DIR to None, or the environment variable to an empty string, to disable the cache.
+GRAPH_CACHE_DIR = os.environ.get('GRAPH_CACHE_DIR', BASE_DIR / 'graph_cache')
+GRAPH_CACHE_MAX_BYTES = int(os.environ.get('GRAPH_CACHE_MAX_BYTES', 2 * 1024 ** 3))
+# Large uploads are hashed for the cache key while they are written to disk
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'graph_explorer.uploads.HashingUploadHandler',
+]
+
+# Uploads are parsed by background jobs: at most INGESTION_WORKERS at a time,
+# with up to INGESTION_MAX_PENDING more waiting.
+INGESTION_WORKERS = int(os.environ.get('INGESTION_WORKERS', 2))
+INGESTION_MAX_PENDING = int(os.environ.get('INGESTION_MAX_PENDING', 16))
+
+# Graphs of more than LOD_MAX_NODES nodes are shown with clusters collapsed into supernodes
+# the user can expand (0 shows every node). LOD_METHOD picks the clusters: "hierarchy"
+# (parent-child links), "components" or "labels" (label propagation communities).
+LOD_MAX_NODES = int(os.environ.get('LOD_MAX_NODES', 2000))
+LOD_METHOD = os.environ.get('LOD_METHOD', 'hierarchy')
+
+# Visualized graphs of up to LAYOUT_MAX_NODES nodes are laid out on the server when numpy is
+# installed, starting from the previous layout; 0 leaves all layout to the browser.
+LAYOUT_MAX_NODES = int(os.environ.get('LAYOUT_MAX_NODES', 20000))
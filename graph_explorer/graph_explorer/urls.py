@@ -24,8 +24,14 @@ urlpatterns = [
     path('workspace/<str:workspace_id>/', views.index, name='index'),
     path('workspace/new/', views.new_workspace, name='new_workspace'),
     path('upload-graph/<str:workspace_id>/', views.upload_graph, name='upload_graph'),
+    path('jobs/<str:job_id>/', views.job_status, name='job_status'),
+    path('jobs/<str:job_id>/cancel/', views.cancel_job, name='cancel_job'),
+    path('export-graph/<str:workspace_id>/', views.export_graph, name='export_graph'),
+    path('expand-cluster/<str:workspace_id>/', views.expand_cluster, name='expand_cluster'),
+    path('viewport/<str:workspace_id>/', views.viewport, name='viewport'),
     path('search/<str:workspace_id>/', views.search_filter, name="search"),
     path('reset/<str:workspace_id>/', views.reset_filter, name="reset"),
+    path('undo/<str:workspace_id>/', views.undo_filter, name="undo"),
     path('change_visualization_plugin/<str:workspace_id>/', views.change_visualization_plugin, name='change_visualization_plugin'),
     path('rename/<str:workspace_id>/', views.rename_workspace, name='rename_workspace'),
     path("cli/execute/<str:workspace_id>/", views.cli_execute, name="cli_execute"),
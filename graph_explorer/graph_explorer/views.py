@@ -1,14 +1,20 @@
 import json
 import os
+import re
+import shutil
 import tempfile
 import uuid
 from django.views.decorators.csrf import csrf_exempt
 from django.apps import apps
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect
 
+from api.interfaces.data_source_plugin import DataSourcePlugin
+from api.services.sources import NamedStream
+from api.services.utils import encode_graph
 from core.use_cases.const import VISUALIZER_GROUP, DATASOURCE_GROUP
-from core.use_cases.cli import handle_command
+from core.use_cases.ingestion import ARCHIVE_EXTENSIONS, IngestionService, is_archive, spool_sources
+from core.use_cases.jobs import IngestionJob
 
 
 def get_config():
@@ -38,15 +44,17 @@ def get_context_data(request: HttpRequest, workspace: 'Workspace'):
     current_visualizer_id = getattr(workspace, 'current_visualizer_id', 'simple_visualizer')
     selected_visualizer = next((p for p in plugins.get(VISUALIZER_GROUP, []) if p.id() == current_visualizer_id), None)
     ws_service = get_workspace_service()
-    g_filtered = ws_service.get_graph_from_dict()
-    vis_script = selected_visualizer.visualize(g_filtered) if selected_visualizer else ""
+    vis_script = ws_service.get_visualization(workspace, selected_visualizer) if selected_visualizer else ""
     
-    plugin_extensions = {p.id(): p.get_supported_extensions() for p in plugins.get(DATASOURCE_GROUP, [])}
+    plugin_extensions = {p.id(): p.get_supported_extensions() + list(ARCHIVE_EXTENSIONS)
+                         for p in plugins.get(DATASOURCE_GROUP, [])}
 
     return {
         "visualization_plugins": plugins.get(VISUALIZER_GROUP, []),
         "visualization_script": vis_script,
         "data_source_plugins": plugins.get(DATASOURCE_GROUP, []),
+        "export_plugins": [p for p in plugins.get(DATASOURCE_GROUP, [])
+                           if type(p).export_data is not DataSourcePlugin.export_data],
         "plugin_extensions_json": json.dumps(plugin_extensions),
         "selected_data_plugin": getattr(workspace, 'current_data_source_id', None),
         "current_workspace_id": workspace.id,
@@ -77,41 +85,136 @@ def upload_graph(request: HttpRequest, workspace_id: str):
         return JsonResponse({"success": False, "error": "Invalid request method."}, status=405)
 
     try:
-        upload = request.FILES.get('file') or list(request.FILES.values())[0]
-        plugin_id = request.POST.get('plugin_id')
+        if request.content_type == 'multipart/form-data':
+            uploads = request.FILES.getlist('file') or list(request.FILES.values())[:1]
+            plugin_id = request.POST.get('plugin_id')
+        else:
+            # A raw request body; its format is recognised by the file name in the query string
+            has_body = int(request.META.get('CONTENT_LENGTH') or 0) > 0
+            uploads = [NamedStream(request, request.GET.get('filename', ''))] if has_body else []
+            plugin_id = request.GET.get('plugin_id')
         plugins = get_plugins()
         selected_plugin = next((p for p in plugins.get(DATASOURCE_GROUP, []) if p.id() == plugin_id), None)
 
         if not selected_plugin:
             raise ValueError(f"Plugin '{plugin_id}' not found")
+        if not uploads:
+            raise ValueError("No file uploaded")
+
+        # Parsing runs in a background job; the uploads are kept in a directory the job owns
+        directory = tempfile.mkdtemp(prefix='graph-upload-')
+        try:
+            digests = {}
+            sources = spool_sources(uploads, directory, digests)
+            total_bytes = None if any(map(is_archive, sources)) else sum(map(os.path.getsize, sources))
+            job = IngestionJob(ws.id, plugin_id, sources, total_bytes, directory)
+            ingestion = IngestionService(selected_plugin, cache=get_config().graph_cache, digests=digests)
+            get_config().job_service.submit(job, ingestion, lambda g: ws.set_graph(g, plugin_id))
+        except Exception:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+
+        return JsonResponse({"success": True, "job": job.to_dict()}, status=202)
+    
+    except Exception as e:
+        return JsonResponse({"success": False, "error": str(e)})
 
-        ext = os.path.splitext(upload.name)[1] or '.tmp'
-        with tempfile.NamedTemporaryFile(mode='wb', suffix=ext, delete=False) as tf:
-            for chunk in upload.chunks():
-                tf.write(chunk)
-            temp_file_path = tf.name
 
-        g = selected_plugin.load_data(temp_file_path)
-        ws.graph_data = g.to_dict()
-        ws.filtered_graph_data = g.to_dict()
-        ws.applied_filters = []
-        ws.current_data_source_id = plugin_id
+def job_status(request: HttpRequest, job_id: str):
+    """Progress of an upload; once it is done, also the new graph's size and visualization."""
+    job = get_config().job_service.get(job_id)
+    if not job:
+        return JsonResponse({"success": False, "error": "Job not found."}, status=404)
 
-        vis_script = get_context_data(request, ws)['visualization_script']
+    data = {"success": True, "job": job.to_dict()}
+    ws = next((w for w in get_workspace_service().get_workspaces() if w.id == job.workspace_id), None)
+    if job.state == IngestionJob.DONE and ws:
+        data["node_count"] = len(ws.graph.nodes)
+        data["link_count"] = len(ws.graph.links)
+        data["visualization_script"] = get_context_data(request, ws)['visualization_script']
+    return JsonResponse(data)
+
+
+@csrf_exempt
+def cancel_job(request: HttpRequest, job_id: str):
+    if request.method != 'POST':
+        return JsonResponse({"success": False, "error": "Invalid request method."}, status=405)
+
+    job = get_config().job_service.get(job_id)
+    if not job:
+        return JsonResponse({"success": False, "error": "Job not found."}, status=404)
+    if not job.cancel():
+        error = f"Job already {job.state}." if job.done else "Job is already replacing the workspace graph."
+        return JsonResponse({"success": False, "error": error, "job": job.to_dict()})
+    return JsonResponse({"success": True, "job": job.to_dict()})
+
+
+def export_graph(request: HttpRequest, workspace_id: str):
+    """Download the workspace's current graph in the format of a data source plugin."""
+    ws_service = get_workspace_service()
+    ws = ws_service.select_workspace(workspace_id)
+    if not ws:
+        return JsonResponse({"success": False, "error": "Workspace not found."}, status=404)
+
+    plugin_id = request.GET.get('plugin_id', 'binary_data_source')
+    plugin = next((p for p in get_plugins().get(DATASOURCE_GROUP, []) if p.id() == plugin_id), None)
+    if not plugin:
+        return JsonResponse({"success": False, "error": f"Plugin '{plugin_id}' not found"}, status=404)
+
+    response = HttpResponse(content_type='application/octet-stream')
+    try:
+        plugin.export_data(ws.filtered_graph, response)
+    except NotImplementedError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+
+    filename = re.sub(r'[^\w.-]+', '_', ws.name) + plugin.get_supported_extensions()[0]
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
 
-        return JsonResponse({
-            "success": True,
-            "visualization_script": vis_script,
-            "node_count": len(g.nodes),
-            "link_count": len(g.links)
-        })
-    
-    except Exception as e:
-        return JsonResponse({"success": False, "error": str(e)})
 
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
+def expand_cluster(request: HttpRequest, workspace_id: str):
+    """Open a supernode of a large graph's visualization, showing the nodes and clusters it stands for."""
+    ws_service = get_workspace_service()
+    ws = ws_service.select_workspace(workspace_id)
+    if not ws:
+        return JsonResponse({"success": False, "error": "Workspace not found."}, status=404)
+
+    cluster_id = request.GET.get('cluster')
+    if not cluster_id:
+        return JsonResponse({"success": False, "error": "No cluster given."}, status=400)
+    ws.expand_cluster(cluster_id)
+
+    vis_script = get_context_data(request, ws)['visualization_script']
+    return JsonResponse({"success": True, "visualization_script": vis_script})
+
+
+def viewport(request: HttpRequest, workspace_id: str):
+    """Nodes of the visualized graph inside a box of its layout, with their positions and incident links.
+
+    The box is given as x0, y0, x1, y1 in layout coordinates (centred on 0);
+    the optional zoom, in screen pixels per layout unit, thins out nodes
+    that would be drawn within a few pixels of each other. Links may lead to
+    nodes outside the box.
+    """
+    ws_service = get_workspace_service()
+    ws = ws_service.select_workspace(workspace_id)
+    if not ws:
+        return JsonResponse({"success": False, "error": "Workspace not found."}, status=404)
+
+    try:
+        box = tuple(float(request.GET[key]) for key in ('x0', 'y0', 'x1', 'y1'))
+        zoom = float(request.GET['zoom']) if request.GET.get('zoom') else None
+    except (KeyError, ValueError):
+        return JsonResponse({"success": False, "error": "Give the box as numbers x0, y0, x1, y1 and an optional zoom."},
+                            status=400)
+    if zoom is not None and zoom <= 0:
+        return JsonResponse({"success": False, "error": "zoom must be positive."}, status=400)
+
+    result = ws_service.query_viewport(ws, box, zoom)
+    if result is None:
+        return JsonResponse({"success": False, "error": "The graph has no server-side layout."}, status=409)
+    graph, positions = result
+    return HttpResponse(encode_graph(graph, positions), content_type='application/json')
 
 
 def search_filter(request: HttpRequest, workspace_id: str):
@@ -120,7 +223,6 @@ def search_filter(request: HttpRequest, workspace_id: str):
     if not ws:
         ws = ws_service.create_workspace()
 
-    g = ws_service.get_graph_from_dict()
     filter_str = ""
     error_message = None
 
@@ -147,8 +249,19 @@ def reset_filter(request: HttpRequest, workspace_id: str):
     if not ws:
         return redirect('index')
 
-    ws.filtered_graph_data = ws.graph_data
-    ws.applied_filters = []
+    ws_service.reset_filters()
+
+    context = get_context_data(request, ws)
+    return render(request, "index.html", context)
+
+
+def undo_filter(request: HttpRequest, workspace_id: str):
+    ws_service = get_workspace_service()
+    ws = ws_service.select_workspace(workspace_id)
+    if not ws:
+        return redirect('index')
+
+    ws_service.undo_filter()
 
     context = get_context_data(request, ws)
     return render(request, "index.html", context)
@@ -182,11 +295,8 @@ def cli_execute(request: HttpRequest, workspace_id: str):
     data = json.loads(request.body)
     command_str = data.get("command", "")
     
-    g = ws_service.get_graph_from_dict()
-    
     try:
-        result = handle_command(g, command_str)
-        ws.filtered_graph_data = g.to_dict()
+        result = ws_service.execute_command(command_str)
 
         vis_script = get_context_data(request, ws)['visualization_script']
 
@@ -1,10 +1,111 @@
 import json
 import os
-import urllib.request
-import urllib.parse
+from typing import BinaryIO, Iterator, TextIO
+
 from api.interfaces.data_source_plugin import DataSourcePlugin
 from api.models.graph import Graph
-from dateutil import parser as dateparser
+from api.services.coercion import AttributeCoercer
+from api.services.progress import ProgressReporter
+from api.services.sources import is_url, open_text, source_name
+
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+CHUNK_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+
+
+def iter_json_array(stream: TextIO, chunk_size: int = CHUNK_SIZE, raw: bool = False) -> Iterator:
+    """Yield the items of a top-level JSON array one at a time.
+
+    Only the item being decoded and one chunk of text are held in memory. A
+    document that is not an array is decoded whole and yielded as a single item.
+    With raw=True each item's JSON text is yielded instead of its value.
+
+    Raises:
+        json.JSONDecodeError: If the array is malformed, as json.load would
+    """
+    buf = stream.read(chunk_size).lstrip()
+    if not buf.startswith('['):
+        text = buf + stream.read()
+        yield text if raw else json.loads(text)
+        return
+
+    pos = 1
+    eof = False
+    # After '[' an item or ']' follows, after an item ',' or ']', after ',' an item
+    after_item = after_comma = False
+    while True:
+        # Skip whitespace up to the next token
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf, pos = stream.read(chunk_size), 0
+            eof = not buf
+
+        if pos >= len(buf):
+            raise json.JSONDecodeError("Unterminated array", buf, pos)
+        char = buf[pos]
+        if char == ']' and not after_comma:
+            _check_end(stream, buf, pos + 1, chunk_size)
+            return
+        if after_item:
+            if char != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+            after_item, after_comma = False, True
+            continue
+        if char in ',]':
+            raise json.JSONDecodeError("Expecting value", buf, pos)
+
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+            # A number cut off by the chunk boundary decodes fine but may be incomplete,
+            # so an item only counts once the separator after it has been read
+            complete = eof or (end < len(buf) and buf[end] in _WHITESPACE + ',]')
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+
+        if not complete:
+            # Read at least as much again as is buffered, so a large item is re-decoded O(log n) times
+            more = stream.read(max(chunk_size, len(buf) - pos))
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        yield buf[pos:end] if raw else item
+        pos = end
+        after_item, after_comma = True, False
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def _check_end(stream: TextIO, buf: str, pos: int, chunk_size: int):
+    """Raise json.JSONDecodeError if anything but whitespace follows the array."""
+    rest = buf[pos:]
+    while True:
+        stripped = rest.lstrip(_WHITESPACE)
+        if stripped:
+            raise json.JSONDecodeError("Extra data", stripped, 0)
+        rest = stream.read(chunk_size)
+        if not rest:
+            return
+
+
+def iter_json_lines(stream: TextIO) -> Iterator:
+    """Yield one decoded value per non-empty line."""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {number}: {e}") from e
 
 
 class JsonDataSourcePlugin(DataSourcePlugin):
@@ -16,8 +117,8 @@ class JsonDataSourcePlugin(DataSourcePlugin):
     def id(self) -> str:
         return "json_data_source"
     
-    def load_data(self, source: str, **kwargs) -> Graph:
-        """Load graph data from a JSON file with hierarchical structure
+    def load_data(self, source: str | BinaryIO, **kwargs) -> Graph:
+        """Load graph data from a JSON file, URL or stream with hierarchical structure
         
         Expected JSON format:
         {
@@ -37,91 +138,152 @@ class JsonDataSourcePlugin(DataSourcePlugin):
         - children_field: Field name for children array (default: "children")
         - parent_field: Field name for parent reference (default: "parent")
         - max_depth: Maximum parsing depth (default: 10)
+        - json_lines: Read one node per line (default: True for .jsonl/.ndjson sources)
+        - progress: ProgressCallback for bytes read and nodes parsed
+
+        A top-level array is read one item at a time, and JSON Lines sources one
+        line at a time, so only the graph being built is kept in memory. Nodes
+        from separate items or lines are connected through their parent field.
+        A stream is read as it arrives and left open; its name, if any, tells
+        JSON Lines apart.
         """
         # Parse parameters
         id_field = kwargs.get('id_field', '@id')
         children_field = kwargs.get('children_field', 'children')
         parent_field = kwargs.get('parent_field', 'parent')
         max_depth = kwargs.get('max_depth', 10)
+        json_lines = kwargs.get('json_lines', source_name(source).lower().endswith(JSON_LINES_EXTENSIONS))
+        progress = ProgressReporter.from_kwargs(kwargs)
         
-        # Load JSON data
-        if source.startswith(('http://', 'https://')):
+        # Open JSON data; records are decoded while the graph is built
+        if is_url(source):
             try:
-                with urllib.request.urlopen(source) as response:
-                    data = json.loads(response.read().decode('utf-8'))
+                stream = open_text(source, progress=progress)
             except Exception as e:
                 raise Exception(f"Failed to load JSON from URL {source}: {e}")
         else:
-            if not os.path.exists(source):
-                raise FileNotFoundError(f"JSON file not found: {source}")
-            
-            with open(source, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            stream = open_text(source, "JSON", progress)
         
         graph = Graph()
         processed_nodes = set()  # Track processed nodes to avoid infinite loops
+        coercer = AttributeCoercer()  # Types string values, learning each key's type as it goes
+        nodes = []
+        links = []
         
-        def parse_node(node_data, depth=0, parent_id=None):
-            """Recursively parse a node and its children"""
-            if depth > max_depth:
-                return
-            
-            # Extract node ID
-            node_id = str(node_data.get(id_field))
-            if not node_id:
-                return
-            
-            # Skip if already processed (avoid infinite loops in cyclic graphs)
-            if node_id in processed_nodes:
-                return
-            
-            processed_nodes.add(node_id)
-            
-            # Extract attributes (all fields except special ones)
-            attributes = {}
-            for key, value in node_data.items():
-                if key not in [id_field, children_field, parent_field]:
-                    if isinstance(value, str):
-                        try:
-                            value = dateparser.parse(value)
-                        except (ValueError, OverflowError):
-                            pass
-                    attributes[key] = value
-            
-            # Add node to graph
-            graph.add_node(node_id, attributes)
-            
-            # Create parent-child link if parent_id is provided
-            if parent_id:
-                link_id = f"{parent_id}_to_{node_id}"
-                graph.add_link(link_id, parent_id, node_id)
-            
-            # Process children
-            children = node_data.get(children_field, [])
-            if isinstance(children, list):
-                for child in children:
-                    if isinstance(child, dict):
-                        parse_node(child, depth + 1, node_id)
-            
-            # Process parent reference if it exists
-            parent_ref = node_data.get(parent_field)
-            if parent_ref and parent_ref != parent_id:
-                # Create link from child to parent
-                link_id = f"{node_id}_to_{parent_ref}"
-                graph.add_link(link_id, node_id, parent_ref)
+        def parse_node(root_data):
+            """Parse a node and its children depth-first with an explicit stack.
+
+            A stack entry is either (node_data, depth, parent_id) or a link tuple
+            for a parent reference, which is emitted after the node's children.
+            """
+            stack = [(root_data, 0, None)]
+            while stack:
+                entry = stack.pop()
+                if not isinstance(entry[0], dict):
+                    links.append(entry)
+                    continue
+
+                node_data, depth, parent_id = entry
+                if depth > max_depth:
+                    continue
+                
+                # Extract node ID
+                node_id = str(node_data.get(id_field))
+                if not node_id:
+                    continue
+                
+                # Skip if already processed (avoid infinite loops in cyclic graphs)
+                if node_id in processed_nodes:
+                    continue
+                
+                processed_nodes.add(node_id)
+                
+                # Extract attributes (all fields except special ones)
+                attributes = {}
+                for key, value in node_data.items():
+                    if key not in [id_field, children_field, parent_field]:
+                        attributes[key] = coercer.coerce(key, value)
+                
+                # Add node to graph
+                nodes.append((node_id, attributes))
+                
+                # Create parent-child link if parent_id is provided
+                if parent_id:
+                    link_id = f"{parent_id}_to_{node_id}"
+                    links.append((link_id, parent_id, node_id))
+                
+                # Process parent reference if it exists, after the children below
+                parent_ref = node_data.get(parent_field)
+                if parent_ref and parent_ref != parent_id:
+                    # Create link from child to parent
+                    link_id = f"{node_id}_to_{parent_ref}"
+                    stack.append((link_id, node_id, parent_ref))
+                
+                # Process children, first child on top of the stack
+                children = node_data.get(children_field, [])
+                if isinstance(children, list):
+                    for child in reversed(children):
+                        if isinstance(child, dict):
+                            stack.append((child, depth + 1, node_id))
         
-        # Start parsing from root
-        if isinstance(data, dict):
-            parse_node(data)
-        elif isinstance(data, list):
-            for item in data:
+        # Top-level items are parsed as they are decoded
+        with stream:
+            records = iter_json_lines(stream) if json_lines else iter_json_array(stream)
+            for item in records:
                 if isinstance(item, dict):
                     parse_node(item)
-        
+                    if progress:
+                        progress.parsed(len(nodes))
+
+        # Parent references may point at nodes parsed later, so links are validated once at the end
+        graph.add_nodes_bulk(nodes)
+        graph.add_links_bulk(links)
         return graph
     
+    def split_source(self, source: str, parts: int, directory: str) -> list[str]:
+        """Split a top-level array or a JSON Lines file into files of about equal size
+
+        Items are never cut, so every part is a valid document of the same kind;
+        parent references between items of different parts are resolved when
+        the part graphs are merged. A single top-level object is not split.
+        """
+        if parts < 2 or is_url(source):
+            return [source]
+
+        json_lines = source.lower().endswith(JSON_LINES_EXTENSIONS)
+        base, ext = os.path.splitext(os.path.basename(source))
+        target = os.path.getsize(source) / parts
+        paths: list[str] = []
+        chunk: list[str] = []
+        size = 0
+
+        def flush():
+            path = os.path.join(directory, f"{base}.part{len(paths)}{ext}")
+            with open(path, 'w', encoding='utf-8') as out:
+                out.write(''.join(chunk) if json_lines else '[' + ','.join(chunk) + ']')
+            paths.append(path)
+            chunk.clear()
+
+        with open(source, 'r', encoding='utf-8') as stream:
+            if json_lines:
+                records = stream
+            else:
+                if not stream.read(CHUNK_SIZE).lstrip().startswith('['):
+                    return [source]
+                stream.seek(0)
+                records = iter_json_array(stream, raw=True)
+
+            for record in records:
+                chunk.append(record)
+                size += len(record)
+                if len(paths) < parts - 1 and size >= target * (len(paths) + 1):
+                    flush()
+        if chunk or not paths:
+            flush()
+        return paths
+
     def get_supported_extensions(self) -> list[str]:
-        return ['.json']
+        return ['.json', *JSON_LINES_EXTENSIONS]
     
     def get_required_parameters(self) -> dict:
         """Return required parameters for this data source"""
@@ -154,5 +316,11 @@ class JsonDataSourcePlugin(DataSourcePlugin):
                 'description': 'Maximum parsing depth',
                 'default': 10,
                 'required': False
+            },
+            'json_lines': {
+                'type': 'boolean',
+                'description': 'Read one JSON node per line',
+                'default': 'True for .jsonl and .ndjson sources',
+                'required': False
             }
         }
@@ -2,8 +2,107 @@ from rdflib import Graph as RDFGraph, URIRef, Literal, BNode
 from rdflib.namespace import RDF, XSD
 from api.interfaces.data_source_plugin import DataSourcePlugin
 from api.models.graph import Graph
-import os, re, urllib.request
+from api.services.progress import ProgressReporter
+from api.services.sources import is_stream, is_url, open_binary, open_text, source_name
+import hashlib, os, re, urllib.request
+from array import array
 from datetime import date, datetime
+from typing import BinaryIO, Iterator, TextIO
+
+STREAMING_EXTENSIONS = ('.nt',)
+
+RDF_TYPE = RDF.type
+INT_TYPES = frozenset({XSD.int, XSD.integer, XSD.long, XSD.short, XSD.unsignedInt, XSD.unsignedByte})
+FLOAT_TYPES = frozenset({XSD.decimal, XSD.float, XSD.double})
+DATE_TYPES = frozenset({XSD.date, XSD.dateTime})
+# Node types given to terms without an rdf:type
+TERM_KINDS = frozenset({"uri", "bnode", "literal"})
+# Node attributes not set from literal triples, or not only from them
+NODE_KEYS = frozenset({"original", "type"})
+
+_IRI = r'<([^>]*)>'
+_BNODE = r'_:([A-Za-z0-9_][A-Za-z0-9_\-.]*(?<!\.))'
+_LITERAL = r'"((?:[^"\\]|\\.)*)"(?:@([A-Za-z]+(?:-[A-Za-z0-9]+)*)|\^\^<([^>]*)>)?'
+NTRIPLE_RE = re.compile(
+    rf'\s*(?:{_IRI}|{_BNODE})\s*{_IRI}\s*(?:{_IRI}|{_BNODE}|{_LITERAL})\s*\.\s*(?:#.*)?'
+)
+_ESCAPE_RE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+_ESCAPES = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
+
+
+def _unescape(text: str) -> str:
+    if '\\' not in text:
+        return text
+    return _ESCAPE_RE.sub(lambda m: chr(int(m.group(1) or m.group(2), 16)) if m.group(3) is None
+                          else _ESCAPES.get(m.group(3), m.group(0)), text)
+
+
+def _literal_digest(literal: Literal) -> int:
+    """64-bit digest of a literal term: its lexical form, language and datatype.
+
+    Literals with equal values but different terms, e.g. "1" as xsd:integer and
+    as xsd:int, get different digests. It is stable across processes,
+    unlike hash().
+    """
+    text = f"{literal}\0{literal.language or ''}\0{literal.datatype or ''}"
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class RdfPart(Graph):
+    """Graph of one part of a larger load, as load_part returns it.
+
+    literal_digests holds the _literal_digest of every attribute value set
+    from a literal, in the order of the nodes, of their attribute keys
+    (except NODE_KEYS) and of the values under each key. merge_graphs uses it
+    to tell repeated triples from distinct literals with equal values.
+    """
+
+    def __init__(self, nodes: list = None, links: list = None):
+        super().__init__(nodes, links)
+        self.literal_digests = array('Q')
+
+    def __getstate__(self) -> dict:
+        return dict(super().__getstate__(), literal_digests=self.literal_digests)
+
+    def __setstate__(self, state: dict):
+        super().__setstate__(state)
+        self.literal_digests = state["literal_digests"]
+
+
+def iter_ntriples(stream: TextIO) -> Iterator[tuple]:
+    """Yield (subject, predicate, object) rdflib terms from N-Triples text, one line at a time.
+
+    Nothing is kept from earlier lines but the terms of predicates and
+    datatypes, so repeated triples are yielded again; _build_graph(dedupe=True)
+    drops them as an rdflib graph would.
+    """
+    # Predicates and datatypes repeat on almost every line, so their terms are built once
+    iris: dict[str, URIRef] = {}
+
+    def iri(text: str) -> URIRef:
+        term = iris.get(text)
+        if term is None:
+            term = iris[text] = URIRef(_unescape(text))
+        return term
+
+    for number, line in enumerate(stream, 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        m = NTRIPLE_RE.fullmatch(stripped)
+        if m is None:
+            raise ValueError(f"Invalid N-Triples statement on line {number}: {stripped[:80]}")
+
+        s_iri, s_bnode, p_iri, o_iri, o_bnode, lexical, lang, datatype = m.groups()
+        subject = URIRef(_unescape(s_iri)) if s_iri is not None else BNode(s_bnode)
+        if o_iri is not None:
+            obj = URIRef(_unescape(o_iri))
+        elif o_bnode is not None:
+            obj = BNode(o_bnode)
+        else:
+            obj = Literal(_unescape(lexical), lang=lang, datatype=iri(datatype) if datatype is not None else None)
+
+        yield subject, iri(p_iri), obj
 
 
 class RdfDataSourcePlugin(DataSourcePlugin):
@@ -14,19 +113,42 @@ class RdfDataSourcePlugin(DataSourcePlugin):
         return "data_source_rdf"
 
     def get_supported_extensions(self) -> list[str]:
-        return ['.ttl']
+        return ['.ttl', *STREAMING_EXTENSIONS]
+
+    def load_data(self, source: str | BinaryIO, **kwargs) -> Graph:
+        """High‐level orchestration.
+
+        N-Triples (.nt) sources are streamed line by line straight into the graph,
+        without building an rdflib store; pass streaming=True to read a Turtle dump
+        written as one full-IRI triple per line the same way. A binary stream is
+        read as it arrives and left open; its name, if any, tells the formats apart.
+        A `progress` callback is told about bytes as they are read and, for
+        N-Triples, about nodes as they are created.
+        """
+        return self._load(source, kwargs)
+
+    def load_part(self, source: str | BinaryIO, index: int, **kwargs) -> Graph:
+        """Load a part like load_data, as an RdfPart for merge_graphs."""
+        return self._load(source, kwargs, part=True)
+
+    def _load(self, source: str | BinaryIO, kwargs: dict, part: bool = False) -> Graph:
+        progress = ProgressReporter.from_kwargs(kwargs)
+        if kwargs.get('streaming', source_name(source).lower().endswith(STREAMING_EXTENSIONS)):
+            with open_text(source, "RDF", progress) as stream:
+                return self._build_graph(iter_ntriples(stream), progress=progress, dedupe=True, part=part)
 
-    def load_data(self, source: str) -> Graph:
-        """High‐level orchestration."""
-        rdf = self._load_rdf_graph(source)
+        rdf = self._load_rdf_graph(source, progress)
         type_map = self._collect_type_map(rdf)
-        return self._build_graph(rdf, type_map)
+        return self._build_graph(rdf, type_map, part=part)
 
     @staticmethod
-    def _load_rdf_graph(source: str) -> RDFGraph:
-        """Load a Turtle graph from a file or URL."""
+    def _load_rdf_graph(source: str | BinaryIO, progress: ProgressReporter | None = None) -> RDFGraph:
+        """Load a Turtle graph from a file, URL or stream."""
         g = RDFGraph()
-        if source.startswith(('http://', 'https://')):
+        if is_stream(source) or progress:
+            with open_binary(source, "RDF", progress) as stream:
+                g.parse(source=stream, format='turtle')
+        elif is_url(source):
             data = urllib.request.urlopen(source).read()
             g.parse(data=data, format='turtle')
         else:
@@ -45,57 +167,178 @@ class RdfDataSourcePlugin(DataSourcePlugin):
                 m[str(s)] = self._short_label(str(o))
         return m
 
-    def _build_graph(self, rdf: RDFGraph, type_map: dict[str,str]) -> Graph:
+    def _build_graph(self, triples, type_map: dict[str,str] | None = None,
+                     progress: ProgressReporter | None = None, dedupe: bool = False,
+                     part: bool = False) -> Graph:
         """
         Two‐pass build:  
          • ensure each subject/object has a node  
          • attach literals and edges  
+        Without a type_map, rdf:type triples set node types as they are read.
+        With dedupe, a triple read again adds no second literal value or link,
+        for triples that do not come from an rdflib graph; only the triples
+        kept in the graph are remembered for it, literals by their digest.
+        Literals with equal values but different terms are all kept, as in an
+        rdflib graph. With part, an RdfPart is returned.
         """
-        graph = Graph()
+        graph = RdfPart() if part else Graph()
         lex2id = {}
+        attrs_by_id: dict[str, dict] = {}
+        links = []
         next_node = 1
         next_link = 1
+        triples_kept = set()
+        # {node id: {key: [literal digest]}}, for the values set from literals
+        digests: dict[str, dict[str, list]] = {}
 
-        def make_node(lex: str, term) -> int:
+        def make_node(lex: str, term) -> str:
             nonlocal next_node
             if lex in lex2id:
                 return lex2id[lex]
             nid = str(next_node); next_node += 1
             kind = "uri" if isinstance(term, URIRef) else "bnode" if isinstance(term, BNode) else "literal"
-            attrs = {"original": lex, "type": type_map.get(lex, kind)}
-            graph.add_node(nid, attrs)
+            attrs_by_id[nid] = {"original": lex, "type": type_map.get(lex, kind) if type_map else kind}
             lex2id[lex] = nid
             return nid
 
-        for s, p, o in rdf:
+        for s, p, o in triples:
             subj_lex = str(s)
             sid = make_node(subj_lex, s)
+            if progress:
+                progress.parsed(next_node - 1)
 
-            if p == RDF.type: # already recorded in attrs via type_map
+            if p == RDF_TYPE: # already recorded in attrs via type_map
+                if type_map is None and isinstance(o, URIRef):
+                    attrs_by_id[sid]["type"] = self._short_label(str(o))
                 continue
 
             if isinstance(o, Literal):
                 key = self._sanitize(self._short_label(str(p)))
-                val = self._convert_rdf_literal(o)
-                node = next(n for n in graph.nodes if n.id == sid)
-                existing = node.attributes.get(key)
-                node.attributes[key] = (existing + [val]) if isinstance(existing, list) else ( [existing, val] if existing else val )
+                if (dedupe or part) and key not in NODE_KEYS:
+                    digest = _literal_digest(o)
+                    if dedupe:
+                        if (sid, key, digest) in triples_kept:
+                            continue
+                        triples_kept.add((sid, key, digest))
+                    if part:
+                        digests.setdefault(sid, {}).setdefault(key, []).append(digest)
+                self._add_value(attrs_by_id[sid], key, self._convert_rdf_literal(o))
                 continue
 
             obj_lex = str(o)
             oid = make_node(obj_lex, o)
+            triple = (subj_lex, str(p), obj_lex)
+            if dedupe:
+                if triple in triples_kept:
+                    continue
+                triples_kept.add(triple)
 
-            graph.add_link(str(next_link), sid, oid)
-            link = graph.links[-1]
-            link.attributes = {
+            links.append((str(next_link), sid, oid, {
                 "predicate": self._short_label(str(p)),
                 "predicate_uri": str(p),
-                "triple": (subj_lex, str(p), obj_lex)
-            }
+                "triple": triple
+            }))
             next_link += 1
 
+        if part:
+            for nid, attrs in attrs_by_id.items():
+                keys = digests.get(nid)
+                if keys:
+                    for key in attrs:
+                        graph.literal_digests.extend(keys.get(key, ()))
+        graph.add_nodes_bulk(attrs_by_id.items())
+        graph.add_links_bulk(links)
         return graph
 
+    def split_source(self, source: str, parts: int, directory: str) -> list[str]:
+        """Split an N-Triples file into files of whole lines; Turtle is not split."""
+        if (parts < 2 or is_url(source)
+                or not source.lower().endswith(STREAMING_EXTENSIONS)):
+            return [source]
+
+        base, ext = os.path.splitext(os.path.basename(source))
+        target = os.path.getsize(source) / parts
+        paths: list[str] = []
+        out = None
+        size = 0
+        try:
+            with open(source, 'rb') as stream:
+                for line in stream:
+                    if out is None:
+                        paths.append(os.path.join(directory, f"{base}.part{len(paths)}{ext}"))
+                        out = open(paths[-1], 'wb')
+                    out.write(line)
+                    size += len(line)
+                    if len(paths) < parts and size >= target * len(paths):
+                        out.close()
+                        out = None
+        finally:
+            if out is not None:
+                out.close()
+        return paths or [source]
+
+    def merge_graphs(self, graphs: list[Graph]) -> Graph:
+        """Merge the graphs of separately loaded parts, in part order.
+
+        Node and link ids are counters local to each load, so nodes are matched
+        by the term they were made from ("original") and renumbered. Literal
+        values spread over parts are combined as a single load combines them,
+        with a literal found in several parts kept once; parts returned by
+        load_part tell literals apart by term, other graphs by value. A type
+        read from rdf:type replaces the term kind, and a triple found in
+        several parts gives one link.
+        """
+        lex2id: dict[str, str] = {}
+        attrs_by_id: dict[str, dict] = {}
+        links = []
+        triples = set()
+        # (node id, key, literal digest or value) of the literal values kept
+        literals = set()
+
+        for part in graphs:
+            ids = {}
+            digests = iter(part.literal_digests) if isinstance(part, RdfPart) else None
+            for node in part.nodes:
+                nid = lex2id.get(node.attributes["original"])
+                first = nid is None
+                if first:
+                    nid = lex2id[node.attributes["original"]] = str(len(lex2id) + 1)
+                    attrs_by_id[nid] = node.attributes
+                attributes = attrs_by_id[nid]
+                for key, val in node.attributes.items():
+                    if key in NODE_KEYS:
+                        if key == "type" and not first and isinstance(val, str) and val not in TERM_KINDS:
+                            attributes["type"] = val
+                        continue
+                    for v in (val if isinstance(val, list) else [val]):
+                        literal = (nid, key, next(digests) if digests is not None else v)
+                        if first:
+                            literals.add(literal)
+                        elif literal not in literals:
+                            literals.add(literal)
+                            self._add_value(attributes, key, v)
+                ids[node.id] = nid
+
+            for link in part.links:
+                if link.attributes["triple"] in triples:
+                    continue
+                triples.add(link.attributes["triple"])
+                links.append((str(len(links) + 1), ids[link.source], ids[link.target], link.attributes))
+
+        graph = Graph()
+        graph.add_nodes_bulk(attrs_by_id.items())
+        graph.add_links_bulk(links)
+        return graph
+
+    @staticmethod
+    def _add_value(attributes: dict, key: str, val):
+        """Store a literal value; repeated predicates collect their values in a list."""
+        if key not in attributes:
+            attributes[key] = val
+        else:
+            existing = attributes[key]
+            attributes[key] = (existing + [val]) if isinstance(existing, list) else [existing, val]
+
     @staticmethod
     def _short_label(uri: str) -> str:
         """Strip namespaces to get the local name."""
@@ -112,14 +355,11 @@ class RdfDataSourcePlugin(DataSourcePlugin):
         """Cast XSD literals to native Python types when possible."""
         data_type = literal.datatype
         try:
-            if data_type in {
-                XSD.int, XSD.integer, XSD.long,
-                XSD.short, XSD.unsignedInt, XSD.unsignedByte
-            }:
+            if data_type in INT_TYPES:
                 return int(literal)
-            if data_type in {XSD.decimal, XSD.float, XSD.double}:
+            if data_type in FLOAT_TYPES:
                 return float(literal)
-            if data_type in {XSD.date, XSD.dateTime}:
+            if data_type in DATE_TYPES:
                 py = literal.toPython()
                 if isinstance(py, (date, datetime)):
                     return py
@@ -1,26 +1,26 @@
-import json
 import os
+
 from api.interfaces.visualizer_plugin import VisualizerPlugin
+from api.services.script_template import ScriptTemplate
+from api.services.utils import encode_graph_text
+
+TEMPLATE = ScriptTemplate(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'visualize.js'))
+
 
 class SimpleVisualizerPlugin(VisualizerPlugin):
     """
     A visualizer plugin that generates an HTML string with a simple graph visualization.
     """
+    uses_layout = True
+
     def name(self) -> str:
         return "Simple Visualizer"
 
     def id(self) -> str:
         return "simple_visualizer"
 
-    def visualize(self, graph):
+    def visualize(self, graph, positions=None):
         """
         Generates an HTML string with an embedded D3.js graph visualization.
         """
-        here = os.path.dirname(os.path.abspath(__file__))
-
-        js_file_path = os.path.join(here, 'static', 'visualize.js')
-        content = open(js_file_path).read()
-      
-        pieces = content.split("GRAPH_JSON")
-
-        return pieces[0] + json.dumps(graph.to_dict()) + pieces[1]
\ No newline at end of file
+        return TEMPLATE.render(encode_graph_text(graph, positions), self.reload_templates)
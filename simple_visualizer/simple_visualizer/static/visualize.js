@@ -42,8 +42,18 @@ var simulation = d3.forceSimulation()
 
 var graph = GRAPH_JSON  
 
+// Positions laid out on the server, centred on 0, are drawn as they are instead of being simulated
+var preset = graph.nodes.length > 0 && graph.nodes.every(d => d.x !== undefined);
+if (preset) {
+    graph.nodes.forEach(d => { d.x += width/2; d.y += height/2; });
+}
+
 update(graph.links, graph.nodes);
 updateViewport(d3.zoomIdentity);
+if (preset) {
+    simulation.stop();
+    ticked();
+}
 
 
 function updateViewport(transform) {
@@ -110,7 +120,11 @@ function update(links, nodes) {
             tooltip.style("opacity", 0);
         })
         .on("click", function(d) {
-            focusNode(d.id);
+            if (isSupernode(d) && window.expandCluster) {
+                window.expandCluster(d.id);
+            } else {
+                focusNode(d.id);
+            }
         });
 
     mini_node = svgBirdView.selectAll(".node")
@@ -124,19 +138,15 @@ function update(links, nodes) {
         });
 
     node.append("circle")
-        .attr("r", d => {
-            const dynamicRadius = 8 + d.id.toString().length * 4;
-      
-        const radius = Math.max(20, dynamicRadius);
-        return radius;
-        })
-        .style("fill", "lightblue")
+        .attr("r", nodeRadius)
+        .style("fill", d => isSupernode(d) ? "#fdd0a2" : "lightblue")
         .style("stroke", "black")
+        .style("stroke-dasharray", d => isSupernode(d) ? "4,2" : null)
 
     node.append("text")
         .attr("dy", "0.35em")
         .attr("text-anchor", "middle")
-        .text(d => d.id)
+        .text(d => isSupernode(d) ? `${d.attributes.label || ""} (${d.attributes.count})` : d.id)
 
     mini_node.append("circle")
         .attr("r", 3)
@@ -149,6 +159,18 @@ function update(links, nodes) {
     simulation.force("link").links(links);
 }
 
+// Supernodes stand for a cluster of nodes collapsed on the server; clicking one expands it
+function isSupernode(d) {
+    return !!(d.attributes && d.attributes.supernode);
+}
+
+function nodeRadius(d) {
+    if (isSupernode(d)) {
+        return 20 + 4 * Math.log2(d.attributes.count);
+    }
+    return Math.max(20, 8 + d.id.toString().length * 4);
+}
+
 function ticked() {
     link
         .attr("x1", d => d.source.x)
@@ -157,9 +179,7 @@ function ticked() {
         .attr("y2", d => d.target.y);
 
     link.each(function(d) {
-        const dynamicRadius = 8 + d.target.id.toString().length * 4;
-        const targetRadius = Math.max(20, dynamicRadius);
-        const refX = targetRadius + 10; 
+        const refX = nodeRadius(d.target) + 10;
         
         d3.select(this)
             .attr("marker-end", `url(#arrowhead)`);
@@ -180,7 +200,7 @@ function ticked() {
 }
 
 function dragstarted(d) {
-    if (!d3.event.active)
+    if (!preset && !d3.event.active)
         simulation.alphaTarget(0.3).restart()
     d.fx = d.x;
     d.fy = d.y;
@@ -189,6 +209,11 @@ function dragstarted(d) {
 function dragged(d) {
     d.fx = d3.event.x;
     d.fy = d3.event.y;
+    if (preset) {
+        d.x = d.fx;
+        d.y = d.fy;
+        ticked();
+    }
 }
 
 var getAncestorPath = function(nodeId) {
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The project directories beside tests/ are named like the packages installed from them
+# and would shadow them as namespace packages when the repository root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != ROOT]
@@ -0,0 +1,46 @@
+from api.models.graph import Graph
+from api.services.aggregation import aggregate
+
+
+def star_forest(prefix: str, stars: int, leaves: int) -> Graph:
+    graph = Graph()
+    for s in range(stars):
+        centre = f"{prefix}{s * (leaves + 1)}"
+        graph.add_node(centre)
+        for l in range(1, leaves + 1):
+            leaf = f"{prefix}{s * (leaves + 1) + l}"
+            graph.add_node(leaf)
+            graph.add_link(f"{centre}-{leaf}", centre, leaf)
+    return graph
+
+
+def test_supernode_ids_do_not_collide_with_node_ids():
+    graph = star_forest("cluster_", 10, 9)
+    view = aggregate(graph, max_nodes=20)
+
+    supernodes = [n.id for n in view.nodes if n.attributes.get("supernode")]
+    assert supernodes
+    assert not set(supernodes) & {n.id for n in graph.nodes}
+    assert len({n.id for n in view.nodes}) == len(view.nodes)
+
+
+def test_combined_link_ids_do_not_collide_with_link_ids():
+    graph = star_forest("n", 10, 9)
+    kept = {id(l) for l in graph.links}
+    combined = [l.id for l in aggregate(graph, max_nodes=20).links if id(l) not in kept]
+    assert combined
+
+    # Same structure, with real links named like the combined links of the first view
+    renamed = Graph()
+    for node in graph.nodes:
+        renamed.add_node(node.id)
+    for i, link in enumerate(graph.links):
+        renamed.add_link(combined[i % len(combined)], link.source, link.target)
+    real = {l.id for l in renamed.links}
+    kept = {id(l) for l in renamed.links}
+    view = aggregate(renamed, max_nodes=20)
+
+    new = [l.id for l in view.links if id(l) not in kept]
+    assert new
+    assert not set(new) & real
+    assert all(view.get_link(link_id) is not None for link_id in new)
@@ -0,0 +1,44 @@
+import io
+from datetime import date, datetime
+
+from api.models.graph import Graph
+from binary_data_source import BinaryDataSourcePlugin
+
+
+def round_trip(graph: Graph) -> Graph:
+    plugin = BinaryDataSourcePlugin()
+    buffer = io.BytesIO()
+    plugin.export_data(graph, buffer)
+    buffer.seek(0)
+    return plugin.load_data(buffer)
+
+
+def signature(graph: Graph):
+    return ([(n.id, n.attributes) for n in graph.nodes],
+            [(l.id, l.source, l.target, l.attributes) for l in graph.links])
+
+
+def test_empty_strings_round_trip():
+    graph = Graph()
+    graph.add_node("", {"a": ""})
+    graph.add_node("x", {"a": ""})
+    graph.add_link("", "", "x")
+    assert signature(round_trip(graph)) == signature(graph)
+
+
+def test_empty_datetime_and_json_columns_round_trip():
+    graph = Graph()
+    graph.add_node("a", {"when": datetime(2024, 1, 2, 3, 4, 5), "tags": []})
+    graph.add_node("b", {"tags": ""})
+    assert signature(round_trip(graph)) == signature(graph)
+
+
+def test_mixed_types_and_missing_attributes_round_trip():
+    graph = Graph()
+    graph.add_node(1, {"v": ""})
+    graph.add_node("2", {"v": 3})
+    graph.add_node(3, {"v": 2.5, "w": date(2020, 1, 1)})
+    graph.add_node(4, {"w": None, "x": True})
+    graph.add_node(5)
+    graph.add_link(7, 1, 3)
+    assert signature(round_trip(graph)) == signature(graph)
@@ -0,0 +1,36 @@
+import pytest
+
+from api.models.graph import Graph
+from core.use_cases.cli import handle_command
+
+
+def int_graph() -> Graph:
+    # Ids as a data source may produce them, e.g. from numeric keys
+    graph = Graph()
+    graph.add_node(1, {"name": "a"})
+    graph.add_node(2, {"name": "b"})
+    graph.add_node(3, {"name": "c"})
+    graph.add_link(10, 1, 2)
+    return graph
+
+
+def test_edit_node_with_integer_id():
+    graph = int_graph()
+    handle_command(graph, "edit node --id=2 --property=name=x")
+    assert graph.get_node(2).attributes["name"] == "x"
+
+
+def test_delete_node_and_edge_with_integer_ids():
+    graph = int_graph()
+    with pytest.raises(ValueError, match="still has edges"):
+        handle_command(graph, "delete node --id=1")
+
+    handle_command(graph, "delete edge --id=10")
+    handle_command(graph, "delete node --id=1")
+    assert [n.id for n in graph.nodes] == [2, 3]
+    assert graph.links == []
+
+
+def test_unknown_node_is_reported():
+    with pytest.raises(ValueError, match="not found"):
+        handle_command(int_graph(), "edit node --id=7 --property=name=x")
@@ -0,0 +1,31 @@
+import io
+import os
+
+import pytest
+
+from core.use_cases.graph_cache import GraphCache, hash_sources
+from core.use_cases.ingestion import spool_sources
+
+
+def test_cache_directory_is_private(tmp_path):
+    cache = GraphCache(tmp_path / "cache")
+    assert os.stat(cache.directory).st_mode & 0o077 == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_cache_refuses_directory_others_can_write(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        GraphCache(shared)
+
+
+def test_spooled_streams_are_hashed_while_copied(tmp_path):
+    upload = io.BytesIO(b"<root><a id='a'/></root>")
+    upload.name = "upload.xml"
+    digests = {}
+    files = spool_sources([upload], str(tmp_path), digests)
+
+    assert list(digests) == files
+    assert hash_sources(files, digests) == hash_sources(files)
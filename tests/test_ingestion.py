@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from api.interfaces.data_source_plugin import DataSourcePlugin
+from api.models.graph import Graph
+from core.use_cases.ingestion import IngestionService
+
+SLOW_PART_SECONDS = 3
+
+
+class SleepyPlugin(DataSourcePlugin):
+    """Loads files holding a number of seconds to sleep before returning a one-node graph."""
+
+    def name(self) -> str:
+        return "Sleepy"
+
+    def id(self) -> str:
+        return "sleepy"
+
+    def load_data(self, source, **kwargs) -> Graph:
+        with open(source) as f:
+            time.sleep(float(f.read()))
+        graph = Graph()
+        graph.add_node(source)
+        return graph
+
+    def get_supported_extensions(self) -> list[str]:
+        return [".sleep"]
+
+
+class Stop(Exception):
+    pass
+
+
+def stop(bytes_read, nodes):
+    raise Stop()
+
+
+def test_worker_parts_load_in_other_processes(tmp_path):
+    files = []
+    for i in range(3):
+        files.append(str(tmp_path / f"{i}.sleep"))
+        (tmp_path / f"{i}.sleep").write_text("0")
+
+    graph = IngestionService(SleepyPlugin(), workers=2).load(files)
+    assert sorted(n.id for n in graph.nodes) == sorted(files)
+
+
+def test_cancelled_load_does_not_wait_for_running_parts(tmp_path):
+    files = []
+    for i, seconds in enumerate((0, SLOW_PART_SECONDS, SLOW_PART_SECONDS)):
+        files.append(str(tmp_path / f"{i}.sleep"))
+        (tmp_path / f"{i}.sleep").write_text(str(seconds))
+
+    start = time.perf_counter()
+    with pytest.raises(Stop):
+        # The first finished part reports progress, which stops the load
+        IngestionService(SleepyPlugin(), workers=3).load(files, progress=stop)
+    assert time.perf_counter() - start < SLOW_PART_SECONDS
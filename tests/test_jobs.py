@@ -0,0 +1,58 @@
+import threading
+
+from api.models.graph import Graph
+from core.use_cases.jobs import IngestionJob, JobService
+
+
+class BlockingIngestion:
+    """Stands in for an IngestionService whose load waits until released."""
+
+    def __init__(self):
+        self.loading = threading.Event()
+        self.release = threading.Event()
+
+    def load(self, sources, progress=None, **kwargs):
+        self.loading.set()
+        self.release.wait(5)
+        return Graph()
+
+
+def test_cancel_after_parsing_keeps_the_workspace_graph():
+    service = JobService(workers=1)
+    ingestion = BlockingIngestion()
+    swapped = []
+    job = service.submit(IngestionJob("ws", "plugin", []), ingestion, swapped.append)
+
+    ingestion.loading.wait(5)
+    # No progress report comes after this cancel; the hand-over must still refuse the graph
+    assert job.cancel()
+    ingestion.release.set()
+    service.shutdown()
+
+    assert job.state == IngestionJob.CANCELLED
+    assert swapped == []
+
+
+def test_cancel_is_refused_once_the_graph_is_handed_over():
+    service = JobService(workers=1)
+    ingestion = BlockingIngestion()
+    ingestion.release.set()
+    handing_over = threading.Event()
+    resume = threading.Event()
+
+    def on_done(graph):
+        handing_over.set()
+        resume.wait(5)
+
+    job = service.submit(IngestionJob("ws", "plugin", []), ingestion, on_done)
+    assert handing_over.wait(5)
+    # cancel() waits for the hand-over to finish, then refuses
+    results = []
+    canceller = threading.Thread(target=lambda: results.append(job.cancel()))
+    canceller.start()
+    resume.set()
+    canceller.join(5)
+    service.shutdown()
+
+    assert results == [False]
+    assert job.state == IngestionJob.DONE
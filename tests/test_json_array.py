@@ -0,0 +1,35 @@
+import io
+import json
+
+import pytest
+
+from json_data_source import iter_json_array
+
+
+def items(text: str, chunk_size: int = 4, raw: bool = False) -> list:
+    return list(iter_json_array(io.StringIO(text), chunk_size, raw))
+
+
+@pytest.mark.parametrize("text", ["[1 2]", "[1,,2]", "[1,]", "[,1]", "[,]", "[1", "[1,", "[1] 2", '[{"a": 1}{"b": 2}]'])
+def test_malformed_arrays_are_rejected(text):
+    with pytest.raises(json.JSONDecodeError):
+        items(text)
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] \n", "[1]", "[1, 2 ,3]", '[\n{"a": [1, 2]},\n"x,]" , null, true]'])
+def test_well_formed_arrays_match_json_loads(text):
+    assert items(text) == json.loads(text)
+
+
+def test_items_straddling_chunk_boundaries():
+    values = [123456789, 1.5e30, -0.25, "a long string, with ] and ,", {"nested": [1, {"b": None}]}, True, None]
+    text = json.dumps(values)
+    for chunk_size in range(1, len(text) + 2):
+        assert items(text, chunk_size) == values
+        assert [json.loads(t) for t in items(text, chunk_size, raw=True)] == values
+
+
+def test_non_array_document_is_one_item():
+    assert items('{"a": 1}') == [{"a": 1}]
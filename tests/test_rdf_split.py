@@ -0,0 +1,56 @@
+import tempfile
+
+from rdf_data_source import RdfDataSourcePlugin
+
+TRIPLES = [
+    '<http://example.org/a> <http://example.org/name> "Alice" .',
+    '<http://example.org/a> <http://example.org/knows> <http://example.org/b> .',
+    '<http://example.org/b> <http://example.org/name> "Bob" .',
+    '<http://example.org/b> <http://example.org/age> "30"^^<http://www.w3.org/2001/XMLSchema#int> .',
+]
+
+
+def signature(graph):
+    return ([(n.id, n.attributes) for n in graph.nodes],
+            [(l.id, l.source, l.target, l.attributes["triple"]) for l in graph.links])
+
+
+def test_split_load_matches_single_load_with_repeated_literals():
+    # The repeated literal triples end up in a different part from their first occurrence
+    lines = TRIPLES + [f'<http://example.org/c{i}> <http://example.org/name> "C{i}" .' for i in range(20)] + TRIPLES
+    plugin = RdfDataSourcePlugin()
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/data.nt"
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+        parts = plugin.split_source(path, 3, directory)
+        assert len(parts) == 3
+        merged = plugin.merge_graphs([plugin.load_part(part, i) for i, part in enumerate(parts)])
+        single = plugin.load_data(path)
+
+    assert signature(merged) == signature(single)
+    assert single.nodes[0].attributes["name"] == "Alice"
+
+
+def test_split_load_keeps_distinct_literals_with_equal_values():
+    xsd = "http://www.w3.org/2001/XMLSchema#"
+    first = [f'<http://example.org/a> <http://example.org/n> "1"^^<{xsd}integer> .',
+             '<http://example.org/a> <http://example.org/s> "x" .']
+    second = [f'<http://example.org/a> <http://example.org/n> "1"^^<{xsd}int> .',
+              '<http://example.org/a> <http://example.org/s> "x"@en .',
+              f'<http://example.org/a> <http://example.org/n> "1"^^<{xsd}integer> .']
+    filler = [f'<http://example.org/c{i}> <http://example.org/name> "C{i}" .' for i in range(20)]
+    plugin = RdfDataSourcePlugin()
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/data.nt"
+        with open(path, "w") as f:
+            f.write("\n".join(first + filler + second) + "\n")
+
+        parts = plugin.split_source(path, 2, directory)
+        assert len(parts) == 2
+        merged = plugin.merge_graphs([plugin.load_part(part, i) for i, part in enumerate(parts)])
+        single = plugin.load_data(path)
+
+    assert signature(merged) == signature(single)
+    assert single.nodes[0].attributes["n"] == [1, 1]
@@ -0,0 +1,58 @@
+import io
+import tracemalloc
+
+from rdf_data_source import RdfDataSourcePlugin, iter_ntriples
+
+
+def ntriples(count: int, repeat_every: int = 0):
+    """N-Triples lines of a chain of subjects with one literal each, optionally repeating earlier lines."""
+    for i in range(count):
+        yield f'<http://example.org/s{i}> <http://example.org/next> <http://example.org/s{i + 1}> .\n'
+        yield f'<http://example.org/s{i}> <http://example.org/value> "{i}"^^<http://www.w3.org/2001/XMLSchema#int> .\n'
+        if repeat_every and i % repeat_every == 0:
+            yield f'<http://example.org/s{i}> <http://example.org/next> <http://example.org/s{i + 1}> .\n'
+
+
+def peak_bytes(count: int) -> int:
+    tracemalloc.start()
+    for _ in iter_ntriples(ntriples(count)):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def test_iter_ntriples_memory_does_not_grow_with_input():
+    small, large = peak_bytes(5_000), peak_bytes(100_000)
+    assert large < 2 * small + 256 * 1024
+
+
+def test_streaming_load_drops_repeated_triples():
+    text = "".join(ntriples(100, repeat_every=10)) + "".join(ntriples(5))
+    graph = RdfDataSourcePlugin().load_data(io.BytesIO(text.encode()), streaming=True)
+
+    assert len(graph.nodes) == 101
+    assert len(graph.links) == 100
+    assert [n.attributes["value"] for n in graph.nodes[:3]] == [0, 1, 2]
+
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+# Distinct terms whose values convert to the same Python value
+EQUAL_VALUES = [
+    f'<http://example.org/a> <http://example.org/n> "1"^^<{XSD}integer> .',
+    f'<http://example.org/a> <http://example.org/n> "1"^^<{XSD}int> .',
+    '<http://example.org/a> <http://example.org/s> "x" .',
+    '<http://example.org/a> <http://example.org/s> "x"@en .',
+    f'<http://example.org/a> <http://example.org/s> "x"^^<{XSD}string> .',
+]
+
+
+def test_streaming_load_keeps_distinct_literals_with_equal_values_like_turtle():
+    # Repeated triples are dropped, literals that only convert to the same value are not
+    text = "\n".join(EQUAL_VALUES + EQUAL_VALUES) + "\n"
+    plugin = RdfDataSourcePlugin()
+    streamed = plugin.load_data(io.BytesIO(text.encode()), streaming=True).nodes[0].attributes
+    parsed = plugin.load_data(io.BytesIO(text.encode()), streaming=False).nodes[0].attributes
+
+    assert streamed["n"] == parsed["n"] == [1, 1]
+    assert streamed["s"] == parsed["s"] == ["x", "x", "x"]
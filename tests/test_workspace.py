@@ -0,0 +1,29 @@
+from api.models.graph import Graph
+from api.models.workspace import Workspace
+from api.services.filter_pipeline import FilterStage
+
+
+def graph(*ids) -> Graph:
+    g = Graph()
+    for node_id in ids:
+        g.add_node(node_id, {"name": node_id})
+    return g
+
+
+def test_setting_graph_data_drops_the_old_filters():
+    ws = Workspace(graph=graph("a", "b"))
+    ws.apply_filter(FilterStage("search", "a"))
+    ws.graph_data = graph("c", "d", "e").to_dict()
+
+    assert [n.id for n in ws.filtered_graph.nodes] == ["c", "d", "e"]
+    assert ws.applied_filters == []
+    assert [n.id for n in ws.pipeline.result().nodes] == ["c", "d", "e"]
+
+
+def test_round_trip_keeps_filters():
+    ws = Workspace(graph=graph("a", "b"))
+    ws.filtered_graph_data = graph("a").to_dict()
+    restored = Workspace.from_dict(ws.to_dict())
+
+    assert [n.id for n in restored.graph.nodes] == ["a", "b"]
+    assert [n.id for n in restored.filtered_graph.nodes] == ["a"]
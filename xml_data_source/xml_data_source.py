@@ -1,57 +1,128 @@
-import os
 import re
 import xml.etree.ElementTree as ET
-from datetime import datetime, date
-from typing import Any, Dict, Set
+from typing import Any, BinaryIO, Dict, List, Set
 
 from api.interfaces.data_source_plugin import DataSourcePlugin
 from api.models.graph import Graph
-
-
-INT_RE = re.compile(r"^-?\d+$")
-FLOAT_RE = re.compile(r"^-?\d+\.\d+$")
+from api.services.coercion import AttributeCoercer, infer_value
+from api.services.progress import ProgressReporter
+from api.services.sources import open_binary
 
 
 def parse_value(value: str) -> Any:
-    """Try to convert a string value into int, float, date or leave as str."""
+    """Try to convert a string value into int, float, date, datetime or leave as str."""
 
     if not isinstance(value, str):
         return value
 
-    v = value.strip()
-    if v == "":
-        return ""
-
-    # Integer
-    if INT_RE.match(v):
-        try:
-            return int(v)
-        except Exception:
-            pass
-
-    # Float
-    if FLOAT_RE.match(v):
-        try:
-            return float(v)
-        except Exception:
-            pass
-
-    # Date (ISO)
-    try:
-        dt = datetime.fromisoformat(v)
-        return dt.date()
-    except Exception:
-        pass
-
-    for fmt in ("%Y-%m-%d", "%d.%m.%Y.", "%d/%m/%Y"):
-        try:
-            dt = datetime.strptime(v, fmt)
-            return dt.date()
-        except Exception:
-            continue
-
-    # Fallback: string
-    return v
+    return infer_value(value.strip())
+
+
+class TopologicalOrder:
+    """
+    Online topological numbering of a directed acyclic graph.
+    Every edge goes from a lower to a higher level, so a path from dst back to
+    src can only pass through levels between theirs. An edge that already agrees
+    with the levels is accepted in O(1); otherwise that band is searched from both
+    ends for a cycle, and on success the levels below dst are raised.
+    """
+
+    def __init__(self):
+        self.level: Dict[str, int] = {}
+        self.successors: Dict[str, List[str]] = {}
+        self.predecessors: Dict[str, List[str]] = {}
+
+    def add_node(self, node: str):
+        if node not in self.level:
+            self.level[node] = 0
+            self.successors[node] = []
+            self.predecessors[node] = []
+
+    def add_edge(self, src: str, dst: str) -> bool:
+        """Add src->dst unless it would close a cycle. Returns whether it was added."""
+        self.add_node(src)
+        self.add_node(dst)
+        if src == dst:
+            return False
+
+        if self.level[src] >= self.level[dst]:
+            if self._reaches(dst, src):
+                return False
+            self._raise(dst, self.level[src] + 1)
+
+        self.successors[src].append(dst)
+        self.predecessors[dst].append(src)
+        return True
+
+    def _reaches(self, start: str, target: str) -> bool:
+        """Bidirectional breadth-first search for a path start->target, expanding the smaller frontier."""
+        level = self.level
+        low, high = level[start], level[target]
+        forward, backward = {start}, {target}
+        forward_frontier, backward_frontier = [start], [target]
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier = []
+                for x in forward_frontier:
+                    for y in self.successors[x]:
+                        if y in backward:
+                            return True
+                        if y not in forward and level[y] < high:
+                            forward.add(y)
+                            frontier.append(y)
+                forward_frontier = frontier
+            else:
+                frontier = []
+                for x in backward_frontier:
+                    for y in self.predecessors[x]:
+                        if y in forward:
+                            return True
+                        if y not in backward and level[y] > low:
+                            backward.add(y)
+                            frontier.append(y)
+                backward_frontier = frontier
+        return False
+
+    def _raise(self, node: str, new_level: int):
+        """Lift node to new_level and push its descendants up to keep levels increasing along edges."""
+        level = self.level
+        level[node] = new_level
+        stack = [node]
+        while stack:
+            x = stack.pop()
+            next_level = level[x] + 1
+            for y in self.successors[x]:
+                if level[y] < next_level:
+                    level[y] = next_level
+                    stack.append(y)
+
+
+class ConnectedComponents:
+    """
+    Union-find over undirected edges. An undirected graph stays acyclic exactly
+    when every new edge joins two different components.
+    """
+
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+
+    def find(self, node: str) -> str:
+        parent = self.parent
+        root = parent.setdefault(node, node)
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def add_edge(self, src: str, dst: str) -> bool:
+        """Join the components of src and dst unless they are already joined."""
+        a, b = self.find(src), self.find(dst)
+        if a == b:
+            return False
+        self.parent[a] = b
+        return True
 
 
 class XmlDataSourcePlugin(DataSourcePlugin):
@@ -63,117 +134,92 @@ class XmlDataSourcePlugin(DataSourcePlugin):
     def id(self) -> str:
         return "xml_data_source"
 
-    def load_data(self, source: str, **kwargs) -> Graph:
+    def load_data(self, source: str | BinaryIO, **kwargs) -> Graph:
         """
-        Load graph data from any XML file.
+        Load graph data from any XML file, URL or binary stream.
         Rules:
         - Each element is a node.
         - Attributes are stored as node properties.
         - Parent-child relationships become edges.
-        - Reference attributes create additional edges (support cycles).
+        - Reference attributes create additional edges (support cycles),
+          including references to elements that appear later in the document.
+        The document is read incrementally with iterparse, so memory grows with
+        the graph rather than with the size of the XML.
         """
         id_field: str = kwargs.get("id_field", "id")
         ref_attributes = kwargs.get("ref_attributes", ["ref", "href", "link", "target"]) or []
         max_depth: int = int(kwargs.get("max_depth", 50))
         directed: bool = bool(kwargs.get("directed", True))
         allow_cycles: bool = bool(kwargs.get("allow_cycles", True))
+        id_suffix: str = kwargs.get("generated_id_suffix", "")
+        progress = ProgressReporter.from_kwargs(kwargs)
 
-        # Load XML
-        if source.startswith(("http://", "https://")):
-            import urllib.request
-
-            with urllib.request.urlopen(source) as response:
-                tree = ET.parse(response)
-        else:
-            if not os.path.exists(source):
-                raise FileNotFoundError(f"XML file not found: {source}")
-            tree = ET.parse(source)
-
-        root = tree.getroot()
-
-        directed_attr = root.attrib.get("directed")
-        if directed_attr is not None:
-            directed = directed_attr.lower() == "true"
+        # Open XML; the document is streamed, never held as a whole tree
+        stream = open_binary(source, "XML", progress)
 
         graph = Graph()
+        nodes = []
+        links = []
 
-        # Adjacency map for cycle and path existence checks
-        adjacency: Dict[str, Set[str]] = {}
         processed_nodes: Set[str] = set()
+        # Learns each attribute's type from its first values, so most values skip full inference
+        coercer = AttributeCoercer()
+        # Attribute dicts of nodes created by a reference before their element was read
+        placeholders: Dict[str, Dict[str, Any]] = {}
+        # Cycle check for allow_cycles=False, created once the root has settled `directed`
+        acyclic: TopologicalOrder | ConnectedComponents | None = None
         counter = 0
         link_counter = 0
 
-        def _ensure_node_in_graph(node_id: str, attributes: Dict[str, Any] | None = None):
-            """Add node to graph only once. Create placeholder if attributes is None."""
+        def _ensure_node_in_graph(node_id: str, attributes: Dict[str, Any] | None = None) -> Dict[str, Any] | None:
+            """
+            Add node to graph only once. Create placeholder if attributes is None.
+            Returns the dict holding the node's attributes, or None if the node was already defined.
+            """
+            placeholder = placeholders.pop(node_id, None)
+            if placeholder is not None:
+                # Forward reference: fill the placeholder in place so the node keeps its position
+                placeholder.update(attributes or {})
+                return placeholder
+
             if node_id in processed_nodes:
-                return
+                return None
 
             processed_nodes.add(node_id)
 
             if attributes is None:
                 attributes = {}
+                placeholders[node_id] = attributes
 
-            graph.add_node(node_id, attributes)
-            adjacency.setdefault(node_id, set())
+            nodes.append((node_id, attributes))
+            return attributes
 
         def _add_edge(src: str, dst: str) -> bool:
             nonlocal link_counter
 
-            if src not in adjacency:
-                adjacency.setdefault(src, set())
-
-                if src not in processed_nodes:
-                    graph.add_node(src, {})
-                    processed_nodes.add(src)
-
-            if dst not in adjacency:
-                adjacency.setdefault(dst, set())
+            if src not in processed_nodes:
+                _ensure_node_in_graph(src)
 
-                if dst not in processed_nodes:
-                    graph.add_node(dst, {})
-                    processed_nodes.add(dst)
+            if dst not in processed_nodes:
+                _ensure_node_in_graph(dst)
 
-            # If cycles are not allowed, check if adding src->dst would create a cycle
-            if not allow_cycles:
-                # If there already exists a path from dst back to src, then adding src->dst closes a cycle
-                if _has_path(dst, src):
-                    # Skip adding this edge
-                    return False
+            # If cycles are not allowed, skip an edge that would close a cycle
+            if acyclic is not None and not acyclic.add_edge(src, dst):
+                return False
 
             # Add directed edge src->dst
             link_counter += 1
-            link_id = f"link_{link_counter}_{src}_to_{dst}"
-            graph.add_link(link_id, src, dst)
-            adjacency[src].add(dst)
+            link_id = f"link_{link_counter}{id_suffix}_{src}_to_{dst}"
+            links.append((link_id, src, dst))
 
             # If undirected, also add the opposite direction
             if not directed:
                 link_counter += 1
-                back_id = f"link_{link_counter}_{dst}_to_{src}"
-                graph.add_link(back_id, dst, src)
-                adjacency[dst].add(src)
+                back_id = f"link_{link_counter}{id_suffix}_{dst}_to_{src}"
+                links.append((back_id, dst, src))
 
             return True
 
-        def _has_path(start: str, target: str, visited: Set[str] | None = None) -> bool:
-            if visited is None:
-                visited = set()
-
-            if start == target:
-                return True
-
-            visited.add(start)
-
-            for nb in adjacency.get(start, ()):
-                if nb in visited:
-                    continue
-                if nb == target:
-                    return True
-                if _has_path(nb, target, visited):
-                    return True
-
-            return False
-
         def get_node_id(elem: ET.Element) -> str:
             nonlocal counter
 
@@ -181,24 +227,16 @@ class XmlDataSourcePlugin(DataSourcePlugin):
                 return elem.attrib[id_field]
 
             counter += 1
-            return f"{elem.tag}_{counter}"
-
-        def parse_element(elem: ET.Element, parent_id: str | None = None, depth: int = 0):
-            if depth > max_depth:
-                return
+            return f"{elem.tag}_{counter}{id_suffix}"
 
+        def start_element(elem: ET.Element, parent_id: str | None) -> tuple[str, Dict[str, Any] | None]:
             node_id = get_node_id(elem)
 
-            # Gather attributes with proper types
-            attributes: Dict[str, Any] = {k: parse_value(v) for k, v in elem.attrib.items()}
-            # Include text if present
-            text_val = (elem.text or "").strip()
-
-            if text_val:
-                attributes.setdefault("text", parse_value(text_val))
+            # Gather attributes with proper types; text is added once the element ends
+            attributes: Dict[str, Any] = {k: coercer.coerce(k, v.strip()) for k, v in elem.attrib.items()}
 
             # Create node in graph
-            _ensure_node_in_graph(node_id, attributes)
+            attributes = _ensure_node_in_graph(node_id, attributes)
 
             # If parent exists, create a parent->child edge
             if parent_id:
@@ -219,15 +257,60 @@ class XmlDataSourcePlugin(DataSourcePlugin):
                     else:
                         _add_edge(node_id, ref_target)
 
-            # Process child elements recursively
-            for child in elem:
-                parse_element(child, parent_id=node_id, depth=depth + 1)
+            return node_id, attributes
+
+        # Walk the document with an explicit stack of open elements, so deep
+        # nesting does not hit the recursion limit. Each entry is
+        # (element, node_id, attributes); node_id is None below max_depth.
+        stack: list[tuple[ET.Element, str | None, Dict[str, Any] | None]] = []
+        with stream:
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    depth = len(stack)
+                    if depth == 0:
+                        directed_attr = elem.attrib.get("directed")
+                        if directed_attr is not None:
+                            directed = directed_attr.lower() == "true"
+                        if not allow_cycles:
+                            acyclic = TopologicalOrder() if directed else ConnectedComponents()
+
+                    if depth > max_depth:
+                        stack.append((elem, None, None))
+                        continue
 
-        # Start parsing from root
-        parse_element(root, parent_id=None, depth=0)
+                    parent_id = stack[-1][1] if stack else None
+                    stack.append((elem,) + start_element(elem, parent_id))
+                    if progress:
+                        progress.parsed(len(nodes))
+                    continue
+
+                _, node_id, attributes = stack.pop()
+                # Include text if present
+                text_val = (elem.text or "").strip()
+                if attributes is not None and text_val:
+                    attributes.setdefault("text", coercer.coerce("text", text_val))
+
+                # Drop the consumed element; its parent holds no other children at this point
+                elem.clear()
+                if stack:
+                    del stack[-1][0][:]
 
+        graph.add_nodes_bulk(nodes)
+        graph.add_links_bulk(links)
         return graph
 
+    def load_part(self, source: str | BinaryIO, index: int, **kwargs) -> Graph:
+        """Load one of several XML files; generated ids of later files get a suffix.
+
+        Elements without an id and links are numbered per document, so without
+        the suffix they would collide when the files are merged. References
+        between files are resolved by id. With allow_cycles=False each file is
+        checked on its own.
+        """
+        if index:
+            kwargs.setdefault("generated_id_suffix", f"_p{index}")
+        return self.load_data(source, **kwargs)
+
     def get_supported_extensions(self) -> list[str]:
         return [".xml"]
 
@@ -240,4 +323,5 @@ class XmlDataSourcePlugin(DataSourcePlugin):
                          "required": False},
             "allow_cycles": {"type": "boolean", "description": "Allow cycles in the produced graph (default=True)", "required": False},
             "max_depth": {"type": "integer", "description": "Maximum element nesting depth to parse (default=50)", "required": False},
+            "generated_id_suffix": {"type": "string", "description": "Appended to generated node and link ids (default='')", "required": False},
         }